@@ -0,0 +1,145 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Measures event-loop lag while N concurrent turns each send a reply to a slow channel.
+
+The "blocking" adapter reproduces the previous behaviour of calling the synchronous
+`conversations.send_to_conversation` from `send_activity`; the "async" adapter is the current
+`BotFrameworkAdapter`, optionally with an `AiohttpTransport`.
+
+Usage: python benchmarks/bench_event_loop_lag.py [--turns 50] [--channel-delay-ms 50]
+"""
+
+import argparse
+import asyncio
+import time
+
+from aiohttp import web
+from botbuilder.schema import Activity, ActivityTypes, ChannelAccount, ConversationAccount
+from botbuilder.core import BotContext, BotFrameworkAdapter, BotFrameworkAdapterSettings
+from botframework.connector import AiohttpTransport
+
+
+class BlockingBotFrameworkAdapter(BotFrameworkAdapter):
+    async def send_activity(self, activities):
+        for activity in activities:
+            connector_client = self.create_connector_client(activity.service_url)
+            connector_client.conversations.send_to_conversation(activity.conversation.id, activity)
+
+
+async def start_channel(delay: float):
+    async def handler(request):
+        await asyncio.sleep(delay)
+        return web.json_response({'id': 'reply'})
+
+    app = web.Application()
+    app.router.add_post('/v3/conversations/{conversation_id}/activities', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return runner, 'http://127.0.0.1:%d' % runner.addresses[0][1]
+
+
+async def monitor_lag(samples: list, stop: asyncio.Event, interval: float = 0.001):
+    loop = asyncio.get_event_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(loop.time() - start - interval)
+
+
+def run_channel_in_thread(delay: float):
+    """The blocking adapter stalls the loop it runs on, so the fake channel gets its own loop."""
+    import threading
+    ready = threading.Event()
+    state = {}
+
+    def serve():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        state['runner'], state['url'] = loop.run_until_complete(start_channel(delay))
+        state['loop'] = loop
+        ready.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    ready.wait()
+    return state
+
+
+def track_sends(adapter: BotFrameworkAdapter, turns: int):
+    """BotContext.send_activity schedules the adapter call, so keep a handle to every send it starts."""
+    sends = []
+    all_started = asyncio.Event()
+    send_activity = adapter.send_activity
+
+    def tracked(activities):
+        send = asyncio.ensure_future(send_activity(activities))
+        sends.append(send)
+        if len(sends) == turns:
+            all_started.set()
+        return send
+
+    adapter.send_activity = tracked
+    return sends, all_started
+
+
+async def run_turns(adapter: BotFrameworkAdapter, service_url: str, turns: int):
+    async def logic(context: BotContext):
+        await context.send_activity('echo: %s' % context.request.text)
+
+    def inbound(i: int) -> Activity:
+        return Activity(type=ActivityTypes.message, text=str(i), id=str(i), channel_id='test',
+                        service_url=service_url,
+                        conversation=ConversationAccount(id='conversation-%d' % i),
+                        from_property=ChannelAccount(id='user'),
+                        recipient=ChannelAccount(id='bot'))
+
+    sends, all_started = track_sends(adapter, turns)
+    samples = []
+    stop = asyncio.Event()
+    monitor = asyncio.ensure_future(monitor_lag(samples, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*[adapter.process_request(inbound(i), '', logic) for i in range(turns)])
+    await all_started.wait()
+    await asyncio.gather(*sends)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await monitor
+    return elapsed, samples
+
+
+def report(name: str, elapsed: float, samples: list):
+    samples = sorted(samples) or [0.0]
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print('%-18s total %7.1f ms   max lag %7.1f ms   p99 lag %7.1f ms' %
+          (name, elapsed * 1000, samples[-1] * 1000, p99 * 1000))
+
+
+async def main(turns: int, delay: float):
+    channel = run_channel_in_thread(delay)
+    service_url = channel['url']
+
+    settings = BotFrameworkAdapterSettings('', '')
+    report('blocking', *await run_turns(BlockingBotFrameworkAdapter(settings), service_url, turns))
+    report('async (executor)', *await run_turns(BotFrameworkAdapter(settings), service_url, turns))
+
+    transport = AiohttpTransport()
+    aiohttp_settings = BotFrameworkAdapterSettings('', '', transport=transport)
+    report('async (aiohttp)', *await run_turns(BotFrameworkAdapter(aiohttp_settings), service_url, turns))
+    await transport.close()
+
+    cleanup = asyncio.run_coroutine_threadsafe(channel['runner'].cleanup(), channel['loop'])
+    await asyncio.wrap_future(cleanup)
+    channel['loop'].call_soon_threadsafe(channel['loop'].stop)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--turns', type=int, default=50)
+    parser.add_argument('--channel-delay-ms', type=float, default=50)
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(main(args.turns, args.channel_delay_ms / 1000))
@@ -5,15 +5,33 @@
 # license information.
 # --------------------------------------------------------------------------
 
+from .admission_controller import AdmissionController, TurnRejected
+from .aiohttp_integration import AiohttpRequestHandler, serve_aiohttp_app
 from .bot_adapter import BotAdapter
 from .bot_framework_adapter import BotFrameworkAdapter, BotFrameworkAdapterSettings
 from .bot_context import BotContext
+from .connector_client_pool import ConnectorClientPool
+from .middleware_metrics import LatencyHistogram, MiddlewareMetrics, MiddlewareTiming
 from .middleware_set import AnonymousReceiveMiddleware, Middleware, MiddlewareSet
+from .turn_scheduler import PartitionStats, TurnScheduler
+from .worker_host import WorkerHost, warm_caches
 
-__all__ = ['AnonymousReceiveMiddleware',
+__all__ = ['AdmissionController',
+           'AiohttpRequestHandler',
+           'AnonymousReceiveMiddleware',
            'BotAdapter',
            'BotContext',
            'BotFrameworkAdapter',
            'BotFrameworkAdapterSettings',
+           'ConnectorClientPool',
+           'LatencyHistogram',
            'Middleware',
-           'MiddlewareSet',]
+           'MiddlewareMetrics',
+           'MiddlewareSet',
+           'MiddlewareTiming',
+           'PartitionStats',
+           'TurnRejected',
+           'TurnScheduler',
+           'WorkerHost',
+           'serve_aiohttp_app',
+           'warm_caches',]
@@ -0,0 +1,138 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import math
+from collections import Counter
+from typing import Iterable
+
+from botbuilder.schema import Activity, ActivityTypes
+
+
+class TurnRejected(Exception):
+    """
+    Raised by `AdmissionController.admit` when the bot is overloaded. Hosts should answer the request with
+    `status` (429 Too Many Requests) and `headers`, which carry Retry-After, so the channel retries it later.
+    """
+    status = 429
+
+    def __init__(self, reason: str, retry_after: float):
+        super(TurnRejected, self).__init__('Turn rejected: %s.' % reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def headers(self) -> dict:
+        return {'Retry-After': str(int(math.ceil(self.retry_after)))}
+
+
+class AdmissionController(object):
+    """
+    Admits inbound turns while the number of turns in flight and the event-loop lag are under their limits.
+
+    Activities whose type is not in `priority_types` (by default everything but messages, e.g. typing and
+    conversationUpdate) are shed first: they are rejected once either measure reaches `low_priority_share` of its
+    limit, while priority activities are admitted up to the limit itself.
+
+    Event-loop lag is sampled every `lag_sample_interval` seconds on the loop that runs the turns, and includes how
+    late the pending sample already is, so a stalled loop is detected before the sample fires. Sampling pauses once
+    no turn is in flight and resumes with the next `admit`, so an idle controller does not keep waking the loop.
+    """
+    def __init__(self, max_in_flight: int=256, max_loop_lag: float=0.5, low_priority_share: float=0.75,
+                 retry_after: float=1.0, lag_sample_interval: float=0.05,
+                 priority_types: Iterable[str]=(ActivityTypes.message,)):
+        if not isinstance(max_in_flight, int):
+            raise TypeError('AdmissionController(): max_in_flight must be an integer.')
+        if max_in_flight < 1:
+            raise ValueError('AdmissionController(): max_in_flight must be positive.')
+        self.max_in_flight = max_in_flight
+        self.max_loop_lag = max_loop_lag
+        self.low_priority_share = low_priority_share
+        self.retry_after = retry_after
+        self.lag_sample_interval = lag_sample_interval
+        self.priority_types = frozenset(getattr(t, 'value', t) for t in priority_types)
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = Counter()
+        self._loop = None
+        self._sampled_lag = 0.0
+        self._next_sample = None
+        self._sample_handle = None
+
+    @property
+    def loop_lag(self) -> float:
+        """
+        The current event-loop lag in seconds.
+        :return:
+        """
+        if self._sample_handle is None:
+            return self._sampled_lag
+        return max(self._sampled_lag, self._loop.time() - self._next_sample)
+
+    def admit(self, activity: Activity) -> 'AdmissionController':
+        """
+        Admits a turn for `activity` or raises `TurnRejected`. Use as `with controller.admit(activity): ...` so the
+        turn is released when it ends.
+        :param activity:
+        :return:
+        """
+        self._ensure_monitor()
+        activity_type = getattr(activity.type, 'value', activity.type)
+        share = 1.0 if activity_type in self.priority_types else self.low_priority_share
+        if self.in_flight >= self.max_in_flight * share:
+            reason = 'too many turns in flight'
+        elif self.loop_lag >= self.max_loop_lag * share:
+            reason = 'event loop lag too high'
+        else:
+            self.in_flight += 1
+            self.admitted += 1
+            return self
+        self.rejected[activity_type] += 1
+        raise TurnRejected(reason, self.retry_after)
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def snapshot(self) -> dict:
+        return {'in_flight': self.in_flight,
+                'loop_lag': self.loop_lag,
+                'admitted': self.admitted,
+                'rejected': dict(self.rejected)}
+
+    def stop(self) -> None:
+        """
+        Stops sampling event-loop lag until the next turn is admitted, e.g. before the loop is closed while turns
+        are still in flight.
+        :return:
+        """
+        if self._sample_handle is not None:
+            self._sample_handle.cancel()
+        self._loop = self._sample_handle = None
+        self._sampled_lag = 0.0
+
+    def _ensure_monitor(self):
+        loop = asyncio.get_event_loop()
+        if loop is not self._loop:
+            self.stop()
+            self._loop = loop
+        if self._sample_handle is None:
+            self._schedule_sample()
+
+    def _schedule_sample(self):
+        self._next_sample = self._loop.time() + self.lag_sample_interval
+        self._sample_handle = self._loop.call_at(self._next_sample, self._sample)
+
+    def _sample(self):
+        if self.in_flight:
+            self._sampled_lag = max(self._loop.time() - self._next_sample, 0.0)
+            self._schedule_sample()
+        else:
+            # Idle: no turn is left to be delayed by the lag this sample measured.
+            self._sampled_lag = 0.0
+            self._sample_handle = None
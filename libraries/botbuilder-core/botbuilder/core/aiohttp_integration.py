@@ -0,0 +1,100 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import socket
+from typing import Callable
+
+from msrest.exceptions import DeserializationError
+from botframework.connector.serialization import dumps
+
+from .admission_controller import TurnRejected
+from .bot_framework_adapter import BotFrameworkAdapter
+
+try:
+    import aiohttp
+    from aiohttp import web
+except ImportError:
+    aiohttp = None
+    web = None
+
+# Failures to fetch the OpenID metadata while authenticating, as opposed to failures of the request's token.
+_AUTH_UNAVAILABLE = (OSError, asyncio.TimeoutError) + ((aiohttp.ClientError,) if aiohttp is not None else ())
+_PARSE_ERRORS = (DeserializationError, ValueError, TypeError)
+_JSON_CONTENT_TYPES = ('application/json', 'text/json')
+
+
+class AiohttpRequestHandler(object):
+    """
+    An aiohttp request handler that runs a turn on `adapter` for every activity posted to it, e.g.
+    `app.router.add_post('/api/messages', AiohttpRequestHandler(adapter, logic).handle)`.
+
+    The body is read as bytes and decoded, with orjson when it is installed, straight into the schema models. The
+    outcome of the turn is mapped to the HTTP response:
+
+    - the `web.StreamResponse` returned by `logic`, or 202 Accepted if it returns None. Any other result is sent as
+      a JSON body with 200 OK.
+    - 400 Bad Request for a body that is not an activity, 415 Unsupported Media Type for a body that is not JSON.
+    - 401 Unauthorized if the request's token is missing or invalid.
+    - 429 Too Many Requests, with Retry-After, if the adapter's `admission_controller` rejects the turn.
+    """
+    def __init__(self, adapter: BotFrameworkAdapter, logic: Callable):
+        if web is None:
+            raise ImportError('AiohttpRequestHandler requires the "aiohttp" package to be installed.')
+        self.adapter = adapter
+        self.logic = logic
+
+    async def handle(self, request: 'web.Request') -> 'web.StreamResponse':
+        """
+        Runs a turn for the activity posted in `request`.
+        :param request:
+        :return:
+        """
+        if request.content_type not in _JSON_CONTENT_TYPES:
+            return web.Response(status=415)
+        body = await request.read()
+        try:
+            activity = await self.adapter.parse_request({'body': body}, self.adapter.settings.lazy_activities)
+        except _PARSE_ERRORS:
+            return web.Response(status=400)
+
+        adapter = self.adapter
+        try:
+            with adapter._admit(activity):
+                try:
+                    await adapter.authenticate_request(activity, request.headers.get('Authorization', ''))
+                except _AUTH_UNAVAILABLE:
+                    raise
+                except Exception:  # pylint: disable=broad-except
+                    # The auth layer raises plain Exceptions, and jwt errors for malformed tokens.
+                    return web.Response(status=401)
+                result = await adapter._schedule_turn(activity, self.logic)
+        except TurnRejected as e:
+            return web.Response(status=e.status, headers=e.headers)
+
+        if result is None:
+            return web.Response(status=202)
+        if isinstance(result, web.StreamResponse):
+            return result
+        return web.Response(body=dumps(result), content_type='application/json')
+
+
+def serve_aiohttp_app(create_app: Callable[[], 'web.Application']) -> Callable:
+    """
+    Returns a `serve` coroutine function for `WorkerHost` that serves the application `create_app()` builds. Every
+    worker calls `create_app` once, so adapters and connector clients are created in the worker.
+    :param create_app:
+    :return:
+    """
+    if web is None:
+        raise ImportError('serve_aiohttp_app requires the "aiohttp" package to be installed.')
+
+    async def serve(sock: socket.socket):
+        runner = web.AppRunner(create_app())
+        await runner.setup()
+        try:
+            await web.SockSite(runner, sock).start()
+            await asyncio.Event().wait()
+        finally:
+            await runner.cleanup()
+    return serve
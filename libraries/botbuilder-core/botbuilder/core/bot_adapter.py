@@ -2,10 +2,11 @@
 # Licensed under the MIT License.
 
 from abc import ABC, abstractmethod
-from typing import List, Callable
-from botbuilder.schema import Activity, ConversationReference
+from typing import Callable, Iterable, List
+from botbuilder.schema import Activity, ActivityTypes, ConversationReference
 
 from .bot_context import BotContext
+from .middleware_metrics import MiddlewareMetrics
 from .middleware_set import MiddlewareSet
 
 
@@ -25,8 +26,53 @@ class BotAdapter(ABC):
     async def delete_activity(self, reference: ConversationReference):
         raise NotImplementedError()
 
-    def use(self, middleware):
-        self._middleware.use(middleware)
+    def use(self, middleware, activity_types: Iterable[str]=None):
+        """
+        Registers middleware with the adapter.
+        :param middleware:
+        :param activity_types: Only run the middleware for activities of these types. Runs for every activity by
+        default.
+        :return:
+        """
+        self._middleware.use(middleware, activity_types)
+
+    def enable_middleware_instrumentation(self, metrics: MiddlewareMetrics=None) -> MiddlewareMetrics:
+        """
+        Times every middleware that `run_middleware` runs. See `MiddlewareSet.enable_instrumentation`.
+        :param metrics:
+        :return:
+        """
+        return self._middleware.enable_instrumentation(metrics)
+
+    @property
+    def middleware_metrics(self) -> MiddlewareMetrics:
+        return self._middleware.metrics
 
     async def run_middleware(self, context: BotContext, callback: Callable=None):
         return await self._middleware.receive_activity_with_status(context, callback)
+
+    def create_context(self, activity: Activity) -> BotContext:
+        return BotContext(self, activity)
+
+    async def continue_conversation(self, reference: ConversationReference, logic: Callable):
+        """
+        Runs a proactive turn in a conversation, e.g. to message a user outside of a turn they started. The turn's
+        request is a `continueConversation` event addressed from the user to the bot, so replies sent through the
+        context go to the referenced conversation, and it runs through the middleware like an inbound activity.
+        Nothing is fetched or authenticated to build it, and it bypasses the admission control of inbound requests.
+
+        Usage Example:
+        reference = BotContext.get_conversation_reference(context.request)
+        ...
+        await adapter.continue_conversation(reference, lambda context: context.send_activity('Done!'))
+        :param reference: A reference from `BotContext.get_conversation_reference`.
+        :param logic:
+        :return:
+        """
+        request = self._continuation_request(reference)
+        return await self.run_middleware(self.create_context(request), logic)
+
+    @staticmethod
+    def _continuation_request(reference: ConversationReference) -> Activity:
+        return BotContext.apply_conversation_reference(
+            Activity(type=ActivityTypes.event, name='continueConversation'), reference, is_incoming=True)
@@ -2,20 +2,46 @@
 # Licensed under the MIT License.
 
 import asyncio
-from typing import List, Callable
-from botbuilder.schema import Activity, ConversationReference
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import List, Callable, Tuple
+from botbuilder.schema import Activity, ConversationReference, ResourceResponse
 from botframework.connector import ConnectorClient
-from botframework.connector.auth import (MicrosoftAppCredentials,
-                                         JwtTokenValidation, SimpleCredentialProvider)
+from botframework.connector.serialization import deserialize_activity
+from botframework.connector.auth import (MicrosoftAppCredentials, JwtTokenValidation,
+                                         SimpleCredentialProvider, TokenValidationCache)
 
+from .admission_controller import AdmissionController
 from .bot_adapter import BotAdapter
-from .bot_context import BotContext
+from .connector_client_pool import ConnectorClientPool
+from .turn_scheduler import TurnScheduler
 
 
 class BotFrameworkAdapterSettings(object):
-    def __init__(self, app_id: str, app_password: str):
+    def __init__(self, app_id: str, app_password: str, connector_client_pool_size: int=128, transport=None,
+                 max_concurrent_sends: int=None, token_validation_cache: TokenValidationCache=None,
+                 lazy_activities: bool=False, turn_scheduler: TurnScheduler=None,
+                 admission_controller: AdmissionController=None):
         self.app_id = app_id
         self.app_password = app_password
+        self.connector_client_pool_size = connector_client_pool_size
+        self.transport = transport
+        self.max_concurrent_sends = max_concurrent_sends
+        self.token_validation_cache = token_validation_cache
+        self.lazy_activities = lazy_activities
+        self.turn_scheduler = turn_scheduler
+        self.admission_controller = admission_controller
+
+
+class _NotAdmissionControlled(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NOT_ADMISSION_CONTROLLED = _NotAdmissionControlled()
 
 
 class BotFrameworkAdapter(BotAdapter):
@@ -25,101 +51,214 @@ class BotFrameworkAdapter(BotAdapter):
         self.settings = settings or BotFrameworkAdapterSettings('', '')
         self._credentials = MicrosoftAppCredentials(self.settings.app_id, self.settings.app_password)
         self._credential_provider = SimpleCredentialProvider(self.settings.app_id, self.settings.app_password)
+        self.connector_client_pool = ConnectorClientPool(self.settings.connector_client_pool_size)
 
     async def process_request(self, req, auth_header: str, logic: Callable):
-        request = await self.parse_request(req)
-        auth_header = auth_header or ''
+        """
+        Parses, authenticates and runs a turn for an inbound request.
+        :param req:
+        :param auth_header:
+        :param logic:
+        :return:
+        :raises TurnRejected: If an `admission_controller` is configured and the bot is overloaded.
+        """
+        request = await self.parse_request(req, self.settings.lazy_activities)
+        with self._admit(request):
+            await self.authenticate_request(request, auth_header or '')
+            return await self._schedule_turn(request, logic)
 
-        await self.authenticate_request(request, auth_header)
-        context = self.create_context(request)
+    def _admit(self, request: Activity):
+        """
+        Returns a context manager holding the `admission_controller`'s admission of the turn, if one is configured.
+        :param request:
+        :return:
+        :raises TurnRejected: If the bot is overloaded.
+        """
+        controller = self.settings.admission_controller
+        if controller is None:
+            return _NOT_ADMISSION_CONTROLLED
+        return controller.admit(request)
 
+    async def _schedule_turn(self, request: Activity, logic: Callable):
+        scheduler = self.settings.turn_scheduler
+        if scheduler is None:
+            return await self._run_turn(request, logic)
+        return await scheduler.run(self._partition_key(request), lambda: self._run_turn(request, logic))
+
+    async def continue_conversation(self, reference: ConversationReference, logic: Callable,
+                                    within_turn: bool=False):
+        """
+        Runs a proactive turn in a conversation, see `BotAdapter.continue_conversation`. With a `turn_scheduler`
+        the turn is queued behind the turns of its conversation like an inbound one.
+
+        A turn that continues its own conversation and awaits the result must pass `within_turn=True`, so the
+        proactive turn runs inside of it; queued behind it, it would never start. Tasks that outlive the turn must
+        not pass it. Likewise a turn of conversation A that awaits continuing conversation B while a turn of B awaits
+        continuing A deadlocks: neither proactive turn starts before the other turn ends.
+        :param reference: A reference from `BotContext.get_conversation_reference`.
+        :param logic:
+        :param within_turn: Set when awaited from within a running turn of the referenced conversation.
+        :return:
+        """
+        request = self._continuation_request(reference)
+        scheduler = self.settings.turn_scheduler
+        key = self._partition_key(request)
+        if scheduler is None or key is None or within_turn:
+            return await self._run_turn(request, logic)
+        return await scheduler.run(key, lambda: self._run_turn(request, logic))
+
+    async def _run_turn(self, request: Activity, logic: Callable):
+        context = self.create_context(request)
         return await self.run_middleware(context, logic)
 
+    @staticmethod
+    def _partition_key(request: Activity):
+        """
+        Turns are serialized per conversation when a `turn_scheduler` is configured.
+        :param request:
+        :return:
+        """
+        if request.conversation is None or not request.conversation.id:
+            return None
+        return request.channel_id, request.conversation.id
+
     async def authenticate_request(self, request: Activity, auth_header: str):
-        await JwtTokenValidation.assert_valid_activity(request, auth_header, self._credential_provider)
+        await JwtTokenValidation.assert_valid_activity(request, auth_header, self._credential_provider,
+                                                       self.settings.token_validation_cache)
 
-    def create_context(self, activity):
-        return BotContext(self, activity)
+    def create_connector_client(self, service_url: str) -> ConnectorClient:
+        """
+        Returns a pooled ConnectorClient for the service_url, so the client and its HTTP session are reused
+        across outbound activities instead of being rebuilt for every send.
+        :param service_url:
+        :return:
+        """
+        return self.connector_client_pool.get(service_url, self.settings.app_id,
+                                              lambda: ConnectorClient(self._credentials, service_url,
+                                                                      transport=self.settings.transport))
 
     @staticmethod
-    async def parse_request(req):
+    async def parse_request(req, lazy: bool=False):
         """
         Parses and validates request
-        :param req:
+        :param req: An Activity, or a request whose `body` attribute or key holds the parsed JSON or raw bytes of one.
+        :param lazy: Defer decoding attachments, entities, channel data, value and suggested actions until they
+        are first read.
         :return:
         """
-
-        async def validate_activity(activity: Activity):
-            if not isinstance(activity.type, str):
-                raise TypeError('BotFrameworkAdapter.parse_request(): invalid or missing activity type.')
-            return True
-
-        if not isinstance(req, Activity):
-            # If the req is a raw HTTP Request, try to deserialize it into an Activity and return the Activity.
-            if hasattr(req, 'body'):
-                try:
-                    activity = Activity().deserialize(req.body)
-                    is_valid_activity = await validate_activity(activity)
-                    if is_valid_activity:
-                        return activity
-                except BaseException as e:
-                    raise e
-            elif 'body' in req:
-                try:
-                    activity = Activity().deserialize(req['body'])
-                    is_valid_activity = await validate_activity(activity)
-                    if is_valid_activity:
-                        return activity
-                except BaseException as e:
-                    raise e
-            else:
-                raise TypeError('BotFrameworkAdapter.parse_request(): received invalid request')
+        if isinstance(req, Activity):
+            activity = req
+        elif hasattr(req, 'body'):
+            activity = deserialize_activity(req.body, lazy)
+        elif isinstance(req, Mapping) and 'body' in req:
+            activity = deserialize_activity(req['body'], lazy)
         else:
-            # The `req` has already been deserialized to an Activity, so verify the Activity.type and return it.
-            is_valid_activity = await validate_activity(req)
-            if is_valid_activity:
-                return req
+            raise TypeError('BotFrameworkAdapter.parse_request(): received invalid request')
+
+        if not isinstance(getattr(activity, 'type', None), str):
+            raise TypeError('BotFrameworkAdapter.parse_request(): invalid or missing activity type.')
+        return activity
 
     async def update_activity(self, activity: Activity):
         try:
-            connector_client = ConnectorClient(self._credentials, activity.service_url)
-            return connector_client.conversations.update_activity(
+            connector_client = self.create_connector_client(activity.service_url)
+            return await connector_client.conversations.update_activity_async(
                 activity.conversation.id,
-                activity.conversation.activity_id,
+                activity.id,
                 activity)
         except BaseException as e:
             raise e
 
     async def delete_activity(self, conversation_reference: ConversationReference):
         try:
-            connector_client = ConnectorClient(self._credentials, conversation_reference.service_url)
-            connector_client.conversations.delete_activity(conversation_reference.conversation.id,
-                                                           conversation_reference.activity_id)
+            connector_client = self.create_connector_client(conversation_reference.service_url)
+            await connector_client.conversations.delete_activity_async(conversation_reference.conversation.id,
+                                                                       conversation_reference.activity_id)
         except BaseException as e:
             raise e
 
-    async def send_activity(self, activities: List[Activity]):
+    async def send_activity(self, activities: List[Activity]) -> List[ResourceResponse]:
+        """
+        Sends activities to their conversations and returns the ResourceResponses in input order.
+
+        When `BotFrameworkAdapterSettings.max_concurrent_sends` is greater than 1, activities addressed to
+        different conversations are sent concurrently while activities within a conversation keep their
+        order. `delay` activities act as barriers: everything before them is sent before the delay starts.
+        :param activities:
+        :return:
+        """
         try:
-            for activity in activities:
-                if activity.type == 'delay':
-                    try:
-                        delay_in_ms = float(activity.value) / 1000
-                    except TypeError:
-                        raise TypeError('Unexpected delay value passed. Expected number or str type.')
-                    except AttributeError:
-                        raise Exception('activity.value was not found.')
+            max_concurrent_sends = self.settings.max_concurrent_sends
+            if not max_concurrent_sends or max_concurrent_sends < 2:
+                responses = []
+                for activity in activities:
+                    if activity.type == 'delay':
+                        await asyncio.sleep(self._get_delay_in_seconds(activity))
+                        responses.append(ResourceResponse())
                     else:
-                        await asyncio.sleep(delay_in_ms)
+                        responses.append(await self._send_to_conversation(activity))
+                return responses
+
+            semaphore = asyncio.Semaphore(max_concurrent_sends)
+            responses = [None] * len(activities)
+            batch = []
+            for index, activity in enumerate(activities):
+                if activity.type == 'delay':
+                    await self._send_batch(batch, responses, semaphore)
+                    batch = []
+                    await asyncio.sleep(self._get_delay_in_seconds(activity))
+                    responses[index] = ResourceResponse()
                 else:
-                    connector_client = ConnectorClient(self._credentials, activity.service_url)
-                    connector_client.conversations.send_to_conversation(activity.conversation.id, activity)
+                    batch.append((index, activity))
+            await self._send_batch(batch, responses, semaphore)
+            return responses
         except BaseException as e:
             raise e
 
+    async def _send_batch(self, batch: List[Tuple[int, Activity]], responses: List[ResourceResponse],
+                          semaphore: asyncio.Semaphore):
+        """
+        Sends a batch of (index, activity) pairs with one sequential sender per conversation.
+        :param batch:
+        :param responses:
+        :param semaphore:
+        :return:
+        """
+        conversations = OrderedDict()
+        for index, activity in batch:
+            key = (activity.service_url, activity.conversation.id)
+            conversations.setdefault(key, []).append((index, activity))
+
+        async def send_in_order(items):
+            for index, activity in items:
+                async with semaphore:
+                    responses[index] = await self._send_to_conversation(activity)
+
+        senders = [asyncio.ensure_future(send_in_order(items)) for items in conversations.values()]
+        try:
+            await asyncio.gather(*senders)
+        except BaseException:
+            for sender in senders:
+                sender.cancel()
+            raise
+
+    async def _send_to_conversation(self, activity: Activity) -> ResourceResponse:
+        connector_client = self.create_connector_client(activity.service_url)
+        return await connector_client.conversations.send_to_conversation_async(activity.conversation.id, activity)
+
+    @staticmethod
+    def _get_delay_in_seconds(activity: Activity) -> float:
+        try:
+            return float(activity.value) / 1000
+        except TypeError:
+            raise TypeError('Unexpected delay value passed. Expected number or str type.')
+        except AttributeError:
+            raise Exception('activity.value was not found.')
+
     # Legacy code.
     async def send(self, activities: List[Activity]):
         for activity in activities:
-            connector = ConnectorClient(self._credentials, base_url=activity.service_url)
+            connector = self.create_connector_client(activity.service_url)
             await connector.conversations.send_to_conversation_async(activity.conversation.id, activity)
 
     async def receive(self, auth_header: str, activity: Activity):
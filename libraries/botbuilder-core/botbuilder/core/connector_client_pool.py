@@ -0,0 +1,33 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from typing import Callable
+
+from botframework.connector import ConnectorClient
+from botframework.connector.lru_cache import LruCache
+
+
+class ConnectorClientPool(LruCache):
+    """
+    A bounded, least-recently-used cache of `ConnectorClient` instances keyed by `(service_url, app_id)`.
+
+    Building a `ConnectorClient` constructs a new msrest `Serializer`/`Deserializer` and HTTP session, so
+    reusing clients across outbound activities avoids that cost on every reply.
+    """
+    def __init__(self, max_size: int=128):
+        super(ConnectorClientPool, self).__init__(max_size)
+
+    def get(self, service_url: str, app_id: str, factory: Callable[[], ConnectorClient]) -> ConnectorClient:
+        """
+        Returns the pooled client for `(service_url, app_id)`, building it with `factory` on a miss.
+        :param service_url:
+        :param app_id:
+        :param factory:
+        :return:
+        """
+        key = (service_url, app_id)
+        client = self._lookup(key)
+        if client is None:
+            # Another caller may race us to build the same client; the first one stored is kept.
+            client = self._store(key, factory(), replace=False)
+        return client
@@ -0,0 +1,124 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from typing import Dict
+
+
+class LatencyHistogram(object):
+    """
+    An HDR-style histogram of durations. Values are recorded in whole microseconds into log-linear buckets:
+    exact below 128us, and within 1/64 (about 1.6%) of the recorded value above that, so memory stays bounded
+    however long the tail is.
+    """
+    SUB_BUCKETS = 64
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._buckets = {}
+
+    def record(self, seconds: float) -> None:
+        """
+        Records one duration.
+        :param seconds:
+        :return:
+        """
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+        index = self._index(max(int(seconds * 1e6), 0))
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """
+        Returns the duration, in seconds, that `percent` percent of the recorded values do not exceed.
+        :param percent: Between 0 and 100.
+        :return:
+        """
+        if not self.count:
+            return 0.0
+        threshold = max(percent / 100 * self.count, 1)
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= threshold:
+                return min(self._highest_equivalent_value(index) / 1e6, self.max)
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {'count': self.count,
+                'mean': self.mean,
+                'min': self.min or 0.0,
+                'p50': self.percentile(50),
+                'p90': self.percentile(90),
+                'p99': self.percentile(99),
+                'max': self.max or 0.0}
+
+    def _index(self, microseconds: int) -> int:
+        if microseconds < 2 * self.SUB_BUCKETS:
+            return microseconds
+        shift = microseconds.bit_length() - 7
+        return shift * self.SUB_BUCKETS + (microseconds >> shift)
+
+    def _highest_equivalent_value(self, index: int) -> int:
+        if index < 2 * self.SUB_BUCKETS:
+            return index
+        shift = index // self.SUB_BUCKETS - 1
+        return ((index - shift * self.SUB_BUCKETS + 1) << shift) - 1
+
+
+class MiddlewareTiming(object):
+    """
+    Counters and latency histograms for one middleware.
+
+    `self_time` excludes the time spent awaiting `next()`, i.e. in the middleware and bot logic downstream;
+    `total_time` includes it. `short_circuits` counts turns where the middleware never called `next()`.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.short_circuits = 0
+        self.self_time = LatencyHistogram()
+        self.total_time = LatencyHistogram()
+
+    def snapshot(self) -> dict:
+        return {'calls': self.calls,
+                'errors': self.errors,
+                'short_circuits': self.short_circuits,
+                'self_time': self.self_time.snapshot(),
+                'total_time': self.total_time.snapshot()}
+
+
+class MiddlewareMetrics(object):
+    """
+    Per-middleware timings collected by an instrumented `MiddlewareSet`, keyed by middleware class name, or by
+    handler name for `AnonymousReceiveMiddleware`. Several sets, e.g. nested ones, can share one instance.
+    """
+    def __init__(self):
+        self.middleware: Dict[str, MiddlewareTiming] = {}
+
+    def timing(self, name: str) -> MiddlewareTiming:
+        timing = self.middleware.get(name)
+        if timing is None:
+            timing = self.middleware[name] = MiddlewareTiming()
+        return timing
+
+    def snapshot(self) -> dict:
+        return {name: timing.snapshot() for name, timing in self.middleware.items()}
+
+    def reset(self) -> None:
+        # Instrumented chains hold on to their MiddlewareTiming, so reset in place.
+        for timing in self.middleware.values():
+            timing.reset()
@@ -3,8 +3,12 @@
 
 from asyncio import iscoroutinefunction
 from abc import ABC, abstractmethod
+from functools import partial
+from time import perf_counter
+from typing import Iterable
 
 from .bot_context import BotContext
+from .middleware_metrics import MiddlewareMetrics, MiddlewareTiming
 
 
 class Middleware(ABC):
@@ -27,19 +31,64 @@ class MiddlewareSet(Middleware):
     A set of `Middleware` plugins. The set itself is middleware so you can easily package up a set
     of middleware that can be composed into a bot with a single `bot.use(mySet)` call or even into
     another middleware set using `set.use(mySet)`.
+
+    The registered middleware is compiled into a chain of steps the first time the set runs and
+    recompiled only after `use()`. Nested sets run their own compiled chain as a single step.
+
+    Middleware registered with `activity_types` only runs for activities of those types: the set keeps one
+    chain per filtered activity type, plus one of the unfiltered middleware for every other type.
+
+    Call `enable_instrumentation()` to time each middleware; the timing steps are only compiled into the
+    chain while instrumentation is enabled.
     """
     def __init__(self):
         super(MiddlewareSet, self).__init__()
         self._middleware = []
+        self._activity_types = []
+        self._filtered_types = frozenset()
+        self._chains = {}
+        self._metrics = None
+
+    @property
+    def metrics(self) -> MiddlewareMetrics:
+        """
+        The metrics collected while instrumentation is enabled, otherwise None.
+        :return:
+        """
+        return self._metrics
 
-    def use(self, middleware: Middleware):
+    def enable_instrumentation(self, metrics: MiddlewareMetrics=None) -> MiddlewareMetrics:
+        """
+        Records the self-time and total-time of every middleware in the set. Nested sets are timed as a whole;
+        enable instrumentation on them too, e.g. with the same `metrics`, to time their middleware.
+        :param metrics: Where to record timings. Defaults to a new `MiddlewareMetrics`.
+        :return:
+        """
+        self._metrics = metrics if metrics is not None else MiddlewareMetrics()
+        self._chains = {}
+        return self._metrics
+
+    def disable_instrumentation(self) -> None:
+        self._metrics = None
+        self._chains = {}
+
+    def use(self, middleware: Middleware, activity_types: Iterable[str]=None):
         """
         Registers middleware plugin(s) with the bot or set.
         :param middleware :
+        :param activity_types: Only run the middleware for activities of these types, e.g.
+        `[ActivityTypes.message]`. Runs for every activity by default.
         :return:
         """
         if hasattr(middleware, 'on_process_request') and callable(middleware.on_process_request):
+            if activity_types is not None:
+                if isinstance(activity_types, str):
+                    activity_types = [activity_types]
+                activity_types = frozenset(_type_name(activity_type) for activity_type in activity_types)
+                self._filtered_types = self._filtered_types | activity_types
             self._middleware.append(middleware)
+            self._activity_types.append(activity_types)
+            self._chains = {}
             return self
         else:
             raise TypeError('MiddlewareSet.use(): invalid middleware being added.')
@@ -55,16 +104,98 @@ class MiddlewareSet(Middleware):
         return await self.receive_activity_internal(context, callback)
 
     async def receive_activity_internal(self, context, callback, next_middleware_index=0):
-        if next_middleware_index == len(self._middleware):
-            if callback:
-                return await callback(context)
+        activity_type = None
+        if self._filtered_types:
+            activity_type = _type_name(getattr(getattr(context, 'request', None), 'type', None))
+            if activity_type not in self._filtered_types:
+                # Only types named in a filter get their own chain, so arbitrary inbound types cannot grow the cache.
+                activity_type = None
+        chain = self._chains.get(activity_type)
+        if chain is None:
+            chain = self._compile(activity_type)
+        return await chain[next_middleware_index](context, callback)
+
+    def _compile(self, activity_type: str=None):
+        """
+        Builds one step per middleware that runs for `activity_type`, back to front, each holding a direct reference
+        to the step after it. Step i runs middleware i with a `next` that starts step i+1; the last step runs the
+        callback.
+        :param activity_type: A type named in an `activity_types` filter, or None for any other type.
+        :return:
+        """
+        steps = [_run_callback]
+        for middleware, activity_types in zip(reversed(self._middleware), reversed(self._activity_types)):
+            if activity_types is not None and activity_type not in activity_types:
+                continue
+            if self._metrics is not None:
+                timing = self._metrics.timing(_middleware_name(middleware))
+                steps.append(_timed_middleware_step(middleware.on_process_request, steps[-1], timing))
+            elif type(middleware).on_process_request is MiddlewareSet.on_process_request:
+                steps.append(_nested_set_step(middleware, steps[-1]))
             else:
-                return None
-        next_middleware = self._middleware[next_middleware_index]
-
-        async def call_next_middleware():
-            return await self.receive_activity_internal(context, callback, next_middleware_index+1)
-        return await next_middleware.on_process_request(
-            context,
-            call_next_middleware
-        )
+                steps.append(_middleware_step(middleware.on_process_request, steps[-1]))
+        steps.reverse()
+        self._chains[activity_type] = steps
+        return steps
+
+
+def _type_name(activity_type):
+    # Filters and activities may use ActivityTypes members or plain strings.
+    return getattr(activity_type, 'value', activity_type)
+
+
+async def _run_callback(context, callback):
+    if callback:
+        return await callback(context)
+    return None
+
+
+def _middleware_step(on_process_request, next_step):
+    def step(context, callback):
+        return on_process_request(context, partial(next_step, context, callback))
+    return step
+
+
+def _nested_set_step(middleware_set: MiddlewareSet, next_step):
+    # Same semantics as MiddlewareSet.on_process_request: the nested chain runs to completion, even if one
+    # of its middleware short-circuits, before the outer chain continues.
+    async def step(context, callback):
+        await middleware_set.receive_activity_internal(context, None)
+        await next_step(context, callback)
+    return step
+
+
+def _timed_middleware_step(on_process_request, next_step, timing: MiddlewareTiming):
+    async def step(context, callback):
+        downstream = 0.0
+        called_next = False
+
+        async def timed_next():
+            nonlocal downstream, called_next
+            called_next = True
+            next_started = perf_counter()
+            try:
+                return await next_step(context, callback)
+            finally:
+                downstream += perf_counter() - next_started
+
+        started = perf_counter()
+        try:
+            return await on_process_request(context, timed_next)
+        except Exception:
+            timing.errors += 1
+            raise
+        finally:
+            total = perf_counter() - started
+            timing.calls += 1
+            if not called_next:
+                timing.short_circuits += 1
+            timing.total_time.record(total)
+            timing.self_time.record(max(total - downstream, 0.0))
+    return step
+
+
+def _middleware_name(middleware) -> str:
+    if isinstance(middleware, AnonymousReceiveMiddleware):
+        return getattr(middleware._to_call, '__qualname__', type(middleware).__name__)
+    return type(middleware).__name__
@@ -0,0 +1,142 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+from collections import OrderedDict
+from itertools import islice
+from time import perf_counter
+from typing import Awaitable, Callable, Hashable
+
+from .middleware_metrics import LatencyHistogram
+
+
+class PartitionStats(object):
+    """
+    Queue metrics for one partition of a `TurnScheduler`.
+
+    `depth` is the number of turns currently queued or running, `max_depth` the largest depth seen when a
+    turn was queued, and `wait_time` a histogram of the time turns spent queued before they started.
+    """
+    def __init__(self):
+        self.depth = 0
+        self.max_depth = 0
+        self.turns = 0
+        self.wait_time = LatencyHistogram()
+
+    def snapshot(self) -> dict:
+        return {'depth': self.depth,
+                'max_depth': self.max_depth,
+                'turns': self.turns,
+                'wait_time': self.wait_time.snapshot()}
+
+
+class TurnScheduler(object):
+    """
+    Runs turns one at a time per partition key, e.g. per conversation, in arrival order, while turns of different
+    partitions run concurrently up to `max_concurrent_turns`. A turn waiting for its partition does not hold one
+    of the concurrent slots.
+
+    A turn must not wait on another turn of its own partition, as that would never start.
+    """
+    def __init__(self, max_concurrent_turns: int=64, max_tracked_partitions: int=1024):
+        if not isinstance(max_concurrent_turns, int):
+            raise TypeError('TurnScheduler(): max_concurrent_turns must be an integer.')
+        if max_concurrent_turns < 1:
+            raise ValueError('TurnScheduler(): max_concurrent_turns must be positive.')
+        self.max_concurrent_turns = max_concurrent_turns
+        self.max_tracked_partitions = max_tracked_partitions
+        self.running = 0
+        self.waiting = 0
+        self.wait_time = LatencyHistogram()
+        self._slots = None
+        self._locks = {}
+        self._stats = OrderedDict()
+
+    async def run(self, key: Hashable, turn: Callable[[], Awaitable]):
+        """
+        Runs `turn()` once every earlier turn with the same `key` has finished and a concurrent slot is free.
+        Turns with a None key are only subject to the concurrency limit.
+        :param key:
+        :param turn:
+        :return: The result of the turn.
+        """
+        if self._slots is None:
+            # Created lazily so that the semaphore binds to the running loop.
+            self._slots = asyncio.Semaphore(self.max_concurrent_turns)
+        stats = self._track(key)
+        stats.depth += 1
+        stats.max_depth = max(stats.max_depth, stats.depth)
+        self.waiting += 1
+        queued = perf_counter()
+        started = False
+        lock = None
+        acquired = False
+        try:
+            if key is not None:
+                lock = self._locks.get(key)
+                if lock is None:
+                    lock = self._locks[key] = _PartitionLock()
+                lock.users += 1
+                await lock.acquire()
+                acquired = True
+            async with self._slots:
+                started = True
+                waited = perf_counter() - queued
+                stats.wait_time.record(waited)
+                self.wait_time.record(waited)
+                stats.turns += 1
+                self.waiting -= 1
+                self.running += 1
+                try:
+                    return await turn()
+                finally:
+                    self.running -= 1
+        finally:
+            if not started:
+                # Cancelled before the turn started.
+                self.waiting -= 1
+            stats.depth -= 1
+            if acquired:
+                lock.release()
+            if lock is not None:
+                lock.users -= 1
+                if not lock.users:
+                    del self._locks[key]
+
+    def partition_stats(self, key: Hashable) -> PartitionStats:
+        """
+        Returns the metrics of a partition, or None if it has not been seen or was evicted. Metrics are kept for the
+        `max_tracked_partitions` most recently active partitions, and for every partition with turns queued or
+        running however many there are.
+        :param key:
+        :return:
+        """
+        return self._stats.get(key)
+
+    def snapshot(self) -> dict:
+        return {'running': self.running,
+                'waiting': self.waiting,
+                'wait_time': self.wait_time.snapshot(),
+                'partitions': {key: stats.snapshot() for key, stats in self._stats.items()}}
+
+    def _track(self, key: Hashable) -> PartitionStats:
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = PartitionStats()
+            excess = len(self._stats) - self.max_tracked_partitions
+            if excess > 0:
+                # Evict the least recently active idle partitions; those with turns queued or running keep their
+                # metrics, as the turns still update them.
+                idle = (k for k, other in self._stats.items() if not other.depth and k != key)
+                for evicted in list(islice(idle, excess)):
+                    del self._stats[evicted]
+        else:
+            self._stats.move_to_end(key)
+        return stats
+
+
+class _PartitionLock(asyncio.Lock):
+    """A lock that counts the turns queued on or holding it, so idle partitions can be dropped."""
+    def __init__(self):
+        super(_PartitionLock, self).__init__()
+        self.users = 0
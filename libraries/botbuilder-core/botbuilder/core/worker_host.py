@@ -0,0 +1,362 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import gc
+import os
+import signal
+import socket
+import tempfile
+import zlib
+from typing import Awaitable, Callable
+
+from botbuilder.schema import Activity, ActivityTypes, ConversationAccount
+from botframework.connector.client_models import SERIALIZER
+from botframework.connector.serialization import deserialize_activity, loads
+
+_HOP_BY_HOP_HEADERS = (b'connection', b'keep-alive', b'proxy-connection')
+# asyncio's default stream limit, which also bounds the request heads `readuntil` accepts.
+_MAX_HEAD_SIZE = 2 ** 16
+
+
+def warm_caches() -> None:
+    """
+    Builds the per-process caches of the schema and connector packages: loads the models and the connector clients'
+    serializer and compiles the Activity deserializers. `WorkerHost` calls it before forking, so that every worker
+    shares them copy-on-write.
+    :return:
+    """
+    activity = Activity(type=ActivityTypes.message, conversation=ConversationAccount(id='warm-up'))
+    data = SERIALIZER.body(activity, 'Activity')
+    deserialize_activity(data)
+    deserialize_activity(data, lazy=True)
+
+
+class WorkerHost(object):
+    """
+    Serves a bot from `workers` forked processes, so authentication and (de)serialization use more than one core.
+
+    `serve` is a coroutine function that serves HTTP on the listening socket it is given until it is cancelled,
+    e.g. with aiohttp's `SockSite`. It runs in every worker, each of which builds its own adapter, connector clients
+    and event loop. Caches built before the fork, by `warm_up` (defaults to `warm_caches`) or at import time, are
+    frozen with `gc.freeze()` so the workers share them copy-on-write.
+
+    By default every worker accepts connections on its own SO_REUSEPORT socket and the kernel balances them, or, where
+    SO_REUSEPORT is not available, all workers accept on one shared socket. With `conversation_affinity` the host
+    process instead accepts the connections itself and forwards each request, by a hash of its `conversation.id`, to
+    one worker over a unix socket, so per-conversation in-memory state stays on one worker. Affinity requests must
+    carry a Content-Length; requests with a body larger than `max_body_size` are answered with 413, and worker
+    responses larger than it with 502.
+
+    Workers that exit are restarted on the same listening socket, so connections queued meanwhile are not lost.
+    Fork is required, i.e. this is not available on Windows.
+    """
+    def __init__(self, serve: Callable[[socket.socket], Awaitable], host: str='localhost', port: int=3978,
+                 workers: int=None, conversation_affinity: bool=False, warm_up: Callable[[], None]=warm_caches,
+                 backlog: int=1024, max_body_size: int=1024 ** 2):
+        if not hasattr(os, 'fork'):
+            raise NotImplementedError('WorkerHost(): requires os.fork().')
+        workers = workers if workers is not None else os.cpu_count() or 1
+        if not isinstance(workers, int):
+            raise TypeError('WorkerHost(): workers must be an integer.')
+        if workers < 1:
+            raise ValueError('WorkerHost(): workers must be positive.')
+        self.serve = serve
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.conversation_affinity = conversation_affinity
+        self.warm_up = warm_up
+        self.backlog = backlog
+        self.max_body_size = max_body_size
+        self.restarts = 0
+        self._public_socket = None
+        self._sockets = []
+        self._pids = {}
+        self._socket_dir = None
+        self._server = None
+        self._stopping = None
+        self._started = None
+        self._next_worker = 0
+
+    def run(self) -> None:
+        """
+        Starts the workers and supervises them until the host process receives SIGINT or SIGTERM.
+        :return:
+        """
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, self.stop)
+        try:
+            loop.run_until_complete(self.serve_forever())
+        finally:
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                loop.remove_signal_handler(signum)
+            loop.close()
+
+    async def serve_forever(self) -> None:
+        """
+        Starts the workers, restarts those that exit and, once `stop()` is called, terminates them.
+        :return:
+        """
+        self._stopping = asyncio.Event()
+        self._started = asyncio.Event()
+        try:
+            self._listen()
+            if self.warm_up is not None:
+                self.warm_up()
+            if hasattr(gc, 'freeze'):
+                gc.collect()
+                gc.freeze()
+            for index in range(self.workers):
+                self._spawn(index)
+            if self.conversation_affinity:
+                self._server = await asyncio.start_server(self._dispatch, sock=self._public_socket,
+                                                          backlog=self.backlog)
+            self._started.set()
+            while not self._stopping.is_set():
+                self._reap()
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), 0.1)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self._shutdown()
+
+    async def wait_started(self) -> None:
+        """
+        Waits until every worker was started and the host accepts connections.
+        :return:
+        """
+        while self._started is None:
+            await asyncio.sleep(0.01)
+        await self._started.wait()
+
+    def stop(self) -> None:
+        if self._stopping is not None:
+            self._stopping.set()
+
+    @property
+    def worker_pids(self) -> list:
+        return sorted(self._pids)
+
+    def worker_for(self, conversation_id: str) -> int:
+        """
+        Returns the index of the worker that serves `conversation_id` under `conversation_affinity`.
+        :param conversation_id:
+        :return:
+        """
+        return zlib.crc32(conversation_id.encode('utf-8')) % self.workers
+
+    def _listen(self):
+        if self.conversation_affinity:
+            self._public_socket = _tcp_socket(self.host, self.port, self.backlog)
+            self.port = self._public_socket.getsockname()[1]
+            self._socket_dir = tempfile.mkdtemp(prefix='botbuilder-workers-')
+            for index in range(self.workers):
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.bind(os.path.join(self._socket_dir, '%d.sock' % index))
+                sock.listen(self.backlog)
+                self._sockets.append(sock)
+        elif hasattr(socket, 'SO_REUSEPORT'):
+            for index in range(self.workers):
+                sock = _tcp_socket(self.host, self.port, self.backlog, reuse_port=True)
+                self.port = sock.getsockname()[1]
+                self._sockets.append(sock)
+        else:
+            sock = _tcp_socket(self.host, self.port, self.backlog)
+            self.port = sock.getsockname()[1]
+            self._sockets = [sock] * self.workers
+
+    def _spawn(self, index: int):
+        pid = os.fork()
+        if pid:
+            self._pids[pid] = index
+            return
+        # In the worker. Never return into the caller's stack.
+        status = 1
+        try:
+            sock = self._sockets[index]
+            for other in set(self._sockets + [self._public_socket]) - {sock, None}:
+                other.close()
+            _run_worker(self.serve, sock)
+            status = 0
+        finally:
+            os._exit(status)
+
+    def _reap(self):
+        # Wait on our own workers only; the host may run inside a process with other children.
+        for pid, index in list(self._pids.items()):
+            try:
+                exited, _ = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                exited = pid
+            if exited:
+                del self._pids[pid]
+                if not self._stopping.is_set():
+                    self.restarts += 1
+                    self._spawn(index)
+
+    async def _shutdown(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for pid in self._pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in self._pids:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self._pids = {}
+        for sock in set(self._sockets):
+            sock.close()
+        self._sockets = []
+        if self._public_socket is not None:
+            self._public_socket.close()
+            self._public_socket = None
+        if self._socket_dir is not None:
+            for name in os.listdir(self._socket_dir):
+                os.unlink(os.path.join(self._socket_dir, name))
+            os.rmdir(self._socket_dir)
+            self._socket_dir = None
+
+    async def _dispatch(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+                request_line, headers = _parse_head(head)
+                if b'transfer-encoding' in headers:
+                    writer.write(b'HTTP/1.1 411 Length Required\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+                    break
+                length = int(headers.get(b'content-length', 0))
+                if length > self.max_body_size:
+                    writer.write(b'HTTP/1.1 413 Payload Too Large\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+                    break
+                body = await reader.readexactly(length)
+                keep_alive = _keep_alive(request_line, headers)
+
+                response = await self._forward(self._route(body), request_line, headers, body, keep_alive)
+                writer.write(response)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def _route(self, body: bytes) -> int:
+        try:
+            conversation_id = loads(body)['conversation']['id']
+        except (ValueError, KeyError, TypeError):
+            conversation_id = None
+        if not isinstance(conversation_id, str):
+            # Nothing to keep together, so spread the request round-robin.
+            self._next_worker = (self._next_worker + 1) % self.workers
+            return self._next_worker
+        return self.worker_for(conversation_id)
+
+    async def _forward(self, index: int, request_line: bytes, headers: '_Headers', body: bytes,
+                       keep_alive: bool) -> bytes:
+        try:
+            reader, writer = await asyncio.open_unix_connection(os.path.join(self._socket_dir, '%d.sock' % index))
+        except OSError:
+            return b'HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\n\r\n'
+        try:
+            writer.write(_build_head(request_line, headers, {b'Connection': b'close'}) + body)
+            response = await _read_to_eof(reader, _MAX_HEAD_SIZE + self.max_body_size)
+        finally:
+            writer.close()
+        if response is None:
+            return b'HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\n\r\n'
+        head, separator, body = response.partition(b'\r\n\r\n')
+        if not separator:
+            return b'HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\n\r\n'
+        status_line, response_headers = _parse_head(head + separator)
+        extra = {} if keep_alive else {b'Connection': b'close'}
+        if b'content-length' not in response_headers and b'transfer-encoding' not in response_headers:
+            # The worker delimited the body by closing the connection; the client's connection stays open.
+            extra[b'Content-Length'] = str(len(body)).encode('ascii')
+        return _build_head(status_line, response_headers, extra) + body
+
+
+async def _read_to_eof(reader: asyncio.StreamReader, limit: int) -> bytes:
+    """Reads until the connection is closed, or returns None once more than `limit` bytes arrived."""
+    chunks = []
+    size = 0
+    while True:
+        chunk = await reader.read(_MAX_HEAD_SIZE)
+        if not chunk:
+            return b''.join(chunks)
+        size += len(chunk)
+        if size > limit:
+            return None
+        chunks.append(chunk)
+
+
+def _tcp_socket(host: str, port: int, backlog: int, reuse_port: bool=False) -> socket.socket:
+    family = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0][0]
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.setblocking(False)
+    return sock
+
+
+def _run_worker(serve: Callable[[socket.socket], Awaitable], sock: socket.socket):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    task = loop.create_task(serve(sock))
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, task.cancel)
+    try:
+        loop.run_until_complete(task)
+    except asyncio.CancelledError:
+        pass
+    finally:
+        loop.close()
+
+
+class _Headers(dict):
+    """Header values by lower-case name, remembering how each name was spelled."""
+    def __init__(self):
+        super(_Headers, self).__init__()
+        self.names = {}
+
+
+def _parse_head(head: bytes):
+    lines = head.rstrip(b'\r\n').split(b'\r\n')
+    headers = _Headers()
+    for line in lines[1:]:
+        name, _, value = line.partition(b':')
+        name = name.strip()
+        headers[name.lower()] = value.strip()
+        headers.names[name.lower()] = name
+    return lines[0], headers
+
+
+def _build_head(first_line: bytes, headers: _Headers, extra: dict) -> bytes:
+    lines = [first_line]
+    lines.extend(headers.names[name] + b': ' + value for name, value in headers.items()
+                 if name not in _HOP_BY_HOP_HEADERS)
+    lines.extend(name + b': ' + value for name, value in extra.items())
+    return b'\r\n'.join(lines) + b'\r\n\r\n'
+
+
+def _keep_alive(request_line: bytes, headers: dict) -> bool:
+    connection = headers.get(b'connection', b'').lower()
+    if request_line.endswith(b'HTTP/1.0'):
+        return connection == b'keep-alive'
+    return connection != b'close'
@@ -20,6 +20,8 @@ setup(
     license='MIT',
     packages=["botbuilder.core"],
     install_requires=REQUIRES,
+    extras_require={
+        "aiohttp": ["aiohttp>=3.0"]},
     classifiers=[
         'Programming Language :: Python :: 3.6',
         'Intended Audience :: Developers',
@@ -0,0 +1,107 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import time
+import pytest
+
+from botbuilder.schema import Activity, ActivityTypes, ChannelAccount, ConversationAccount
+from botbuilder.core import AdmissionController, BotFrameworkAdapter, BotFrameworkAdapterSettings, TurnRejected
+
+
+def inbound(activity_type, text=None):
+    return Activity(type=activity_type, text=text, channel_id='test', service_url='https://example',
+                    conversation=ConversationAccount(id='conversation'),
+                    from_property=ChannelAccount(id='user'), recipient=ChannelAccount(id='bot'))
+
+
+class TestAdmissionController:
+
+    @pytest.mark.asyncio
+    async def test_sheds_low_priority_activities_first(self):
+        controller = AdmissionController(max_in_flight=4, low_priority_share=0.5)
+
+        controller.admit(inbound(ActivityTypes.typing))
+        controller.admit(inbound(ActivityTypes.message))
+        with pytest.raises(TurnRejected) as rejected:
+            controller.admit(inbound(ActivityTypes.conversation_update))
+        controller.admit(inbound(ActivityTypes.message))
+        controller.admit(inbound('message'))
+        with pytest.raises(TurnRejected):
+            controller.admit(inbound(ActivityTypes.message))
+
+        assert rejected.value.status == 429
+        assert rejected.value.headers == {'Retry-After': '1'}
+        assert controller.snapshot()['in_flight'] == 4
+        assert controller.rejected == {'conversationUpdate': 1, 'message': 1}
+
+        controller.release()
+        controller.admit(inbound(ActivityTypes.message))
+        controller.stop()
+
+    @pytest.mark.asyncio
+    async def test_rejects_while_the_event_loop_lags(self):
+        controller = AdmissionController(max_loop_lag=0.05, lag_sample_interval=0.01, retry_after=2.5)
+        with controller.admit(inbound(ActivityTypes.message)):
+            pass
+
+        # Block the loop, as a CPU-bound turn would.
+        time.sleep(0.1)
+
+        assert controller.loop_lag >= 0.05
+        with pytest.raises(TurnRejected) as rejected:
+            controller.admit(inbound(ActivityTypes.message))
+        assert rejected.value.reason == 'event loop lag too high'
+        assert rejected.value.headers == {'Retry-After': '3'}
+
+        await asyncio.sleep(0.05)
+        assert controller.loop_lag < 0.05
+        with controller.admit(inbound(ActivityTypes.message)):
+            assert controller.in_flight == 1
+        assert controller.in_flight == 0
+        controller.stop()
+
+    @pytest.mark.asyncio
+    async def test_samples_lag_only_while_turns_are_in_flight(self):
+        controller = AdmissionController(lag_sample_interval=0.01)
+
+        with controller.admit(inbound(ActivityTypes.message)):
+            await asyncio.sleep(0.03)
+            assert controller._sample_handle is not None
+        await asyncio.sleep(0.02)
+        assert controller._sample_handle is None
+        assert controller.loop_lag == 0.0
+
+        with controller.admit(inbound(ActivityTypes.message)):
+            assert controller._sample_handle is not None
+            await asyncio.sleep(0.02)
+            assert controller._sample_handle is not None
+        await asyncio.sleep(0.02)
+        assert controller._sample_handle is None
+
+    @pytest.mark.asyncio
+    async def test_adapter_rejects_before_authentication_and_releases_turns(self):
+        controller = AdmissionController(max_in_flight=2, low_priority_share=0.5)
+        adapter = BotFrameworkAdapter(BotFrameworkAdapterSettings('', '', admission_controller=controller))
+        authenticated = []
+        release = asyncio.Event()
+
+        async def authenticate_request(request, auth_header):
+            authenticated.append(request.text)
+
+        async def logic(context):
+            await release.wait()
+
+        adapter.authenticate_request = authenticate_request
+        first = asyncio.ensure_future(adapter.process_request(inbound(ActivityTypes.message, 'first'), '', logic))
+        await asyncio.sleep(0)
+
+        with pytest.raises(TurnRejected):
+            await adapter.process_request(inbound(ActivityTypes.typing, 'typing'), '', logic)
+        release.set()
+        await first
+        await adapter.process_request(inbound(ActivityTypes.typing, 'typing'), '', logic)
+
+        assert authenticated == ['first', 'typing']
+        assert controller.in_flight == 0
+        controller.stop()
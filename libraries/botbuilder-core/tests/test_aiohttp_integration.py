@@ -0,0 +1,172 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import json
+import os
+import aiohttp
+import jwt
+import pytest
+from aiohttp import web
+
+from botbuilder.core import (AdmissionController, AiohttpRequestHandler, BotFrameworkAdapter,
+                             BotFrameworkAdapterSettings, WorkerHost, serve_aiohttp_app)
+from botframework.connector.serialization import LazyActivity
+
+ACTIVITY = {'type': 'message', 'text': 'hi', 'channelId': 'test', 'serviceUrl': 'https://example',
+            'conversation': {'id': 'conversation'}, 'from': {'id': 'user'}, 'recipient': {'id': 'bot'}}
+
+
+def create_adapter(app_id='', app_password='', **kwargs):
+    return BotFrameworkAdapter(BotFrameworkAdapterSettings(app_id, app_password, **kwargs))
+
+
+async def start_server(handler):
+    app = web.Application()
+    app.router.add_post('/api/messages', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, 'http://127.0.0.1:%d/api/messages' % port
+
+
+async def post(url, data, content_type='application/json', headers=None):
+    async with aiohttp.ClientSession() as session:
+        async with session.post(url, data=data, headers=dict(headers or {}, **{'Content-Type': content_type})) \
+                as response:
+            return response.status, response.headers, await response.read()
+
+
+class TestAiohttpRequestHandler:
+
+    @pytest.mark.asyncio
+    async def test_runs_a_turn_for_the_raw_body(self):
+        received = []
+
+        async def logic(context):
+            received.append(context.request)
+
+        adapter = create_adapter(lazy_activities=True)
+        runner, url = await start_server(AiohttpRequestHandler(adapter, logic).handle)
+        try:
+            status, _, _ = await post(url, json.dumps(ACTIVITY).encode('utf-8'))
+        finally:
+            await runner.cleanup()
+
+        assert status == 202
+        assert isinstance(received[0], LazyActivity)
+        assert received[0].text == 'hi'
+        assert received[0].from_property.id == 'user'
+
+    @pytest.mark.asyncio
+    async def test_maps_the_result_of_the_turn(self):
+        results = [web.Response(status=200, text='handled'), {'id': 'reply'}]
+
+        async def logic(context):
+            return results.pop(0)
+
+        runner, url = await start_server(AiohttpRequestHandler(create_adapter(), logic).handle)
+        try:
+            handled = await post(url, json.dumps(ACTIVITY))
+            serialized = await post(url, json.dumps(ACTIVITY))
+        finally:
+            await runner.cleanup()
+
+        assert (handled[0], handled[2]) == (200, b'handled')
+        assert serialized[0] == 200
+        assert serialized[1]['Content-Type'] == 'application/json'
+        assert json.loads(serialized[2]) == {'id': 'reply'}
+
+    @pytest.mark.asyncio
+    async def test_rejects_invalid_requests(self):
+        async def logic(context):
+            raise AssertionError('No turn should run.')
+
+        runner, url = await start_server(AiohttpRequestHandler(create_adapter(), logic).handle)
+        try:
+            statuses = [(await post(url, data))[0] for data in (b'{"type": ', b'[1]', b'null', b'{"text": "hi"}')]
+            not_json = await post(url, json.dumps(ACTIVITY), content_type='text/plain')
+        finally:
+            await runner.cleanup()
+
+        assert statuses == [400, 400, 400, 400]
+        assert not_json[0] == 415
+
+    @pytest.mark.asyncio
+    async def test_maps_authentication_failures_to_401(self):
+        async def logic(context):
+            raise AssertionError('No turn should run.')
+
+        adapter = create_adapter('app-id', 'app-password')
+        runner, url = await start_server(AiohttpRequestHandler(adapter, logic).handle)
+        try:
+            missing = await post(url, json.dumps(ACTIVITY))
+            malformed = await post(url, json.dumps(ACTIVITY), headers={'Authorization': 'Bearer not-a-jwt'})
+        finally:
+            await runner.cleanup()
+
+        assert missing[0] == 401
+        assert malformed[0] == 401
+
+    @pytest.mark.asyncio
+    async def test_maps_failures_of_the_turn_to_500(self):
+        errors = [PermissionError('bot.log'), jwt.InvalidTokenError('from the bot')]
+
+        async def logic(context):
+            raise errors.pop(0)
+
+        runner, url = await start_server(AiohttpRequestHandler(create_adapter(), logic).handle)
+        try:
+            statuses = [(await post(url, json.dumps(ACTIVITY)))[0] for _ in range(2)]
+        finally:
+            await runner.cleanup()
+
+        assert statuses == [500, 500]
+
+    @pytest.mark.asyncio
+    async def test_maps_rejected_turns_to_429(self):
+        release = asyncio.Event()
+
+        async def logic(context):
+            await release.wait()
+
+        controller = AdmissionController(max_in_flight=1, retry_after=2)
+        adapter = create_adapter(admission_controller=controller)
+        runner, url = await start_server(AiohttpRequestHandler(adapter, logic).handle)
+        try:
+            first = asyncio.ensure_future(post(url, json.dumps(ACTIVITY)))
+            while not controller.in_flight:
+                await asyncio.sleep(0.01)
+            rejected = await post(url, json.dumps(ACTIVITY))
+            release.set()
+            await first
+        finally:
+            await runner.cleanup()
+            controller.stop()
+
+        assert rejected[0] == 429
+        assert rejected[1]['Retry-After'] == '2'
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='WorkerHost requires os.fork().')
+    @pytest.mark.asyncio
+    async def test_serves_an_application_from_worker_processes(self):
+        async def logic(context):
+            return web.Response(text=str(os.getpid()))
+
+        def create_app():
+            app = web.Application()
+            app.router.add_post('/api/messages', AiohttpRequestHandler(create_adapter(), logic).handle)
+            return app
+
+        host = WorkerHost(serve_aiohttp_app(create_app), host='127.0.0.1', port=0, workers=2)
+        serving = asyncio.ensure_future(host.serve_forever())
+        try:
+            await asyncio.wait_for(host.wait_started(), 10)
+            status, _, body = await post('http://127.0.0.1:%d/api/messages' % host.port, json.dumps(ACTIVITY))
+            assert status == 200
+            assert int(body) in host.worker_pids
+        finally:
+            host.stop()
+            await serving
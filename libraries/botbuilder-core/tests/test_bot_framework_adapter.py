@@ -0,0 +1,227 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import pytest
+
+from botbuilder.schema import (Activity, ActivityTypes, ChannelAccount, ConversationAccount, ConversationReference,
+                               ResourceResponse)
+from botbuilder.core import (AnonymousReceiveMiddleware, BotContext, BotFrameworkAdapter, BotFrameworkAdapterSettings,
+                             TurnScheduler)
+
+SERVICE_URL = 'https://example.botframework.com'
+
+
+class ConversationsStub(object):
+    def __init__(self, log, delays=None):
+        self.log = log
+        self.delays = delays or {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.sent = asyncio.Event()
+
+    async def send_to_conversation_async(self, conversation_id, activity):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.log.append(('start', activity.text))
+        await asyncio.sleep(self.delays.get(conversation_id, 0))
+        self.log.append(('end', activity.text))
+        self.in_flight -= 1
+        self.sent.set()
+        return ResourceResponse(id=activity.text)
+
+    async def update_activity_async(self, conversation_id, activity_id, activity):
+        self.log.append(('update', conversation_id, activity_id))
+        return ResourceResponse(id=activity_id)
+
+
+class ConnectorClientStub(object):
+    def __init__(self, conversations):
+        self.conversations = conversations
+
+
+def create_adapter(conversations, max_concurrent_sends=None):
+    adapter = BotFrameworkAdapter(BotFrameworkAdapterSettings('', '', max_concurrent_sends=max_concurrent_sends))
+    adapter.create_connector_client = lambda service_url: ConnectorClientStub(conversations)
+    return adapter
+
+
+def inbound(conversation_id):
+    return Activity(type=ActivityTypes.message, channel_id='test', conversation=ConversationAccount(id=conversation_id),
+                    from_property=ChannelAccount(id='user'), recipient=ChannelAccount(id='bot'))
+
+
+def message(conversation_id, text):
+    return Activity(type=ActivityTypes.message, text=text, service_url=SERVICE_URL,
+                    conversation=ConversationAccount(id=conversation_id))
+
+
+class TestBotFrameworkAdapter:
+
+    @pytest.mark.asyncio
+    async def test_send_activity_returns_responses_in_order(self):
+        log = []
+        adapter = create_adapter(ConversationsStub(log))
+
+        responses = await adapter.send_activity([message('a', '1'), message('b', '2')])
+
+        assert [r.id for r in responses] == ['1', '2']
+        assert log == [('start', '1'), ('end', '1'), ('start', '2'), ('end', '2')]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_send_preserves_order_within_conversation(self):
+        log = []
+        conversations = ConversationsStub(log, delays={'slow': 0.02})
+        adapter = create_adapter(conversations, max_concurrent_sends=4)
+
+        responses = await adapter.send_activity([message('slow', 'a1'), message('fast', 'b1'),
+                                                 message('slow', 'a2'), message('fast', 'b2')])
+
+        assert [r.id for r in responses] == ['a1', 'b1', 'a2', 'b2']
+        assert conversations.max_in_flight == 2
+        slow_events = [e for e in log if e[1].startswith('a')]
+        assert slow_events == [('start', 'a1'), ('end', 'a1'), ('start', 'a2'), ('end', 'a2')]
+        # The fast conversation finishes while the slow one is still waiting on its first reply.
+        assert log.index(('end', 'b2')) < log.index(('end', 'a1'))
+
+    @pytest.mark.asyncio
+    async def test_concurrent_send_is_bounded(self):
+        conversations = ConversationsStub([])
+        adapter = create_adapter(conversations, max_concurrent_sends=2)
+
+        await adapter.send_activity([message(str(i), str(i)) for i in range(6)])
+
+        assert conversations.max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_delay_is_an_ordering_barrier(self):
+        log = []
+        adapter = create_adapter(ConversationsStub(log, delays={'a': 0.01}), max_concurrent_sends=4)
+        delay = Activity(type='delay', value=1)
+
+        responses = await adapter.send_activity([message('a', '1'), delay, message('b', '2')])
+
+        assert log == [('start', '1'), ('end', '1'), ('start', '2'), ('end', '2')]
+        assert len(responses) == 3
+        assert responses[1].id is None
+
+    @pytest.mark.asyncio
+    async def test_update_activity_uses_activity_id(self):
+        log = []
+        adapter = create_adapter(ConversationsStub(log))
+        activity = message('a', 'updated')
+        activity.id = 'activity-1'
+
+        await adapter.update_activity(activity)
+
+        assert log == [('update', 'a', 'activity-1')]
+
+    @pytest.mark.asyncio
+    async def test_parse_request_lazy(self):
+        body = {'type': 'message', 'text': 'hi', 'channelData': {'tenant': {'id': 'tenant'}}}
+
+        eager = await BotFrameworkAdapter.parse_request({'body': body})
+        lazy = await BotFrameworkAdapter.parse_request({'body': body}, lazy=True)
+
+        assert '_lazy_fields' in lazy.__dict__
+        assert lazy == eager
+        assert lazy.channel_data == {'tenant': {'id': 'tenant'}}
+
+    @pytest.mark.asyncio
+    async def test_continue_conversation_runs_a_proactive_turn_through_middleware(self):
+        log = []
+        conversations = ConversationsStub(log)
+        adapter = create_adapter(conversations)
+        reference = ConversationReference(activity_id='activity-1', user=ChannelAccount(id='user'),
+                                          bot=ChannelAccount(id='bot'), conversation=ConversationAccount(id='a'),
+                                          channel_id='test', service_url=SERVICE_URL)
+        requests = []
+
+        async def middleware(context, next):
+            requests.append(context.request)
+            await next()
+
+        async def authenticate_request(request, auth_header):
+            raise AssertionError('Proactive turns are not authenticated.')
+
+        adapter.use(AnonymousReceiveMiddleware(middleware))
+        adapter.authenticate_request = authenticate_request
+
+        await adapter.continue_conversation(reference, lambda context: context.send_activity('proactive'))
+        # BotContext.send_activity hands the send to the event loop.
+        await asyncio.wait_for(conversations.sent.wait(), 1)
+
+        request = requests[0]
+        assert (request.type, request.name) == (ActivityTypes.event, 'continueConversation')
+        assert (request.from_property.id, request.recipient.id, request.id) == ('user', 'bot', 'activity-1')
+        assert log == [('start', 'proactive'), ('end', 'proactive')]
+
+    @pytest.mark.asyncio
+    async def test_continue_conversation_runs_within_a_turn_of_the_conversation(self):
+        adapter = BotFrameworkAdapter(BotFrameworkAdapterSettings('', '', turn_scheduler=TurnScheduler()))
+        adapter.create_connector_client = lambda service_url: ConnectorClientStub(ConversationsStub([]))
+        proactive = []
+
+        async def proactive_logic(context):
+            proactive.append(context)
+
+        async def logic(context):
+            # Continuing the conversation whose turn is running must not wait for that turn to end.
+            reference = BotContext.get_conversation_reference(context.request)
+            await adapter.continue_conversation(reference, proactive_logic, within_turn=True)
+
+        await adapter.process_request(inbound('a'), '', logic)
+
+        assert [context.request.conversation.id for context in proactive] == ['a']
+
+    @pytest.mark.asyncio
+    async def test_continue_conversation_waits_for_the_turns_of_its_conversation(self):
+        adapter = BotFrameworkAdapter(BotFrameworkAdapterSettings('', '', turn_scheduler=TurnScheduler()))
+        adapter.create_connector_client = lambda service_url: ConnectorClientStub(ConversationsStub([]))
+        log = []
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def logic(context):
+            log.append('inbound started')
+            started.set()
+            await release.wait()
+            log.append('inbound ended')
+
+        async def proactive_logic(context):
+            log.append('proactive ' + context.request.conversation.id)
+
+        def reference(conversation_id):
+            return BotContext.get_conversation_reference(inbound(conversation_id))
+
+        turn = asyncio.ensure_future(adapter.process_request(inbound('a'), '', logic))
+        await asyncio.wait_for(started.wait(), 1)
+        proactive = asyncio.ensure_future(adapter.continue_conversation(reference('a'), proactive_logic))
+        await adapter.continue_conversation(reference('b'), proactive_logic)
+        assert not proactive.done()
+
+        release.set()
+        await asyncio.gather(turn, proactive)
+
+        assert log == ['inbound started', 'proactive b', 'inbound ended', 'proactive a']
+
+    @pytest.mark.asyncio
+    async def test_continue_conversation_from_a_task_spawned_by_a_turn_waits_for_it(self):
+        adapter = BotFrameworkAdapter(BotFrameworkAdapterSettings('', '', turn_scheduler=TurnScheduler()))
+        adapter.create_connector_client = lambda service_url: ConnectorClientStub(ConversationsStub([]))
+        log = []
+        background = []
+
+        async def proactive_logic(context):
+            log.append('proactive')
+
+        async def logic(context):
+            reference = BotContext.get_conversation_reference(context.request)
+            background.append(asyncio.ensure_future(adapter.continue_conversation(reference, proactive_logic)))
+            await asyncio.sleep(0.01)
+            log.append('inbound ended')
+
+        await adapter.process_request(inbound('a'), '', logic)
+        await asyncio.gather(*background)
+
+        assert log == ['inbound ended', 'proactive']
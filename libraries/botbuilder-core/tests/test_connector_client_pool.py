@@ -0,0 +1,61 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import pytest
+
+from botbuilder.core import BotFrameworkAdapter, BotFrameworkAdapterSettings, ConnectorClientPool
+
+
+class TestConnectorClientPool:
+
+    def test_reuses_client_for_same_key(self):
+        pool = ConnectorClientPool(2)
+        built = []
+
+        def factory():
+            built.append(object())
+            return built[-1]
+
+        first = pool.get('https://a.example.com', 'app', factory)
+        second = pool.get('https://a.example.com', 'app', factory)
+
+        assert first is second
+        assert len(built) == 1
+        assert pool.hits == 1
+        assert pool.misses == 1
+
+    def test_separate_clients_per_app_id(self):
+        pool = ConnectorClientPool(4)
+        first = pool.get('https://a.example.com', 'app1', object)
+        second = pool.get('https://a.example.com', 'app2', object)
+
+        assert first is not second
+        assert pool.misses == 2
+
+    def test_evicts_least_recently_used(self):
+        pool = ConnectorClientPool(2)
+        pool.get('https://a.example.com', 'app', object)
+        pool.get('https://b.example.com', 'app', object)
+        # Touch "a" so that "b" becomes the least recently used entry.
+        pool.get('https://a.example.com', 'app', object)
+        pool.get('https://c.example.com', 'app', object)
+
+        assert pool.evictions == 1
+        assert ('https://a.example.com', 'app') in pool
+        assert ('https://b.example.com', 'app') not in pool
+        assert len(pool) == 2
+
+    def test_invalid_max_size_raises(self):
+        with pytest.raises(ValueError):
+            ConnectorClientPool(0)
+        with pytest.raises(TypeError):
+            ConnectorClientPool('128')
+
+    def test_adapter_reuses_connector_client(self):
+        adapter = BotFrameworkAdapter(BotFrameworkAdapterSettings('', '', connector_client_pool_size=4))
+        first = adapter.create_connector_client('https://a.example.com')
+        second = adapter.create_connector_client('https://a.example.com')
+
+        assert first is second
+        assert adapter.connector_client_pool.stats() == {'size': 1, 'max_size': 4, 'hits': 1,
+                                                         'misses': 1, 'evictions': 0}
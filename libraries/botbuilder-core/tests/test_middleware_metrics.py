@@ -0,0 +1,154 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import pytest
+
+from botbuilder.core import (AnonymousReceiveMiddleware, BotAdapter, LatencyHistogram, Middleware,
+                             MiddlewareMetrics, MiddlewareSet)
+from botbuilder.core import middleware_set as middleware_set_module
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(middleware_set_module, 'perf_counter', fake_clock)
+    return fake_clock
+
+
+class AdapterStub(BotAdapter):
+    async def send_activity(self, activities):
+        pass
+
+    async def update_activity(self, activity):
+        pass
+
+    async def delete_activity(self, reference):
+        pass
+
+
+class TestLatencyHistogram:
+
+    def test_percentiles_are_within_bucket_precision(self):
+        histogram = LatencyHistogram()
+        for microseconds in range(1, 10001):
+            histogram.record(microseconds / 1e6)
+
+        assert histogram.count == 10000
+        assert histogram.percentile(50) == pytest.approx(0.005, rel=1 / 64)
+        assert histogram.percentile(99) == pytest.approx(0.0099, rel=1 / 64)
+        assert histogram.percentile(100) == histogram.max == 0.01
+        assert histogram.percentile(0) == histogram.min == 1e-6
+        assert histogram.mean == pytest.approx(0.0050005)
+
+    def test_small_values_are_exact(self):
+        histogram = LatencyHistogram()
+        for microseconds in (3, 3, 7, 100):
+            histogram.record(microseconds / 1e6)
+
+        assert histogram.percentile(50) == 3e-6
+        assert histogram.percentile(75) == 7e-6
+
+    def test_empty(self):
+        assert LatencyHistogram().snapshot() == {'count': 0, 'mean': 0.0, 'min': 0.0, 'p50': 0.0, 'p90': 0.0,
+                                                 'p99': 0.0, 'max': 0.0}
+
+
+class TestMiddlewareInstrumentation:
+
+    @pytest.mark.asyncio
+    async def test_records_self_and_total_time(self, clock):
+        class Outer(Middleware):
+            async def on_process_request(self, context, logic):
+                clock.advance(0.001)
+                await logic()
+                clock.advance(0.002)
+
+        async def inner(context, logic):
+            clock.advance(0.010)
+            await logic()
+
+        async def bot_logic(context):
+            clock.advance(0.100)
+
+        middleware_set = MiddlewareSet().use(Outer()).use(AnonymousReceiveMiddleware(inner))
+        metrics = middleware_set.enable_instrumentation()
+        await middleware_set.receive_activity_with_status(None, bot_logic)
+
+        outer = metrics.middleware['Outer']
+        inner_timing = metrics.middleware['TestMiddlewareInstrumentation.test_records_self_and_total_time.'
+                                          '<locals>.inner']
+        assert outer.calls == 1
+        assert outer.self_time.max == pytest.approx(0.003)
+        assert outer.total_time.max == pytest.approx(0.113)
+        assert inner_timing.self_time.max == pytest.approx(0.010)
+        assert inner_timing.total_time.max == pytest.approx(0.110)
+
+    @pytest.mark.asyncio
+    async def test_counts_errors_and_short_circuits(self, clock):
+        class Stop(Middleware):
+            async def on_process_request(self, context, logic):
+                if context == 'fail':
+                    raise ValueError(context)
+
+        middleware_set = MiddlewareSet().use(Stop())
+        metrics = middleware_set.enable_instrumentation()
+        await middleware_set.receive_activity(None)
+        with pytest.raises(ValueError):
+            await middleware_set.receive_activity('fail')
+
+        snapshot = metrics.snapshot()['Stop']
+        assert (snapshot['calls'], snapshot['errors'], snapshot['short_circuits']) == (2, 1, 2)
+
+        metrics.reset()
+        await middleware_set.receive_activity(None)
+        assert metrics.middleware['Stop'].calls == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_chain_has_no_timing_steps(self, clock):
+        class PassThrough(Middleware):
+            async def on_process_request(self, context, logic):
+                return await logic()
+
+        adapter = AdapterStub()
+        adapter.use(PassThrough())
+        metrics = adapter.enable_middleware_instrumentation(MiddlewareMetrics())
+        await adapter.run_middleware(None)
+        assert adapter.middleware_metrics is metrics
+        assert metrics.middleware['PassThrough'].calls == 1
+
+        adapter._middleware.disable_instrumentation()
+        await adapter.run_middleware(None)
+        assert adapter.middleware_metrics is None
+        assert metrics.middleware['PassThrough'].calls == 1
+        assert not any('_timed_middleware_step' in step.__qualname__ for step in adapter._middleware._chains[None])
+
+    @pytest.mark.asyncio
+    async def test_nested_set_timed_as_a_whole_and_semantics_kept(self, clock):
+        calls = []
+
+        async def stop(context, logic):
+            calls.append('stop')
+
+        async def last(context, logic):
+            calls.append('last')
+            await logic()
+
+        nested = MiddlewareSet().use(AnonymousReceiveMiddleware(stop))
+        middleware_set = MiddlewareSet().use(nested).use(AnonymousReceiveMiddleware(last))
+        metrics = middleware_set.enable_instrumentation()
+        await middleware_set.receive_activity(None)
+
+        assert calls == ['stop', 'last']
+        assert metrics.middleware['MiddlewareSet'].calls == 1
+        assert metrics.middleware['MiddlewareSet'].short_circuits == 0
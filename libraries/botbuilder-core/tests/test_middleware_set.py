@@ -3,7 +3,8 @@
 
 import pytest
 
-from botbuilder.core import AnonymousReceiveMiddleware, MiddlewareSet, Middleware
+from botbuilder.schema import Activity, ActivityTypes
+from botbuilder.core import AnonymousReceiveMiddleware, BotContext, MiddlewareSet, Middleware
 
 
 class TestMiddlewareSet:
@@ -264,3 +265,109 @@ class TestMiddlewareSet:
         await middleware_set.receive_activity(None)
         assert called_regular_middleware
         assert called_anonymous_middleware
+
+    @pytest.mark.asyncio
+    async def test_use_after_running_rebuilds_the_chain(self):
+        calls = []
+
+        def record(name):
+            async def processor(context, logic):
+                calls.append(name)
+                return await logic()
+            return AnonymousReceiveMiddleware(processor)
+
+        middleware_set = MiddlewareSet().use(record('first'))
+        await middleware_set.receive_activity(None)
+        middleware_set.use(record('second'))
+        await middleware_set.receive_activity(None)
+
+        assert calls == ['first', 'first', 'second']
+
+    @pytest.mark.asyncio
+    async def test_nested_set_short_circuit_only_stops_the_nested_set(self):
+        calls = []
+
+        def record(name, call_next=True):
+            async def processor(context, logic):
+                calls.append(name)
+                if call_next:
+                    await logic()
+                calls.append(name + ' done')
+            return AnonymousReceiveMiddleware(processor)
+
+        nested = MiddlewareSet().use(record('nested')).use(record('stop', call_next=False)).use(record('skipped'))
+        middleware_set = MiddlewareSet().use(record('outer')).use(nested).use(record('last'))
+
+        async def runs_after_pipeline(context):
+            calls.append('callback')
+
+        await middleware_set.receive_activity_with_status(None, runs_after_pipeline)
+        # Middleware added to the nested set later is picked up by the outer set.
+        nested.use(record('added'))
+        await middleware_set.receive_activity(None)
+
+        assert calls == ['outer', 'nested', 'stop', 'stop done', 'nested done', 'last', 'callback', 'last done',
+                         'outer done',
+                         'outer', 'nested', 'stop', 'stop done', 'nested done', 'last', 'last done', 'outer done']
+
+    @pytest.mark.asyncio
+    async def test_next_can_be_called_more_than_once(self):
+        callback_count = 0
+
+        async def retry(context, logic):
+            await logic()
+            return await logic()
+
+        async def runs_after_pipeline(context):
+            nonlocal callback_count
+            callback_count += 1
+            return callback_count
+
+        middleware_set = MiddlewareSet().use(AnonymousReceiveMiddleware(retry))
+
+        assert await middleware_set.receive_activity_with_status(None, runs_after_pipeline) == 2
+        assert callback_count == 2
+
+    @pytest.mark.asyncio
+    async def test_activity_type_filters(self):
+        calls = []
+
+        def record(name):
+            async def processor(context, logic):
+                calls.append(name)
+                return await logic()
+            return AnonymousReceiveMiddleware(processor)
+
+        middleware_set = MiddlewareSet()\
+            .use(record('all'))\
+            .use(record('messages'), activity_types=[ActivityTypes.message])\
+            .use(record('updates'), activity_types=['conversationUpdate', ActivityTypes.message_reaction])\
+            .use(record('typing'), activity_types='typing')
+
+        async def runs_after_pipeline(context):
+            calls.append('callback ' + context.request.type)
+
+        for activity_type in ('message', ActivityTypes.conversation_update, 'messageReaction', 'typing', 'event'):
+            context = BotContext(None, Activity(type=activity_type))
+            await middleware_set.receive_activity_with_status(context, runs_after_pipeline)
+
+        assert calls == ['all', 'messages', 'callback message',
+                         'all', 'updates', 'callback conversationUpdate',
+                         'all', 'updates', 'callback messageReaction',
+                         'all', 'typing', 'callback typing',
+                         'all', 'callback event']
+        assert sorted(map(str, middleware_set._chains)) == ['None', 'conversationUpdate', 'message',
+                                                            'messageReaction', 'typing']
+
+    @pytest.mark.asyncio
+    async def test_filtered_middleware_is_skipped_without_an_activity(self):
+        called = False
+
+        async def processor(context, logic):
+            nonlocal called
+            called = True
+
+        middleware_set = MiddlewareSet().use(AnonymousReceiveMiddleware(processor), activity_types=['message'])
+        await middleware_set.receive_activity(None)
+
+        assert not called
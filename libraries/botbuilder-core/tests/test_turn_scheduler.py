@@ -0,0 +1,140 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import pytest
+
+from botbuilder.schema import Activity, ActivityTypes, ChannelAccount, ConversationAccount
+from botbuilder.core import BotFrameworkAdapter, BotFrameworkAdapterSettings, TurnScheduler
+
+
+def recording_turn(log, name, delay=0.0, result=None):
+    async def turn():
+        log.append(('start', name))
+        await asyncio.sleep(delay)
+        log.append(('end', name))
+        return result
+    return turn
+
+
+class TestTurnScheduler:
+
+    @pytest.mark.asyncio
+    async def test_serializes_turns_per_key_in_arrival_order(self):
+        log = []
+        scheduler = TurnScheduler()
+
+        results = await asyncio.gather(scheduler.run('a', recording_turn(log, 'a1', 0.02, 1)),
+                                       scheduler.run('b', recording_turn(log, 'b1', 0.0, 2)),
+                                       scheduler.run('a', recording_turn(log, 'a2', 0.0, 3)))
+
+        assert results == [1, 2, 3]
+        assert [e for e in log if e[1].startswith('a')] == [('start', 'a1'), ('end', 'a1'),
+                                                            ('start', 'a2'), ('end', 'a2')]
+        # The other conversation does not wait for the slow one.
+        assert log.index(('end', 'b1')) < log.index(('end', 'a1'))
+        assert scheduler._locks == {}
+
+    @pytest.mark.asyncio
+    async def test_limits_concurrent_turns(self):
+        scheduler = TurnScheduler(max_concurrent_turns=2)
+        running = 0
+        max_running = 0
+
+        async def turn():
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.005)
+            running -= 1
+
+        await asyncio.gather(*[scheduler.run(str(i), turn) for i in range(6)])
+
+        assert max_running == 2
+        assert scheduler.snapshot()['wait_time']['count'] == 6
+        assert scheduler.running == scheduler.waiting == 0
+
+    @pytest.mark.asyncio
+    async def test_partition_metrics(self):
+        scheduler = TurnScheduler(max_tracked_partitions=2)
+
+        await asyncio.gather(*[scheduler.run('a', recording_turn([], i, 0.01)) for i in range(3)])
+        await scheduler.run('b', recording_turn([], 'b'))
+        await scheduler.run('c', recording_turn([], 'c'))
+
+        assert scheduler.partition_stats('a') is None
+        assert scheduler.partition_stats('c').turns == 1
+        assert set(scheduler.snapshot()['partitions']) == {'b', 'c'}
+
+        await asyncio.gather(*[scheduler.run('a', recording_turn([], i, 0.01)) for i in range(3)])
+        stats = scheduler.partition_stats('a')
+        assert (stats.depth, stats.max_depth, stats.turns) == (0, 3, 3)
+        assert stats.wait_time.max >= 0.02
+
+    @pytest.mark.asyncio
+    async def test_partitions_with_queued_turns_are_not_evicted(self):
+        scheduler = TurnScheduler(max_tracked_partitions=2)
+        release = asyncio.Event()
+
+        async def blocked():
+            await release.wait()
+
+        a = [asyncio.ensure_future(scheduler.run('a', blocked)) for _ in range(2)]
+        await asyncio.sleep(0)
+        await scheduler.run('b', recording_turn([], 'b'))
+        await scheduler.run('c', recording_turn([], 'c'))
+        await scheduler.run('d', recording_turn([], 'd'))
+
+        assert set(scheduler.snapshot()['partitions']) == {'a', 'd'}
+        assert scheduler.partition_stats('a').depth == 2
+        release.set()
+        await asyncio.gather(*a)
+        stats = scheduler.partition_stats('a')
+        assert (stats.depth, stats.turns) == (0, 2)
+
+    @pytest.mark.asyncio
+    async def test_failed_and_cancelled_turns_release_the_partition(self):
+        log = []
+        scheduler = TurnScheduler()
+
+        async def fail():
+            raise ValueError('turn failed')
+
+        with pytest.raises(ValueError):
+            await scheduler.run('a', fail)
+
+        first = asyncio.ensure_future(scheduler.run('a', recording_turn(log, 'first', 0.02)))
+        cancelled = asyncio.ensure_future(scheduler.run('a', recording_turn(log, 'cancelled')))
+        last = asyncio.ensure_future(scheduler.run('a', recording_turn(log, 'last')))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(first, last)
+
+        assert log == [('start', 'first'), ('end', 'first'), ('start', 'last'), ('end', 'last')]
+        assert scheduler.waiting == 0
+        assert scheduler.partition_stats('a').depth == 0
+        assert scheduler._locks == {}
+
+    @pytest.mark.asyncio
+    async def test_adapter_serializes_turns_per_conversation(self):
+        log = []
+        scheduler = TurnScheduler()
+        adapter = BotFrameworkAdapter(BotFrameworkAdapterSettings('', '', turn_scheduler=scheduler))
+
+        def inbound(conversation_id, text):
+            return Activity(type=ActivityTypes.message, text=text, channel_id='test', service_url='https://example',
+                            conversation=ConversationAccount(id=conversation_id),
+                            from_property=ChannelAccount(id='user'), recipient=ChannelAccount(id='bot'))
+
+        async def logic(context):
+            log.append(('start', context.request.text))
+            await asyncio.sleep(0.01 if context.request.text == 'a1' else 0)
+            log.append(('end', context.request.text))
+
+        await asyncio.gather(adapter.process_request(inbound('a', 'a1'), '', logic),
+                             adapter.process_request(inbound('a', 'a2'), '', logic),
+                             adapter.process_request(inbound('b', 'b1'), '', logic))
+
+        assert log.index(('end', 'a1')) < log.index(('start', 'a2'))
+        assert log.index(('end', 'b1')) < log.index(('end', 'a1'))
+        assert scheduler.partition_stats(('test', 'a')).turns == 2
@@ -0,0 +1,152 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import json
+import os
+import signal
+import pytest
+
+from botbuilder.core import WorkerHost
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'fork'), reason='WorkerHost requires os.fork().')
+
+
+def content_length(head):
+    lengths = [int(line.split(b':')[1]) for line in head.split(b'\r\n') if line.lower().startswith(b'content-length')]
+    return lengths[0] if lengths else None
+
+
+async def serve_pid(sock):
+    """Answers every request with the worker's pid and closes the connection."""
+    async def handle(reader, writer):
+        head = await reader.readuntil(b'\r\n\r\n')
+        await reader.readexactly(content_length(head) or 0)
+        writer.write(b'HTTP/1.1 200 OK\r\nConnection: close\r\n\r\n' + str(os.getpid()).encode())
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, sock=sock)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        server.close()
+
+
+async def serve_large(sock):
+    """Answers every request with a 128 KiB body delimited by closing the connection."""
+    async def handle(reader, writer):
+        head = await reader.readuntil(b'\r\n\r\n')
+        await reader.readexactly(content_length(head) or 0)
+        writer.write(b'HTTP/1.1 200 OK\r\nConnection: close\r\n\r\n' + b'x' * 2 ** 17)
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, sock=sock)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        server.close()
+
+
+async def send(port, body):
+    """Posts `body` and returns the status line of the response."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(b'POST /api/messages HTTP/1.1\r\nHost: localhost\r\nContent-Length: %d\r\n\r\n' % len(body) + body)
+    head = await reader.readuntil(b'\r\n\r\n')
+    writer.close()
+    return head.split(b'\r\n')[0]
+
+
+async def post(port, conversation_id, connection=None):
+    """Posts an activity and returns the pid of the worker that served it."""
+    reader, writer = connection or await asyncio.open_connection('127.0.0.1', port)
+    body = json.dumps({'type': 'message', 'conversation': {'id': conversation_id}}).encode()
+    writer.write(b'POST /api/messages HTTP/1.1\r\nHost: localhost\r\nContent-Length: %d\r\n\r\n' % len(body) + body)
+    head = await reader.readuntil(b'\r\n\r\n')
+    length = content_length(head)
+    pid = int(await reader.readexactly(length) if length is not None else await reader.read())
+    if connection is None:
+        writer.close()
+    return pid
+
+
+async def run_host(host, test):
+    serving = asyncio.ensure_future(host.serve_forever())
+    try:
+        await asyncio.wait_for(host.wait_started(), 10)
+        await test()
+    finally:
+        host.stop()
+        await serving
+
+
+class TestWorkerHost:
+
+    @pytest.mark.asyncio
+    async def test_workers_share_the_port(self):
+        host = WorkerHost(serve_pid, host='127.0.0.1', port=0, workers=2)
+
+        async def test():
+            pids = {await post(host.port, str(i)) for i in range(20)}
+            assert pids <= set(host.worker_pids)
+            assert len(host.worker_pids) == 2
+
+        await run_host(host, test)
+        assert host.worker_pids == []
+
+    @pytest.mark.asyncio
+    async def test_conversation_affinity(self):
+        host = WorkerHost(serve_pid, host='127.0.0.1', port=0, workers=3, conversation_affinity=True)
+
+        async def test():
+            pids = {}
+            connection = await asyncio.open_connection('127.0.0.1', host.port)
+            for i in range(30):
+                conversation_id = 'conversation-%d' % (i % 6)
+                # Every request of a conversation reaches the same worker, whichever connection carries it.
+                pid = await post(host.port, conversation_id, connection if i % 2 else None)
+                assert pids.setdefault(conversation_id, pid) == pid
+            connection[1].close()
+            by_worker = {host.worker_for(conversation_id) for conversation_id in pids}
+            assert len(set(pids.values())) == len(by_worker)
+
+        await run_host(host, test)
+
+    @pytest.mark.asyncio
+    async def test_restarts_workers_that_exit(self):
+        host = WorkerHost(serve_pid, host='127.0.0.1', port=0, workers=1, conversation_affinity=True)
+
+        async def test():
+            first = await post(host.port, 'a')
+            os.kill(first, signal.SIGKILL)
+            while host.restarts == 0:
+                await asyncio.sleep(0.05)
+            second = await post(host.port, 'a')
+            assert second != first
+            assert host.worker_pids == [second]
+
+        await run_host(host, test)
+
+    @pytest.mark.asyncio
+    async def test_refuses_bodies_larger_than_max_body_size(self):
+        host = WorkerHost(serve_pid, host='127.0.0.1', port=0, workers=1, conversation_affinity=True,
+                          max_body_size=1024)
+
+        async def test():
+            body = json.dumps({'type': 'message', 'conversation': {'id': 'a'}, 'text': 'x' * 1024}).encode()
+            assert await send(host.port, body) == b'HTTP/1.1 413 Payload Too Large'
+            assert await post(host.port, 'a') in host.worker_pids
+
+        await run_host(host, test)
+
+    @pytest.mark.asyncio
+    async def test_refuses_worker_responses_larger_than_max_body_size(self):
+        host = WorkerHost(serve_large, host='127.0.0.1', port=0, workers=1, conversation_affinity=True,
+                          max_body_size=1024)
+
+        async def test():
+            body = json.dumps({'type': 'message', 'conversation': {'id': 'a'}}).encode()
+            assert await send(host.port, body) == b'HTTP/1.1 502 Bad Gateway'
+
+        await run_host(host, test)
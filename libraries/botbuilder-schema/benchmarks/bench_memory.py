@@ -0,0 +1,68 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Measures retained memory per Activity and per ConversationReference for the botbuilder.schema models
+and their slotted variants in botbuilder.schema.slotted.
+
+Usage: python benchmarks/bench_memory.py [--count 10000]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from botbuilder import schema
+from botbuilder.schema import slotted
+
+INBOUND_MESSAGE = {
+    'type': 'message',
+    'id': 'bf3cc9a2f5de',
+    'serviceUrl': 'https://smba.trafficmanager.net/amer-client-ss.msg/',
+    'channelId': 'msteams',
+    'from': {'id': '29:1XJKJMvc5GBtc2JwZq0oj8tHZmzrQgFmB39ATiQW', 'name': 'Megan Bowen'},
+    'conversation': {'id': 'a:17I0kl8EkpE1O9PH5TWrzrLNwnWWcfrU7QZjKR0WSfOpzbfcAg2IaydGElSo10tVr4C7F',
+                     'conversationType': 'personal'},
+    'recipient': {'id': '28:c9e8c047-2a74-40a2-b28a-b162d5f5327c', 'name': 'Teams TestBot'},
+    'textFormat': 'plain',
+    'locale': 'en-US',
+    'text': 'Hello bot',
+}
+
+CONVERSATION_REFERENCE = {
+    'activityId': 'bf3cc9a2f5de',
+    'user': INBOUND_MESSAGE['from'],
+    'bot': INBOUND_MESSAGE['recipient'],
+    'conversation': INBOUND_MESSAGE['conversation'],
+    'channelId': INBOUND_MESSAGE['channelId'],
+    'serviceUrl': INBOUND_MESSAGE['serviceUrl'],
+}
+
+
+def bytes_per_object(model, data: dict, count: int) -> float:
+    # Deserialize once up front so that interned strings and class caches are not counted.
+    model.deserialize(data)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [model.deserialize(data) for _ in range(count)]
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del objects
+    return retained / count
+
+
+def main(count: int):
+    for name, data in (('Activity', INBOUND_MESSAGE), ('ConversationReference', CONVERSATION_REFERENCE)):
+        regular = bytes_per_object(getattr(schema, name), data, count)
+        compact = bytes_per_object(getattr(slotted, name), data, count)
+        print('%-22s  %7.0f bytes   slotted %7.0f bytes   (%.0f%% smaller)' %
+              (name, regular, compact, 100 * (1 - compact / regular)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=10000)
+    args = parser.parse_args()
+    main(args.count)
@@ -9,136 +9,117 @@
 # regenerated.
 # --------------------------------------------------------------------------
 
-try:
-    from .attachment_view_py3 import AttachmentView
-    from .attachment_info_py3 import AttachmentInfo
-    from .error_py3 import Error
-    from .error_response_py3 import ErrorResponse, ErrorResponseException
-    from .channel_account_py3 import ChannelAccount
-    from .conversation_account_py3 import ConversationAccount
-    from .message_reaction_py3 import MessageReaction
-    from .card_action_py3 import CardAction
-    from .suggested_actions_py3 import SuggestedActions
-    from .attachment_py3 import Attachment
-    from .entity_py3 import Entity
-    from .conversation_reference_py3 import ConversationReference
-    from .text_highlight_py3 import TextHighlight
-    from .activity_py3 import Activity
-    from .conversation_parameters_py3 import ConversationParameters
-    from .conversation_resource_response_py3 import ConversationResourceResponse
-    from .conversation_members_py3 import ConversationMembers
-    from .conversations_result_py3 import ConversationsResult
-    from .resource_response_py3 import ResourceResponse
-    from .attachment_data_py3 import AttachmentData
-    from .card_image_py3 import CardImage
-    from .hero_card_py3 import HeroCard
-    from .thumbnail_url_py3 import ThumbnailUrl
-    from .media_url_py3 import MediaUrl
-    from .animation_card_py3 import AnimationCard
-    from .audio_card_py3 import AudioCard
-    from .basic_card_py3 import BasicCard
-    from .media_card_py3 import MediaCard
-    from .fact_py3 import Fact
-    from .receipt_item_py3 import ReceiptItem
-    from .receipt_card_py3 import ReceiptCard
-    from .signin_card_py3 import SigninCard
-    from .oauth_card_py3 import OAuthCard
-    from .thumbnail_card_py3 import ThumbnailCard
-    from .video_card_py3 import VideoCard
-    from .geo_coordinates_py3 import GeoCoordinates
-    from .mention_py3 import Mention
-    from .place_py3 import Place
-    from .thing_py3 import Thing
-    from .media_event_value_py3 import MediaEventValue
-    from .token_request_py3 import TokenRequest
-    from .token_response_py3 import TokenResponse
-    from .microsoft_pay_method_data_py3 import MicrosoftPayMethodData
-    from .payment_address_py3 import PaymentAddress
-    from .payment_currency_amount_py3 import PaymentCurrencyAmount
-    from .payment_item_py3 import PaymentItem
-    from .payment_shipping_option_py3 import PaymentShippingOption
-    from .payment_details_modifier_py3 import PaymentDetailsModifier
-    from .payment_details_py3 import PaymentDetails
-    from .payment_method_data_py3 import PaymentMethodData
-    from .payment_options_py3 import PaymentOptions
-    from .payment_request_py3 import PaymentRequest
-    from .payment_response_py3 import PaymentResponse
-    from .payment_request_complete_py3 import PaymentRequestComplete
-    from .payment_request_complete_result_py3 import PaymentRequestCompleteResult
-    from .payment_request_update_py3 import PaymentRequestUpdate
-    from .payment_request_update_result_py3 import PaymentRequestUpdateResult
-except (SyntaxError, ImportError):
-    from .attachment_view import AttachmentView
-    from .attachment_info import AttachmentInfo
-    from .error import Error
-    from .error_response import ErrorResponse, ErrorResponseException
-    from .channel_account import ChannelAccount
-    from .conversation_account import ConversationAccount
-    from .message_reaction import MessageReaction
-    from .card_action import CardAction
-    from .suggested_actions import SuggestedActions
-    from .attachment import Attachment
-    from .entity import Entity
-    from .conversation_reference import ConversationReference
-    from .text_highlight import TextHighlight
-    from .activity import Activity
-    from .conversation_parameters import ConversationParameters
-    from .conversation_resource_response import ConversationResourceResponse
-    from .conversation_members import ConversationMembers
-    from .conversations_result import ConversationsResult
-    from .resource_response import ResourceResponse
-    from .attachment_data import AttachmentData
-    from .card_image import CardImage
-    from .hero_card import HeroCard
-    from .thumbnail_url import ThumbnailUrl
-    from .media_url import MediaUrl
-    from .animation_card import AnimationCard
-    from .audio_card import AudioCard
-    from .basic_card import BasicCard
-    from .media_card import MediaCard
-    from .fact import Fact
-    from .receipt_item import ReceiptItem
-    from .receipt_card import ReceiptCard
-    from .signin_card import SigninCard
-    from .oauth_card import OAuthCard
-    from .thumbnail_card import ThumbnailCard
-    from .video_card import VideoCard
-    from .geo_coordinates import GeoCoordinates
-    from .mention import Mention
-    from .place import Place
-    from .thing import Thing
-    from .media_event_value import MediaEventValue
-    from .token_request import TokenRequest
-    from .token_response import TokenResponse
-    from .microsoft_pay_method_data import MicrosoftPayMethodData
-    from .payment_address import PaymentAddress
-    from .payment_currency_amount import PaymentCurrencyAmount
-    from .payment_item import PaymentItem
-    from .payment_shipping_option import PaymentShippingOption
-    from .payment_details_modifier import PaymentDetailsModifier
-    from .payment_details import PaymentDetails
-    from .payment_method_data import PaymentMethodData
-    from .payment_options import PaymentOptions
-    from .payment_request import PaymentRequest
-    from .payment_response import PaymentResponse
-    from .payment_request_complete import PaymentRequestComplete
-    from .payment_request_complete_result import PaymentRequestCompleteResult
-    from .payment_request_update import PaymentRequestUpdate
-    from .payment_request_update_result import PaymentRequestUpdateResult
-from .connector_client_enums import (
-    RoleTypes,
-    ActivityTypes,
-    TextFormatTypes,
-    AttachmentLayoutTypes,
-    MessageReactionTypes,
-    InputHints,
-    ActionTypes,
-    EndOfConversationCodes,
-    ContactRelationUpdateActionTypes,
-    InstallationUpdateActionTypes,
-    ActivityImportance,
+import sys
+from importlib import import_module
+
+# Models are imported on first access (PEP 562) so that importing the package, e.g. for the enums,
+# does not load msrest and every model module. All models are loaded together because msrest resolves
+# nested model types from this package's namespace.
+_MODEL_MODULES = {
+    'AttachmentView': 'attachment_view',
+    'AttachmentInfo': 'attachment_info',
+    'Error': 'error',
+    'ErrorResponse': 'error_response',
+    'ErrorResponseException': 'error_response',
+    'ChannelAccount': 'channel_account',
+    'ConversationAccount': 'conversation_account',
+    'MessageReaction': 'message_reaction',
+    'CardAction': 'card_action',
+    'SuggestedActions': 'suggested_actions',
+    'Attachment': 'attachment',
+    'Entity': 'entity',
+    'ConversationReference': 'conversation_reference',
+    'TextHighlight': 'text_highlight',
+    'Activity': 'activity',
+    'ConversationParameters': 'conversation_parameters',
+    'ConversationResourceResponse': 'conversation_resource_response',
+    'ConversationMembers': 'conversation_members',
+    'ConversationsResult': 'conversations_result',
+    'ResourceResponse': 'resource_response',
+    'AttachmentData': 'attachment_data',
+    'CardImage': 'card_image',
+    'HeroCard': 'hero_card',
+    'ThumbnailUrl': 'thumbnail_url',
+    'MediaUrl': 'media_url',
+    'AnimationCard': 'animation_card',
+    'AudioCard': 'audio_card',
+    'BasicCard': 'basic_card',
+    'MediaCard': 'media_card',
+    'Fact': 'fact',
+    'ReceiptItem': 'receipt_item',
+    'ReceiptCard': 'receipt_card',
+    'SigninCard': 'signin_card',
+    'OAuthCard': 'oauth_card',
+    'ThumbnailCard': 'thumbnail_card',
+    'VideoCard': 'video_card',
+    'GeoCoordinates': 'geo_coordinates',
+    'Mention': 'mention',
+    'Place': 'place',
+    'Thing': 'thing',
+    'MediaEventValue': 'media_event_value',
+    'TokenRequest': 'token_request',
+    'TokenResponse': 'token_response',
+    'MicrosoftPayMethodData': 'microsoft_pay_method_data',
+    'PaymentAddress': 'payment_address',
+    'PaymentCurrencyAmount': 'payment_currency_amount',
+    'PaymentItem': 'payment_item',
+    'PaymentShippingOption': 'payment_shipping_option',
+    'PaymentDetailsModifier': 'payment_details_modifier',
+    'PaymentDetails': 'payment_details',
+    'PaymentMethodData': 'payment_method_data',
+    'PaymentOptions': 'payment_options',
+    'PaymentRequest': 'payment_request',
+    'PaymentResponse': 'payment_response',
+    'PaymentRequestComplete': 'payment_request_complete',
+    'PaymentRequestCompleteResult': 'payment_request_complete_result',
+    'PaymentRequestUpdate': 'payment_request_update',
+    'PaymentRequestUpdateResult': 'payment_request_update_result',
+}
+
+_ENUMS = (
+    'RoleTypes',
+    'ActivityTypes',
+    'TextFormatTypes',
+    'AttachmentLayoutTypes',
+    'MessageReactionTypes',
+    'InputHints',
+    'ActionTypes',
+    'EndOfConversationCodes',
+    'ContactRelationUpdateActionTypes',
+    'InstallationUpdateActionTypes',
+    'ActivityImportance',
 )
 
+
+def _load_models():
+    for name, module in _MODEL_MODULES.items():
+        try:
+            value = getattr(import_module('.{}_py3'.format(module), __name__), name)
+        except (SyntaxError, ImportError):
+            value = getattr(import_module('.' + module, __name__), name)
+        globals()[name] = value
+
+
+def _load_enums():
+    enums = import_module('.connector_client_enums', __name__)
+    for name in _ENUMS:
+        globals()[name] = getattr(enums, name)
+
+
+def __getattr__(name):
+    if name in _MODEL_MODULES:
+        _load_models()
+    elif name in _ENUMS:
+        _load_enums()
+    else:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    return globals()[name]
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
 __all__ = [
     'AttachmentView',
     'AttachmentInfo',
@@ -209,3 +190,8 @@ __all__ = [
     'InstallationUpdateActionTypes',
     'ActivityImportance',
 ]
+
+if sys.version_info < (3, 7):
+    # Module level __getattr__ is not supported before Python 3.7.
+    _load_models()
+    _load_enums()
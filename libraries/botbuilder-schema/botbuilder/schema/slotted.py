@@ -0,0 +1,160 @@
+# coding=utf-8
+# --------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""Memory-compact variants of the botbuilder.schema models.
+
+Every model in botbuilder.schema has a counterpart of the same name here whose attributes live in
+``__slots__`` instead of a per-instance ``__dict__``. They take the same keyword arguments, compare
+equal by value and work with msrest's ``Serializer``/``Deserializer`` and with
+``Model.serialize``/``Model.deserialize``; nested models are deserialized as slotted models too.
+Unlike msrest models they reject attributes that are not in ``_attribute_map``.
+
+.. warning::
+    The slotted models are *not* subclasses of the botbuilder.schema models (a subclass of an msrest
+    ``Model`` would get a ``__dict__`` back), so ``isinstance(slotted.Activity(), schema.Activity)`` is
+    False and code that checks for a schema model, e.g. ``BotFrameworkAdapter.parse_request``, does not
+    accept them. Keep them for storage and pass ``to_model()`` copies to such code.
+
+Use them for activities and conversation references that are held in memory for a long time::
+
+    from botbuilder.schema import slotted
+    reference = slotted.ConversationReference.from_model(reference)
+"""
+
+import logging
+
+from msrest.serialization import Model
+
+from botbuilder import schema
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SlottedModel(object):
+    """Base class of the slotted models. Mirrors the behaviour of msrest's `Model`, but is not one: slotted
+    models are not instances of `Model` or of the botbuilder.schema model they mirror, see `to_model`."""
+
+    __slots__ = ('additional_properties',)
+
+    _subtype_map = {}
+    _attribute_map = {}
+    _validation = {}
+
+    def __init__(self, **kwargs):
+        self.additional_properties = {}
+        for attr in self._attribute_map:
+            setattr(self, attr, None)
+        for k in kwargs:
+            if k not in self._attribute_map:
+                _LOGGER.warning("%s is not a known attribute of class %s and will be ignored", k, self.__class__)
+            elif k in self._validation and self._validation[k].get("readonly", False):
+                _LOGGER.warning("Readonly attribute %s will be ignored in class %s", k, self.__class__)
+            else:
+                setattr(self, k, kwargs[k])
+
+    def _fields(self) -> dict:
+        """The attribute values, as `Model.__dict__` would hold them."""
+        fields = {'additional_properties': self.additional_properties}
+        for attr in self._attribute_map:
+            fields[attr] = getattr(self, attr, None)
+        return fields
+
+    def __eq__(self, other):
+        """Compare objects by comparing all attributes."""
+        if isinstance(other, self.__class__):
+            return self._fields() == other._fields()
+        return False
+
+    def __ne__(self, other):
+        """Compare objects by comparing all attributes."""
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __str__(self):
+        return str(self._fields())
+
+    validate = Model.validate
+    serialize = Model.serialize
+    as_dict = Model.as_dict
+    deserialize = Model.__dict__['deserialize']
+    from_dict = Model.__dict__['from_dict']
+    enable_additional_properties_sending = Model.__dict__['enable_additional_properties_sending']
+    _flatten_subtype = Model.__dict__['_flatten_subtype']
+    _classify = Model.__dict__['_classify']
+    _get_rest_key_parts = Model.__dict__['_get_rest_key_parts']
+
+    @classmethod
+    def _infer_class_models(cls):
+        return MODELS
+
+    @classmethod
+    def from_model(cls, model: Model) -> 'SlottedModel':
+        """Copy a botbuilder.schema model, and the models nested in it, into slotted models.
+
+        :param model: The model to copy.
+        :type model: ~msrest.serialization.Model
+        :return: The slotted copy.
+        """
+        result = cls.__new__(cls)
+        result.additional_properties = dict(model.additional_properties or {})
+        for attr in cls._attribute_map:
+            setattr(result, attr, _convert(getattr(model, attr, None), _to_slotted))
+        return result
+
+    def to_model(self) -> Model:
+        """Copy this model, and the models nested in it, into botbuilder.schema models.
+
+        :return: The botbuilder.schema model.
+        """
+        model_class = getattr(schema, self.__class__.__name__)
+        result = model_class()
+        result.additional_properties = dict(self.additional_properties or {})
+        for attr in self._attribute_map:
+            setattr(result, attr, _convert(getattr(self, attr, None), _to_model))
+        return result
+
+
+def _convert(value, convert_model):
+    if isinstance(value, list):
+        return [_convert(item, convert_model) for item in value]
+    if isinstance(value, dict):
+        return {key: _convert(item, convert_model) for key, item in value.items()}
+    return convert_model(value)
+
+
+def _to_slotted(value):
+    if isinstance(value, Model) and value.__class__.__name__ in MODELS:
+        return MODELS[value.__class__.__name__].from_model(value)
+    return value
+
+
+def _to_model(value):
+    if isinstance(value, SlottedModel):
+        return value.to_model()
+    return value
+
+
+def _make_slotted(model) -> type:
+    namespace = {
+        '__slots__': tuple(model._attribute_map),
+        '__doc__': 'Slotted variant of botbuilder.schema.%s; not an instance of it, see `to_model`.\n\n%s' % (
+            model.__name__, model.__doc__ or ''),
+        '__module__': __name__,
+        '__qualname__': model.__name__,
+        '_attribute_map': dict(model._attribute_map),
+        '_validation': dict(model._validation),
+    }
+    return type(model.__name__, (SlottedModel,), namespace)
+
+
+MODELS = {name: _make_slotted(getattr(schema, name)) for name in schema.__all__
+          if issubclass(getattr(schema, name), Model)}
+
+globals().update(MODELS)
+
+__all__ = ['SlottedModel'] + sorted(MODELS)
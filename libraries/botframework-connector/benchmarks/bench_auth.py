@@ -0,0 +1,102 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Measures the cost of validating an inbound channel token.
+
+"decode x3" reproduces the previous pipeline, which decoded the JWT without verification for
+emulator detection and the issuer check, read the unverified header for the key id and then
+decoded it a third time to verify it. "single decode" is the current `JwtTokenValidation`
+pipeline built on `ParsedToken`, and "cached" adds a `TokenValidationCache`. Signing keys are
+generated locally and primed into the OpenID metadata cache, so no network access is needed.
+
+Usage: python benchmarks/bench_auth.py [--iterations 2000]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+
+import jwt
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from botbuilder.schema import Activity
+from botframework.connector.auth import (ChannelValidation, ClaimsIdentity, Constants, EmulatorValidation, JwtTokenExtractor,
+                                         JwtTokenValidation, SimpleCredentialProvider,
+                                         TokenValidationCache)
+
+APP_ID = '39619a59-5a0c-4f9b-87c5-816c648ff357'
+SERVICE_URL = 'https://webchat.botframework.com/'
+
+
+def prime_signing_key(kid: str = 'bench-key') -> str:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048, backend=default_backend())
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk['kid'] = kid
+    metadata = JwtTokenExtractor.get_open_id_metadata(Constants.TO_BOT_FROM_CHANNEL_OPEN_ID_METADATA_URL)
+    metadata.keys = [jwk]
+    metadata._configs = metadata._build_configs([jwk])
+    metadata.last_updated = datetime.now()
+
+    claims = {'iss': Constants.TO_BOT_FROM_CHANNEL_TOKEN_ISSUER, 'aud': APP_ID,
+              'serviceurl': SERVICE_URL, 'exp': int(time.time()) + 3600}
+    private_pem = private_key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                            serialization.NoEncryption())
+    token = jwt.encode(claims, private_pem, algorithm='RS256', headers={'kid': kid})
+    return 'Bearer ' + (token.decode('utf-8') if isinstance(token, bytes) else token)
+
+
+async def decode_three_times(activity: Activity, auth_header: str, credentials: SimpleCredentialProvider):
+    bearer_token = auth_header.split(' ')[1]
+    # Emulator detection and the issuer check each decoded the token without verification.
+    jwt.decode(bearer_token, verify=False)
+    jwt.decode(bearer_token, verify=False)
+    headers = jwt.get_unverified_header(bearer_token)
+    metadata = await JwtTokenExtractor.get_open_id_metadata(
+        Constants.TO_BOT_FROM_CHANNEL_OPEN_ID_METADATA_URL).get(headers['kid'])
+    claims = jwt.decode(bearer_token, metadata.public_key, options={'verify_aud': False})
+    identity = ClaimsIdentity(claims, True)
+    await ChannelValidation.validate_identity(identity, credentials)
+    ChannelValidation.validate_service_url(identity, activity.service_url)
+
+
+async def single_decode(activity: Activity, auth_header: str, credentials: SimpleCredentialProvider):
+    await JwtTokenValidation.assert_valid_activity(activity, auth_header, credentials)
+
+
+def make_cached(cache: TokenValidationCache):
+    async def cached(activity: Activity, auth_header: str, credentials: SimpleCredentialProvider):
+        await JwtTokenValidation.assert_valid_activity(activity, auth_header, credentials, cache)
+    return cached
+
+
+async def measure(name: str, validate, iterations: int, auth_header: str):
+    activity = Activity(service_url=SERVICE_URL)
+    credentials = SimpleCredentialProvider(APP_ID, '')
+    await validate(activity, auth_header, credentials)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await validate(activity, auth_header, credentials)
+    elapsed = time.perf_counter() - started
+    print('%-14s %8.1f us/token   %9.0f tokens/s' %
+          (name, elapsed / iterations * 1e6, iterations / elapsed))
+
+
+async def main(iterations: int):
+    auth_header = prime_signing_key()
+    assert not EmulatorValidation.is_token_from_emulator(auth_header)
+    await measure('decode x3', decode_three_times, iterations, auth_header)
+    await measure('single decode', single_decode, iterations, auth_header)
+    await measure('cached', make_cached(TokenValidationCache()), iterations, auth_header)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(main(args.iterations))
@@ -0,0 +1,58 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Measures ConnectorClient construction cost against the previous construction path, which rebuilt the model
+registry, Serializer and Deserializer for every client.
+
+Usage: python benchmarks/bench_client.py [--iterations 5000]
+"""
+
+import argparse
+import time
+
+from msrest import Serializer, Deserializer
+from msrest.authentication import Authentication
+
+from botframework.connector import ConnectorClient, models
+from botframework.connector.connector_client import ConnectorClientConfiguration, ServiceClient
+from botframework.connector.operations import AttachmentsOperations, ConversationsOperations
+
+SERVICE_URL = 'https://smba.trafficmanager.net/amer-client-ss.msg/'
+
+
+class PreviousConnectorClient(ConnectorClient):
+
+    def __init__(self, credentials, base_url=None):
+        self.config = ConnectorClientConfiguration(credentials, base_url)
+        self._client = ServiceClient(self.config.credentials, self.config)
+        self.api_version = 'v3'
+        client_models = {k: v for k, v in models.__dict__.items() if isinstance(v, type)}
+        self._serialize = Serializer(client_models)
+        self._deserialize = Deserializer(client_models)
+        self.attachments = AttachmentsOperations(self._client, self.config, self._serialize, self._deserialize)
+        self.conversations = ConversationsOperations(self._client, self.config, self._serialize, self._deserialize)
+
+
+def measure(name: str, create, iterations: int):
+    credentials = Authentication()
+    create(credentials, SERVICE_URL)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        create(credentials, SERVICE_URL)
+    elapsed = time.perf_counter() - started
+    print('%-10s %8.1f us/client' % (name, elapsed / iterations * 1e6))
+    return elapsed
+
+
+def main(iterations: int):
+    baseline = measure('previous', PreviousConnectorClient, iterations)
+    shared = measure('current', ConnectorClient, iterations)
+    print('speedup    %8.1fx' % (baseline / shared))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=5000)
+    args = parser.parse_args()
+    main(args.iterations)
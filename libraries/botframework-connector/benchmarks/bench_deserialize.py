@@ -0,0 +1,69 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Measures inbound Activity deserialization: msrest's reflective `Activity.deserialize` against the
+compiled `deserialize_activity`, eager and lazy. The lazy run only reads the fields a text-only
+turn typically touches.
+
+Usage: python benchmarks/bench_deserialize.py [--iterations 20000]
+"""
+
+import argparse
+import time
+
+from botbuilder.schema import Activity
+from botframework.connector.serialization import deserialize_activity
+
+INBOUND_MESSAGE = {
+    'type': 'message',
+    'id': 'bf3cc9a2f5de',
+    'timestamp': '2018-04-10T19:53:11.0551238Z',
+    'localTimestamp': '2018-04-10T12:53:11.0551238-07:00',
+    'serviceUrl': 'https://smba.trafficmanager.net/amer-client-ss.msg/',
+    'channelId': 'msteams',
+    'from': {'id': '29:1XJKJMvc5GBtc2JwZq0oj8tHZmzrQgFmB39ATiQWA85gQtHieVkKilBZ9XHoq9j7Zaqt7CZ-NJWi7me2kHTL3Bw',
+             'name': 'Megan Bowen'},
+    'conversation': {'id': 'a:17I0kl8EkpE1O9PH5TWrzrLNwnWWcfrU7QZjKR0WSfOpzbfcAg2IaydGElSo10tVr4C7Fc6GtieTJX663WuJCc1uA83n4CSrHSgGBj5XNYLcVlJAs2ZX8DbYBPck201w-',
+                     'conversationType': 'personal'},
+    'recipient': {'id': '28:c9e8c047-2a74-40a2-b28a-b162d5f5327c', 'name': 'Teams TestBot'},
+    'textFormat': 'plain',
+    'locale': 'en-US',
+    'text': 'Hello bot',
+    'attachments': [{'contentType': 'text/html', 'content': '<div><div>Hello bot</div></div>'}],
+    'entities': [{'type': 'clientInfo', 'locale': 'en-US', 'country': 'US', 'platform': 'Windows'}],
+    'channelData': {'tenant': {'id': '72f988bf-86f1-41af-91ab-2d7cd011db47'},
+                    'teamsChannelId': '19:7b1b8a4e2b4d4a0b9d7e8c0e7e4f2b1c@thread.skype', 'eventType': 'message'},
+}
+
+
+def measure(name: str, deserialize, iterations: int):
+    deserialize(INBOUND_MESSAGE)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        deserialize(INBOUND_MESSAGE)
+    elapsed = time.perf_counter() - started
+    print('%-10s %8.1f us/activity   %9.0f activities/s' %
+          (name, elapsed / iterations * 1e6, iterations / elapsed))
+    return elapsed
+
+
+def deserialize_lazy(data):
+    activity = deserialize_activity(data, lazy=True)
+    return activity.type, activity.text, activity.from_property.id, activity.conversation.id
+
+
+def main(iterations: int):
+    assert deserialize_activity(INBOUND_MESSAGE) == Activity.deserialize(INBOUND_MESSAGE)
+    assert deserialize_activity(INBOUND_MESSAGE, lazy=True) == Activity.deserialize(INBOUND_MESSAGE)
+    baseline = measure('msrest', Activity.deserialize, iterations)
+    compiled = measure('compiled', deserialize_activity, iterations)
+    lazy = measure('lazy', deserialize_lazy, iterations)
+    print('speedup    %8.1fx compiled, %.1fx lazy' % (baseline / compiled, baseline / lazy))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+    main(args.iterations)
@@ -0,0 +1,52 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Measures cold import time of botbuilder.schema, botframework.connector and its auth package with
+`python -X importtime`, and lists the heavy dependencies each import pulls in.
+
+Usage: python benchmarks/bench_import.py [--runs 5] [module ...]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+MODULES = ['botbuilder.schema', 'botframework.connector', 'botframework.connector.auth', 'botbuilder.core']
+HEAVY_DEPENDENCIES = ['msrest', 'requests', 'jwt', 'cryptography', 'aiohttp']
+
+
+def import_time(module: str):
+    """Return the cumulative import time of `module` in microseconds and the top-level packages it loaded."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+                            stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    cumulative = None
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        loaded.add(name.split('.')[0])
+        if name == module:
+            cumulative = int(cumulative_us)
+    return cumulative, loaded
+
+
+def main(modules, runs: int):
+    for module in modules:
+        timings = []
+        for _ in range(runs):
+            cumulative, loaded = import_time(module)
+            timings.append(cumulative)
+        heavy = [name for name in HEAVY_DEPENDENCIES if name in loaded]
+        print('%-30s %8.1f ms   loads: %s' % (module, statistics.median(timings) / 1000, ', '.join(heavy) or '-'))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('modules', nargs='*', default=MODULES)
+    args = parser.parse_args()
+    main(args.modules, args.runs)
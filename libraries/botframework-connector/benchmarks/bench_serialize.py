@@ -0,0 +1,68 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Measures outbound Activity serialization: msrest's `Serializer.body` followed by the stdlib `json`
+encoding that `ClientRequest.add_content` applies, against `CompiledSerializer.body`, which emits bytes
+directly (with orjson when it is installed).
+
+Usage: python benchmarks/bench_serialize.py [--iterations 20000]
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+
+from msrest.serialization import Serializer
+
+from botbuilder.schema import (Activity, ActivityTypes, Attachment, ChannelAccount, ConversationAccount,
+                               HeroCard, CardAction)
+from botframework.connector.serialization import CompiledSerializer, compiled_serializer
+
+REPLY = Activity(
+    type=ActivityTypes.message,
+    timestamp=datetime(2018, 4, 10, 19, 53, 11, 55123, tzinfo=timezone.utc),
+    service_url='https://smba.trafficmanager.net/amer-client-ss.msg/',
+    channel_id='msteams',
+    from_property=ChannelAccount(id='28:c9e8c047-2a74-40a2-b28a-b162d5f5327c', name='Teams TestBot'),
+    conversation=ConversationAccount(id='a:17I0kl8EkpE1O9PH5TWrzrLNwnWWcfrU7QZjKR0WSfOpzbfcAg2IaydGElSo10tVr4C7F'),
+    recipient=ChannelAccount(id='29:1XJKJMvc5GBtc2JwZq0oj8tHZmzrQgFmB39ATiQWA85gQtHieVkKilBZ9XHoq9j7Zaq',
+                             name='Megan Bowen'),
+    text='Here is what I found:',
+    attachments=[Attachment(content_type='application/vnd.microsoft.card.hero',
+                            content=HeroCard(title='Result', text='Details',
+                                             buttons=[CardAction(type='imBack', title='More', value='more')]))],
+    reply_to_id='bf3cc9a2f5de')
+
+
+def msrest_body(serializer: Serializer):
+    return lambda activity: json.dumps(serializer.body(activity, 'Activity')).encode('utf-8')
+
+
+def measure(name: str, serialize, iterations: int):
+    size = len(serialize(REPLY))
+    started = time.perf_counter()
+    for _ in range(iterations):
+        serialize(REPLY)
+    elapsed = time.perf_counter() - started
+    print('%-18s %8.1f us/activity   %7.1f MB/s   (%d bytes)' %
+          (name, elapsed / iterations * 1e6, size * iterations / elapsed / 1e6, size))
+
+
+def main(iterations: int):
+    compiled = CompiledSerializer()
+    measure('msrest + json', msrest_body(Serializer(compiled.dependencies)), iterations)
+    orjson = compiled_serializer.orjson
+    compiled_serializer.orjson = None
+    measure('compiled (json)', lambda activity: compiled.body(activity, 'Activity'), iterations)
+    compiled_serializer.orjson = orjson
+    if orjson is not None:
+        measure('compiled (orjson)', lambda activity: compiled.body(activity, 'Activity'), iterations)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+    main(args.iterations)
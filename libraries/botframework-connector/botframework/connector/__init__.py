@@ -9,10 +9,38 @@
 # regenerated.
 # --------------------------------------------------------------------------
 
-from .connector_client import ConnectorClient
+import sys
+from importlib import import_module
+
 from .version import VERSION
 
-__all__ = ['ConnectorClient']
+# Imported on first access (PEP 562) so that e.g. `botframework.connector.auth` can be imported
+# without loading msrest's service client and aiohttp.
+_EXPORTS = {
+    'AiohttpTransport': 'async_mixin',
+    'ConnectorClient': 'connector_client',
+}
+
+__all__ = ['AiohttpTransport', 'ConnectorClient']
 
 __version__ = VERSION
 
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    value = getattr(import_module('.' + module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if sys.version_info < (3, 7):
+    # Module level __getattr__ is not supported before Python 3.7.
+    for _name in __all__:
+        __getattr__(_name)
+
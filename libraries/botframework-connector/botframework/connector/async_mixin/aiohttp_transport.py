@@ -0,0 +1,146 @@
+# --------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import asyncio
+import threading
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+TRANSPORT_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError) if aiohttp else (asyncio.TimeoutError,)
+
+
+class AiohttpTransport:
+    """Non-blocking HTTP transport for the ``*_async`` connector operations.
+
+    A single ``aiohttp.ClientSession`` over a shared ``TCPConnector`` is created lazily on first use, so
+    every ConnectorClient built with the same transport rides the same pool of keep-alive connections.
+    Responses are handed back as ``requests.Response`` objects so the msrest deserializers and
+    ``ErrorResponseException`` keep working unchanged.
+
+    :param int limit: Total number of simultaneous connections.
+    :param int limit_per_host: Number of simultaneous connections to a single host (0 is unlimited).
+    :param float keepalive_timeout: Seconds an idle connection is kept open for reuse.
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 0, keepalive_timeout: float = 15.0):
+        if aiohttp is None:
+            raise ImportError('AiohttpTransport requires the "aiohttp" package to be installed.')
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self._session = None
+        self._loop = None
+        # Closes of sessions left on other running loops; `close` awaits them.
+        self._closing = []
+
+    @property
+    def session(self):
+        """The shared ``aiohttp.ClientSession``, (re)created for the running event loop.
+
+        A session still open on another event loop is closed on that loop if it is running, e.g. in another
+        thread, and :meth:`close` waits for that and raises its failure. A session of a closed loop, whose
+        connections went with it, is closed right away.
+
+        :raises: RuntimeError if the session is open on another event loop that is not running; await
+         :meth:`close` on that loop first.
+        """
+        loop = asyncio.get_event_loop()
+        if self._session is not None and not self._session.closed and self._loop is not loop:
+            self._release(self._session, self._loop)
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._loop = loop
+        return self._session
+
+    def _release(self, session, loop):
+        """Close or drop a session bound to an event loop other than the running one."""
+        if loop.is_running():
+            self._closing.append(asyncio.run_coroutine_threadsafe(session.close(), loop))
+        elif loop.is_closed():
+            _close_on_closed_loop(session)
+        else:
+            raise RuntimeError('AiohttpTransport is open on another event loop; await close() on that loop '
+                               'before using it on this one.')
+        self._session = None
+        self._loop = None
+
+    async def send(self, method: str, url: str, headers: dict = None, data=None,
+                   timeout: float = None, verify: bool = True) -> Response:
+        """Send a request and return the fully read response.
+
+        :raises: aiohttp.ClientError, asyncio.TimeoutError
+        """
+        client_timeout = aiohttp.ClientTimeout(total=timeout) if timeout else None
+        async with self.session.request(method, url, headers=headers, data=data,
+                                        timeout=client_timeout, ssl=None if verify else False) as resp:
+            content = await resp.read()
+            return self._to_response(resp, content)
+
+    @staticmethod
+    def _to_response(resp, content: bytes) -> Response:
+        response = Response()
+        response.status_code = resp.status
+        response.reason = resp.reason
+        response.url = str(resp.url)
+        response.headers = CaseInsensitiveDict(resp.headers)
+        response.encoding = resp.charset or 'utf-8'
+        response._content = content  # pylint: disable=protected-access
+        response._content_consumed = True  # pylint: disable=protected-access
+        return response
+
+    async def close(self):
+        """Close the shared session and its pooled connections, and wait for the sessions left on other event
+        loops to close. Call it once no ConnectorClient built with the transport sends any more requests; the
+        transport opens a new session if it is used again.
+
+        :raises: The first failure to close a session.
+        """
+        if self._session is None or self._session.closed:
+            self._session = None
+            self._loop = None
+        elif self._loop is asyncio.get_event_loop():
+            session = self._session
+            self._session = None
+            self._loop = None
+            await session.close()
+        else:
+            self._release(self._session, self._loop)
+        closing, self._closing = self._closing, []
+        results = await asyncio.gather(*[asyncio.wrap_future(future) for future in closing], return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+
+def _close_on_closed_loop(session):
+    # The running loop's thread cannot run another loop, so the session is closed on a private loop in a helper
+    # thread. Its connections went with its closed loop, so this does not wait on the network.
+    errors = []
+
+    def close():
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(session.close())
+        except Exception as error:  # pylint: disable=broad-except
+            errors.append(error)
+        finally:
+            loop.close()
+
+    thread = threading.Thread(target=close)
+    thread.start()
+    thread.join()
+    if errors:
+        raise errors[0]
@@ -37,11 +37,15 @@ from msrest.exceptions import (
     raise_with_traceback,
 )
 
+from .aiohttp_transport import TRANSPORT_ERRORS
+
 
 _LOGGER = logging.getLogger(__name__)
 
 class AsyncServiceClientMixin:
 
+    transport = None
+
     async def async_send_formdata(self, request, headers=None, content=None, stream=True, **config):
         """Send data as a multipart form-data request.
 
@@ -64,6 +68,10 @@ class AsyncServiceClientMixin:
         :param content: Any body data to add to the request.
         :param config: Any specific config overrides
         """
+        await self._acquire_access_token()
+        if self.transport is not None and not config.get('files'):
+            return await self._async_send_with_transport(request, headers, content, **config)
+
         response = None
         session = self.creds.signed_session()
         kwargs = self._configure_session(session, **config)
@@ -122,3 +130,49 @@ class AsyncServiceClientMixin:
         finally:
             if not response or not stream:
                 session.close()
+
+    async def _async_send_with_transport(self, request, headers=None, content=None, **config):
+        """Send the request through the non-blocking `transport` instead of a requests session.
+
+        :param ClientRequest request: The request object to be sent.
+        :param dict headers: Any headers to add to the request.
+        :param content: Any body data to add to the request.
+        :param config: Any specific config overrides
+        """
+        request.add_headers(headers if headers else {})
+        request.add_content(content)
+
+        send_headers = dict(self._headers)
+        send_headers['User-Agent'] = self.config.user_agent
+        send_headers['Accept'] = 'application/json'
+        send_headers.update(self._auth_headers())
+        send_headers.update(request.headers)
+
+        connection = self.config.connection
+        try:
+            return await self.transport.send(
+                request.method,
+                request.url,
+                headers=send_headers,
+                data=request.data or None,
+                timeout=config.get('timeout', connection.timeout),
+                verify=config.get('verify', connection.verify))
+        except TRANSPORT_ERRORS as err:
+            msg = "Error occurred in request."
+            raise_with_traceback(ClientRequestError, msg, err)
+
+    async def _acquire_access_token(self):
+        """Let credentials that support it fetch their token without blocking the event loop,
+        so the `signed_session` call that follows is served from their cache.
+        """
+        get_access_token_async = getattr(self.creds, 'get_access_token_async', None)
+        if get_access_token_async is not None:
+            await get_access_token_async()
+
+    def _auth_headers(self):
+        """Headers the credentials would apply to a signed requests session."""
+        session = self.creds.signed_session()
+        try:
+            return {k: v for k, v in session.headers.items() if k == 'Authorization'}
+        finally:
+            session.close()
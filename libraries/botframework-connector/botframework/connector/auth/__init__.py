@@ -10,9 +10,47 @@
 # --------------------------------------------------------------------------
 # pylint: disable=missing-docstring
 
-from .microsoft_app_credentials import *
-from .jwt_token_validation import *
-from .credential_provider import *
-from .channel_validation import *
-from .emulator_validation import *
-from .jwt_token_extractor import *
\ No newline at end of file
+import sys
+from importlib import import_module
+
+# Submodules are imported on first access (PEP 562) so that importing the package does not load
+# jwt, cryptography and requests until authentication is actually used.
+_EXPORTS = {
+    'AUTH_SETTINGS': 'microsoft_app_credentials',
+    'MicrosoftAppCredentials': 'microsoft_app_credentials',
+    'JwtTokenValidation': 'jwt_token_validation',
+    'CredentialProvider': 'credential_provider',
+    'SimpleCredentialProvider': 'credential_provider',
+    'ChannelValidation': 'channel_validation',
+    'EmulatorValidation': 'emulator_validation',
+    'JwtTokenExtractor': 'jwt_token_extractor',
+    'TokenValidationCache': 'token_validation_cache',
+    'ParsedToken': 'parsed_token',
+    'KeepAlivePool': 'keep_alive_session',
+    'KeepAliveSession': 'keep_alive_session',
+    'Claim': 'claims_identity',
+    'ClaimsIdentity': 'claims_identity',
+    'Constants': 'constants',
+    'VerifyOptions': 'verify_options',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    value = getattr(import_module('.' + module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if sys.version_info < (3, 7):
+    # Module level __getattr__ is not supported before Python 3.7.
+    for _name in __all__:
+        __getattr__(_name)
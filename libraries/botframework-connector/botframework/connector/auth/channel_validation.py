@@ -21,15 +21,22 @@ class ChannelValidation:
         ignore_expiration=False
     )
 
+    # Built once and shared by every request; extractors hold no per-request state.
+    TO_BOT_FROM_CHANNEL_TOKEN_EXTRACTOR = JwtTokenExtractor(
+        TO_BOT_FROM_CHANNEL_TOKEN_VALIDATION_PARAMETERS,
+        Constants.TO_BOT_FROM_CHANNEL_OPEN_ID_METADATA_URL,
+        Constants.ALLOWED_SIGNING_ALGORITHMS)
+
     @staticmethod
-    async def authenticate_token_service_url(auth_header: str, credentials: CredentialProvider, service_url: str) -> ClaimsIdentity:
+    async def authenticate_token_service_url(auth_header, credentials: CredentialProvider, service_url: str) -> ClaimsIdentity:
         """ Validate the incoming Auth Header
 
         Validate the incoming Auth Header as a token sent from the Bot Framework Service.
         A token issued by the Bot Framework emulator will FAIL this check.
 
-        :param auth_header: The raw HTTP header in the format: 'Bearer [longString]'
-        :type auth_header: str
+        :param auth_header: The raw HTTP header in the format: 'Bearer [longString]', or the
+         ParsedToken already decoded from it.
+        :type auth_header: str or ParsedToken
         :param credentials: The user defined set of valid credentials, such as the AppId.
         :type credentials: CredentialProvider
         :param service_url: Claim value that must match in the identity.
@@ -41,35 +48,57 @@ class ChannelValidation:
         identity = await asyncio.ensure_future(
             ChannelValidation.authenticate_token(auth_header, credentials))
 
+        ChannelValidation.validate_service_url(identity, service_url)
+        return identity
+
+    @staticmethod
+    def validate_service_url(identity: ClaimsIdentity, service_url: str):
+        """ Validate that the identity was issued for the activity's service_url
+
+        :param identity: The ClaimsIdentity extracted from the token.
+        :type identity: ClaimsIdentity
+        :param service_url: Claim value that must match in the identity.
+        :type service_url: str
+
+        :raises Exception:
+        """
         service_url_claim = identity.get_claim_value(ChannelValidation.SERVICE_URL_CLAIM)
         if service_url_claim != service_url:
             # Claim must match. Not Authorized.
             raise Exception('Unauthorized. service_url claim do not match.')
 
-        return identity
-
     @staticmethod
-    async def authenticate_token(auth_header: str, credentials: CredentialProvider) -> ClaimsIdentity:
+    async def authenticate_token(auth_header, credentials: CredentialProvider) -> ClaimsIdentity:
         """ Validate the incoming Auth Header
 
         Validate the incoming Auth Header as a token sent from the Bot Framework Service.
         A token issued by the Bot Framework emulator will FAIL this check.
 
-        :param auth_header: The raw HTTP header in the format: 'Bearer [longString]'
-        :type auth_header: str
+        :param auth_header: The raw HTTP header in the format: 'Bearer [longString]', or the
+         ParsedToken already decoded from it.
+        :type auth_header: str or ParsedToken
         :param credentials: The user defined set of valid credentials, such as the AppId.
         :type credentials: CredentialProvider
 
         :return: A valid ClaimsIdentity.
         :raises Exception:
         """
-        token_extractor = JwtTokenExtractor(
-            ChannelValidation.TO_BOT_FROM_CHANNEL_TOKEN_VALIDATION_PARAMETERS,
-            Constants.TO_BOT_FROM_CHANNEL_OPEN_ID_METADATA_URL,
-            Constants.ALLOWED_SIGNING_ALGORITHMS)
+        identity = await ChannelValidation.TO_BOT_FROM_CHANNEL_TOKEN_EXTRACTOR.get_identity_from_auth_header(
+            auth_header)
+        await ChannelValidation.validate_identity(identity, credentials)
+        return identity
 
-        identity = await asyncio.ensure_future(
-            token_extractor.get_identity_from_auth_header(auth_header))
+    @staticmethod
+    async def validate_identity(identity: ClaimsIdentity, credentials: CredentialProvider):
+        """ Validate the claims of an identity extracted from a Bot Framework Service token
+
+        :param identity: The ClaimsIdentity extracted from the token.
+        :type identity: ClaimsIdentity
+        :param credentials: The user defined set of valid credentials, such as the AppId.
+        :type credentials: CredentialProvider
+
+        :raises Exception:
+        """
         if not identity:
             # No valid identity. Not Authorized.
             raise Exception('Unauthorized. No valid identity.')
@@ -95,5 +124,3 @@ class ChannelValidation:
         if not is_valid_app_id:
             # The AppId is not valid or not present. Not Authorized.
             raise Exception('Unauthorized. Invalid AppId passed on token: ', aud_claim)
-
-        return identity
@@ -1,7 +1,7 @@
 import asyncio
-import jwt
 
 from .jwt_token_extractor import JwtTokenExtractor
+from .parsed_token import ParsedToken
 from .verify_options import VerifyOptions
 from .constants import Constants
 from .credential_provider import CredentialProvider
@@ -29,12 +29,19 @@ class EmulatorValidation:
         ignore_expiration=False
     )
 
+    # Built once and shared by every request; extractors hold no per-request state.
+    TO_BOT_FROM_EMULATOR_TOKEN_EXTRACTOR = JwtTokenExtractor(
+        TO_BOT_FROM_EMULATOR_TOKEN_VALIDATION_PARAMETERS,
+        Constants.TO_BOT_FROM_EMULATOR_OPEN_ID_METADATA_URL,
+        Constants.ALLOWED_SIGNING_ALGORITHMS)
+
     @staticmethod
-    def is_token_from_emulator(auth_header: str) -> bool:
+    def is_token_from_emulator(auth_header) -> bool:
         """ Determines if a given Auth header is from the Bot Framework Emulator
 
-        :param auth_header: Bearer Token, in the 'Bearer [Long String]' Format.
-        :type auth_header: str
+        :param auth_header: Bearer Token, in the 'Bearer [Long String]' Format, or the
+         ParsedToken already decoded from it.
+        :type auth_header: str or ParsedToken
 
         :return: True, if the token was issued by the Emulator. Otherwise, false.
         """
@@ -44,29 +51,14 @@ class EmulatorValidation:
             # No token. Can't be an emulator token.
             return False
 
-        parts = auth_header.split(' ')
-        if len(parts) != 2:
-            # Emulator tokens MUST have exactly 2 parts.
-            # If we don't have 2 parts, it's not an emulator token
-            return False
-
-        auth_scheme = parts[0]
-        bearer_token = parts[1]
-
-        # We now have an array that should be:
-        # [0] = "Bearer"
-        # [1] = "[Big Long String]"
-        if auth_scheme != 'Bearer':
-            # The scheme from the emulator MUST be "Bearer"
-            return False
-
+        # Emulator tokens MUST have exactly 2 parts, and the scheme MUST be "Bearer".
         # Parse the Big Long String into an actual token.
-        token = jwt.decode(bearer_token, verify=False)
+        token = ParsedToken.parse(auth_header).claims
         if not token:
             return False
 
         # Is there an Issuer?
-        issuer = token['iss']
+        issuer = token.get('iss')
         if not issuer:
             # No Issuer, means it's not from the Emulator.
             return False
@@ -81,27 +73,37 @@ class EmulatorValidation:
         return True
 
     @staticmethod
-    async def authenticate_emulator_token(auth_header: str, credentials: CredentialProvider) -> ClaimsIdentity:
+    async def authenticate_emulator_token(auth_header, credentials: CredentialProvider) -> ClaimsIdentity:
         """ Validate the incoming Auth Header
 
         Validate the incoming Auth Header as a token sent from the Bot Framework Service.
         A token issued by the Bot Framework emulator will FAIL this check.
 
-        :param auth_header: The raw HTTP header in the format: 'Bearer [longString]'
-        :type auth_header: str
+        :param auth_header: The raw HTTP header in the format: 'Bearer [longString]', or the
+         ParsedToken already decoded from it.
+        :type auth_header: str or ParsedToken
         :param credentials: The user defined set of valid credentials, such as the AppId.
         :type credentials: CredentialProvider
 
         :return: A valid ClaimsIdentity.
         :raises Exception:
         """
-        token_extractor = JwtTokenExtractor(
-            EmulatorValidation.TO_BOT_FROM_EMULATOR_TOKEN_VALIDATION_PARAMETERS,
-            Constants.TO_BOT_FROM_EMULATOR_OPEN_ID_METADATA_URL,
-            Constants.ALLOWED_SIGNING_ALGORITHMS)
+        identity = await EmulatorValidation.TO_BOT_FROM_EMULATOR_TOKEN_EXTRACTOR.get_identity_from_auth_header(
+            auth_header)
+        await EmulatorValidation.validate_identity(identity, credentials)
+        return identity
+
+    @staticmethod
+    async def validate_identity(identity: ClaimsIdentity, credentials: CredentialProvider):
+        """ Validate the claims of an identity extracted from a Bot Framework Emulator token
+
+        :param identity: The ClaimsIdentity extracted from the token.
+        :type identity: ClaimsIdentity
+        :param credentials: The user defined set of valid credentials, such as the AppId.
+        :type credentials: CredentialProvider
 
-        identity = await asyncio.ensure_future(
-            token_extractor.get_identity_from_auth_header(auth_header))
+        :raises Exception:
+        """
         if not identity:
             # No valid identity. Not Authorized.
             raise Exception('Unauthorized. No valid identity.')
@@ -148,5 +150,3 @@ class EmulatorValidation:
         is_valid_app_id = await asyncio.ensure_future(credentials.is_valid_appid(app_id))
         if not is_valid_app_id:
             raise Exception('Unauthorized. Invalid AppId passed on token: ', app_id)
-
-        return identity
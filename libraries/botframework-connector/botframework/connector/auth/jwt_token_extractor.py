@@ -1,18 +1,28 @@
 import asyncio
 import json
+import logging
 from datetime import datetime, timedelta
 import requests
 from jwt.algorithms import RSAAlgorithm
 import jwt
+from ..async_mixin.aiohttp_transport import AiohttpTransport
 from .claims_identity import ClaimsIdentity
+from .parsed_token import ParsedToken
 from .verify_options import VerifyOptions
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+_LOGGER = logging.getLogger(__name__)
+
 class JwtTokenExtractor:
     metadataCache = {}
 
     def __init__(self, validationParams: VerifyOptions, metadata_url: str, allowedAlgorithms: list, validator=None):
         self.validation_parameters = validationParams
-        self.validation_parameters.algorithms = allowedAlgorithms
+        self.allowed_algorithms = frozenset(allowedAlgorithms)
         self.open_id_metadata = JwtTokenExtractor.get_open_id_metadata(metadata_url)
         self.validator = validator if validator is not None else lambda x: True
 
@@ -24,87 +34,173 @@ class JwtTokenExtractor:
             JwtTokenExtractor.metadataCache.setdefault(metadata_url, metadata)
         return metadata
 
-    async def get_identity_from_auth_header(self, auth_header: str) -> ClaimsIdentity:
+    async def get_identity_from_auth_header(self, auth_header) -> ClaimsIdentity:
         if not auth_header:
             return None
-        parts = auth_header.split(" ")
-        if len(parts) == 2:
-            return await self.get_identity(parts[0], parts[1])
-        return None
+        return await self.get_identity_from_token(ParsedToken.parse(auth_header))
 
     async def get_identity(self, schema: str, parameter: str) -> ClaimsIdentity:
         # No header in correct scheme or no token
         if schema != "Bearer" or not parameter:
             return None
 
+        return await self.get_identity_from_token(ParsedToken(schema + " " + parameter))
+
+    async def get_identity_from_token(self, token: ParsedToken) -> ClaimsIdentity:
+        # No header in correct scheme or no token
+        if not token.is_bearer_token:
+            return None
+
         # Issuer isn't allowed? No need to check signature
-        if not self._has_allowed_issuer(parameter):
+        if not self._has_allowed_issuer(token):
             return None
 
-        try:
-            return await self._validate_token(parameter)
-        except:
-            raise
+        return await self._validate_token(token)
 
-    def _has_allowed_issuer(self, jwt_token: str) -> bool:
-        decoded = jwt.decode(jwt_token, verify=False)
-        issuer = decoded.get("iss", None)
+    def _has_allowed_issuer(self, token: ParsedToken) -> bool:
+        issuer = token.claims.get("iss", None)
         if issuer in self.validation_parameters.issuer:
             return True
 
         return issuer is self.validation_parameters.issuer
 
-    async def _validate_token(self, jwt_token: str) -> ClaimsIdentity:
-        headers = jwt.get_unverified_header(jwt_token)
+    async def _validate_token(self, token: ParsedToken) -> ClaimsIdentity:
+        headers = token.header
 
         # Update the signing tokens from the last refresh
         key_id = headers.get("kid", None)
         metadata = await self.open_id_metadata.get(key_id)
+        if metadata is None:
+            raise Exception('Signing key not found in OpenID metadata')
 
-
-        if headers.get("alg", None) not in self.validation_parameters.algorithms:
+        algorithm = headers.get("alg", None)
+        if algorithm not in self.allowed_algorithms:
             raise Exception('Token signing algorithm not in allowed list')
 
         if self.validator is not None:
             if not self.validator(metadata.endorsements):
                 raise Exception('Could not validate endorsement key')
 
+        # PyJWT verifies the signature and the registered claims; the ParsedToken only saved decoding the token
+        # for the issuer and key lookups above. Like before, the lifetime is checked without leeway.
         options = {
             'verify_aud': False,
             'verify_exp': not self.validation_parameters.ignore_expiration}
-        decoded_payload = jwt.decode(jwt_token, metadata.public_key, options=options)
-        claims = ClaimsIdentity(decoded_payload, True)
+        claims = jwt.decode(token.token, metadata.public_key, algorithms=[algorithm], options=options)
 
-        return claims
+        return ClaimsIdentity(claims, True)
 
 class _OpenIdMetadata:
+    # Signing keys are considered fresh for this long after they were fetched.
+    REFRESH_INTERVAL = timedelta(days=5)
+    # Start refreshing in the background once keys are this close to going stale.
+    REFRESH_AHEAD = timedelta(days=1)
+    # Minimum time between refresh attempts, successful or not, once keys were fetched: for the background
+    # refresh and for refreshes forced by a token signed with an unknown key.
+    MIN_FORCED_REFRESH_INTERVAL = timedelta(minutes=5)
+    # Minimum time between attempts while no keys could be fetched yet.
+    MIN_RETRY_INTERVAL = timedelta(seconds=10)
+
     def __init__(self, url):
         self.url = url
         self.keys = []
         self.last_updated = datetime.min
+        self.last_attempt = datetime.min
+        self._configs = {}
+        self._refresh_future = None
+        self._refresh_loop = None
+        # Every refresh of this metadata fetches through the same keep-alive connections.
+        self._transport = AiohttpTransport() if aiohttp is not None else None
+
+    async def close(self):
+        """Close the connections kept open to the metadata endpoints; a later refresh opens new ones."""
+        if self._transport is not None:
+            await self._transport.close()
 
     async def get(self, key_id: str):
-        # If keys are more than 5 days old, refresh them
-        if self.last_updated < (datetime.now() + timedelta(days=5)):
-            await self._refresh()
-        return self._find(key_id)
+        if not self.keys:
+            refresh = self._start_refresh(self.MIN_RETRY_INTERVAL)
+            if refresh is not None:
+                await asyncio.shield(refresh)
+        elif datetime.now() - self.last_updated > self.REFRESH_INTERVAL - self.REFRESH_AHEAD:
+            # Serve the cached (possibly stale) keys and revalidate without blocking this request.
+            self._start_refresh(self.MIN_FORCED_REFRESH_INTERVAL)
+
+        metadata = self._find(key_id)
+        if metadata is None:
+            # The signing key may have been rotated since the last refresh.
+            refresh = self._start_refresh(self.MIN_FORCED_REFRESH_INTERVAL)
+            if refresh is None:
+                return None
+            try:
+                await asyncio.shield(refresh)
+            except Exception:  # pylint: disable=broad-except
+                return None
+            metadata = self._find(key_id)
+        return metadata
+
+    def _start_refresh(self, min_interval: timedelta):
+        """Returns the refresh running on this loop, or starts one unless the last attempt was less than
+        `min_interval` ago, in which case it returns None. Failed attempts count, so an unreachable metadata
+        endpoint, or tokens with made-up key ids, cannot make every request fetch the metadata.
+        """
+        loop = asyncio.get_event_loop()
+        if self._refresh_future is not None and not self._refresh_future.done() and self._refresh_loop is loop:
+            return self._refresh_future
+        if datetime.now() - self.last_attempt < min_interval:
+            return None
+        self.last_attempt = datetime.now()
+        self._refresh_future = asyncio.ensure_future(self._refresh())
+        self._refresh_future.add_done_callback(self._on_refreshed)
+        self._refresh_loop = loop
+        return self._refresh_future
+
+    def _on_refreshed(self, future):
+        error = None if future.cancelled() else future.exception()
+        if error is not None:
+            # A failed refresh keeps serving the previous keys until the next attempt.
+            _LOGGER.warning('Failed to refresh OpenID metadata from %s: %s', self.url, error)
 
     async def _refresh(self):
-        response = requests.get(self.url)
-        response.raise_for_status()
-        keys_url = response.json()["jwks_uri"]
-        response_keys = requests.get(keys_url)
-        response_keys.raise_for_status()
+        config = await self._fetch_json(self.url)
+        keys = (await self._fetch_json(config["jwks_uri"]))["keys"]
+        if keys != self.keys:
+            self._configs = self._build_configs(keys)
+            self.keys = keys
         self.last_updated = datetime.now()
-        self.keys = response_keys.json()["keys"]
+
+    @staticmethod
+    def _build_configs(keys: list) -> dict:
+        """Parses every JWK once, so token validation is a dict lookup instead of RSA key construction."""
+        configs = {}
+        for key in keys:
+            key_id = key.get("kid") if isinstance(key, dict) else None
+            if key_id is None:
+                # Tokens are matched to keys by kid, so such a key could never be used.
+                _LOGGER.warning('Ignoring signing key without a key id.')
+                continue
+            try:
+                public_key = RSAAlgorithm.from_jwk(json.dumps(key))
+            except Exception as error:  # pylint: disable=broad-except
+                _LOGGER.warning('Ignoring signing key %s that could not be parsed: %s', key_id, error)
+                continue
+            configs[key_id] = _OpenIdConfig(public_key, key.get("endorsements", []))
+        return configs
+
+    async def _fetch_json(self, url: str) -> dict:
+        if self._transport is not None:
+            response = await self._transport.send('GET', url)
+            response.raise_for_status()
+            return response.json()
+
+        def get():
+            response = requests.get(url)
+            response.raise_for_status()
+            return response.json()
+        return await asyncio.get_event_loop().run_in_executor(None, get)
 
     def _find(self, key_id: str):
-        if not self.keys:
-            return None
-        key = next(x for x in self.keys if x["kid"] == key_id)
-        public_key = RSAAlgorithm.from_jwk(json.dumps(key))
-        endorsements = key.get("endorsements", [])
-        return _OpenIdConfig(public_key, endorsements)
+        return self._configs.get(key_id)
 
 class _OpenIdConfig:
     def __init__(self, public_key, endorsements):
@@ -4,11 +4,15 @@ from .emulator_validation import EmulatorValidation
 from .channel_validation import ChannelValidation
 from .microsoft_app_credentials import MicrosoftAppCredentials
 from .credential_provider import CredentialProvider
+from .claims_identity import ClaimsIdentity
+from .parsed_token import ParsedToken
+from .token_validation_cache import TokenValidationCache
 
 class JwtTokenValidation:
 
     @staticmethod
-    async def assert_valid_activity(activity: Activity, auth_header: str, credentials: CredentialProvider):
+    async def assert_valid_activity(activity: Activity, auth_header: str, credentials: CredentialProvider,
+                                    token_cache: TokenValidationCache = None) -> ClaimsIdentity:
         """Validates the security tokens required by the Bot Framework Protocol. Throws on any exceptions.
         
         :param activity: The incoming Activity from the Bot Framework or the Emulator
@@ -17,7 +21,11 @@ class JwtTokenValidation:
         :type auth_header: str
         :param credentials: The set of valid credentials, such as the Bot Application ID
         :type credentials: CredentialProvider
+        :param token_cache: Optional cache of already verified tokens. On a hit only the
+         claims are re-checked against the credentials and the activity's service_url.
+        :type token_cache: TokenValidationCache
 
+        :return: The ClaimsIdentity of the token, or None on the anonymous code path.
         :raises Exception:
         """
         if not auth_header:
@@ -30,12 +38,26 @@ class JwtTokenValidation:
             # No Auth Header. Auth is required. Request is not authorized.
             raise Exception('Unauthorized Access. Request is not authorized')
 
-        using_emulator = EmulatorValidation.is_token_from_emulator(auth_header)
-        if using_emulator:
-            await EmulatorValidation.authenticate_emulator_token(auth_header, credentials)
+        cached = token_cache.get(auth_header) if token_cache is not None else None
+        if cached is not None:
+            identity, using_emulator = cached
+            if using_emulator:
+                await EmulatorValidation.validate_identity(identity, credentials)
+            else:
+                await ChannelValidation.validate_identity(identity, credentials)
+                ChannelValidation.validate_service_url(identity, activity.service_url)
         else:
-            await ChannelValidation.authenticate_token_service_url(
-                auth_header, credentials, activity.service_url)
+            # Decode the token once; emulator detection and validation share the result.
+            token = ParsedToken(auth_header)
+            using_emulator = EmulatorValidation.is_token_from_emulator(token)
+            if using_emulator:
+                identity = await EmulatorValidation.authenticate_emulator_token(token, credentials)
+            else:
+                identity = await ChannelValidation.authenticate_token_service_url(
+                    token, credentials, activity.service_url)
+            if token_cache is not None:
+                token_cache.add(auth_header, identity, using_emulator)
 
         # On the standard Auth path, we need to trust the URL that was incoming.
         MicrosoftAppCredentials.trust_service_url(activity.service_url)
+        return identity
@@ -0,0 +1,83 @@
+from requests import Session
+from requests.adapters import HTTPAdapter
+
+
+class KeepAlivePool(object):
+    """KeepAlivePool.
+    The keep-alive connection pools of one credentials object, shared by every `KeepAliveSession`
+    its `signed_session` hands out. Call `close` to release the connections.
+
+    :param pool_maxsize: The maximum number of pooled connections kept per host.
+    :type pool_maxsize: int
+    """
+
+    def __init__(self, pool_maxsize: int = 100):
+        self.pool_maxsize = pool_maxsize
+        self._adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+
+    def session(self) -> 'KeepAliveSession':
+        return KeepAliveSession(self)
+
+    def close(self):
+        """Close every pooled connection."""
+        self._adapter.close()
+
+    def stats(self) -> dict:
+        """Connection reuse counters summed over every pooled host.
+
+        :return: The connections opened, requests sent and requests served by a reused connection.
+        """
+        connections = 0
+        requests = 0
+        pool_manager = self._adapter.poolmanager
+        for key in list(pool_manager.pools.keys()):
+            pool = pool_manager.pools.get(key)
+            if pool is not None:
+                connections += pool.num_connections
+                requests += pool.num_requests
+        return {'connections': connections,
+                'requests': requests,
+                'reused': max(requests - connections, 0)}
+
+
+class _PooledAdapter(HTTPAdapter):
+    """An HTTPAdapter with its own retry policy that sends through the pool manager of a shared one."""
+
+    def __init__(self, shared: HTTPAdapter, max_retries):
+        self._shared = shared
+        super(_PooledAdapter, self).__init__(pool_maxsize=shared._pool_maxsize, max_retries=max_retries)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = self._shared.poolmanager
+        self.proxy_manager = self._shared.proxy_manager
+
+    def close(self):
+        """Keep the shared pooled connections open; `KeepAlivePool.close` releases them."""
+
+
+class KeepAliveSession(Session):
+    """KeepAliveSession.
+    A requests session handed out by credentials' `signed_session` for one request. It is cheap to
+    configure afresh, so msrest's per-request `_configure_session` never touches state another
+    request uses, while every adapter mounted on it, whatever its retry policy, sends through the
+    `KeepAlivePool` so that outbound calls reuse pooled keep-alive connections.
+
+    :param pool: The connection pools shared with the credentials' other sessions.
+    :type pool: KeepAlivePool
+    """
+
+    def __init__(self, pool: KeepAlivePool):
+        self.pool = pool
+        super(KeepAliveSession, self).__init__()
+
+    def mount(self, prefix, adapter):
+        if isinstance(adapter, HTTPAdapter) and not isinstance(adapter, _PooledAdapter):
+            adapter = _PooledAdapter(self.pool._adapter, adapter.max_retries)
+        return super(KeepAliveSession, self).mount(prefix, adapter)
+
+    def stats(self) -> dict:
+        """Connection reuse counters of the shared pool, see `KeepAlivePool.stats`."""
+        return self.pool.stats()
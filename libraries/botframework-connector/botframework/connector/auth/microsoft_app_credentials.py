@@ -1,11 +1,15 @@
+import asyncio
+import logging
+from concurrent.futures import Future
 from datetime import datetime, timedelta
+from threading import Lock
 from urllib.parse import urlparse
 
-from msrest.authentication import (
-    BasicTokenAuthentication,
-    Authentication)
+from msrest.authentication import Authentication
 import requests
 
+from .keep_alive_session import KeepAlivePool, KeepAliveSession
+
 AUTH_SETTINGS = {
     "refreshEndpoint": 'https://login.microsoftonline.com/botframework.com/oauth2/v2.0/token',
     "refreshScope": 'https://api.botframework.com/.default',
@@ -22,6 +26,8 @@ AUTH_SETTINGS = {
         'https://login.microsoftonline.com/f8cdef31-a31e-4b4a-93e4-5f571e91255a/v2.0'
 }
 
+_LOGGER = logging.getLogger(__name__)
+
 class _OAuthResponse:
     def __init__(self):
         self.token_type = None
@@ -45,37 +51,140 @@ class MicrosoftAppCredentials(Authentication):
     refreshScope = AUTH_SETTINGS["refreshScope"]
     schema = 'Bearer'
 
+    # `get_access_token_async` renews a token in the background when it is requested this close to expiring.
+    REFRESH_AHEAD = timedelta(minutes=5)
+
     trustedHostNames = {}
     cache = {}
+    # The refresh in flight per cache key, shared by blocking and async callers so they make one request to the
+    # token endpoint. Entries are removed when the refresh ends.
+    _refreshes = {}
+    _refreshes_lock = Lock()
 
     def __init__(self, appId: str, password: str):
         self.microsoft_app_id = appId
         self.microsoft_app_password = password
         self.token_cache_key = appId + '-cache'
+        self._pool = None
+        self._pool_lock = Lock()
 
     def signed_session(self):
-        basic_authentication = BasicTokenAuthentication({"access_token": self.get_access_token()})
-        return  basic_authentication.signed_session()
+        """Get a new session for one request, with its Authorization header set to the current
+        access token. Every session sends through the credentials' one `KeepAlivePool`, so that
+        requests reuse its pooled keep-alive connections.
+
+        :rtype: KeepAliveSession
+        """
+        access_token = self.get_access_token()
+        pool = self._pool
+        if pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = KeepAlivePool()
+                pool = self._pool
+        session = pool.session()
+        session.headers[self.header] = '{} {}'.format(self.schema, access_token)
+        return session
+
+    def close(self):
+        """Close the pooled connections used by the sessions of `signed_session`."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+
+    def _get_cached_token(self):
+        # check the global cache for the token. If we have it, and it's valid, we're done.
+        oauth_token = MicrosoftAppCredentials.cache.get(self.token_cache_key, None)
+        if oauth_token is not None and oauth_token.expiration_time > datetime.now():
+            return oauth_token
+        return None
 
     def get_access_token(self, force_refresh=False):
-        if self.microsoft_app_id and self.microsoft_app_password:
-            if not force_refresh:
-                # check the global cache for the token. If we have it, and it's valid, we're done.
-                oauth_token = MicrosoftAppCredentials.cache.get(self.token_cache_key, None)
-                if oauth_token is not None:
-                    # we have the token. Is it valid?
-                    if oauth_token.expiration_time > datetime.now():
-                        return oauth_token.access_token
-            # We need to refresh the token, because:
-            #   1. The user requested it via the force_refresh parameter
-            #   2. We have it, but it's expired
-            #   3. We don't have it in the cache.
-            oauth_token = self.refresh_token()
-            MicrosoftAppCredentials.cache.setdefault(self.token_cache_key, oauth_token)
-            return oauth_token.access_token
-        else:
+        """Get an access token, refreshing it with a blocking request if needed.
+
+        On the event loop prefer `get_access_token_async`, which never blocks.
+
+        :param force_refresh: Fetch a new token even if the cached one is still valid.
+        :return: The access token, or '' if the credentials have no app id and password.
+        """
+        if not (self.microsoft_app_id and self.microsoft_app_password):
             return ''
 
+        if not force_refresh:
+            oauth_token = self._get_cached_token()
+            if oauth_token is not None:
+                return oauth_token.access_token
+
+        # We need to refresh the token, because:
+        #   1. The user requested it via the force_refresh parameter
+        #   2. We have it, but it's expired
+        #   3. We don't have it in the cache.
+        refresh, started = self._join_refresh(force_refresh)
+        if started:
+            self._run_refresh(refresh)
+        return refresh.result().access_token
+
+    async def get_access_token_async(self, force_refresh=False):
+        """Get an access token without blocking the event loop.
+
+        Concurrent callers, blocking ones included, share a single refresh. Renewal is lazy: a
+        token requested within `REFRESH_AHEAD` of expiring is still returned while a replacement
+        is fetched in the background; nothing renews tokens that are not requested.
+
+        :param force_refresh: Fetch a new token even if the cached one is still valid.
+        :return: The access token, or '' if the credentials have no app id and password.
+        """
+        if not (self.microsoft_app_id and self.microsoft_app_password):
+            return ''
+
+        if not force_refresh:
+            oauth_token = self._get_cached_token()
+            if oauth_token is not None:
+                if oauth_token.expiration_time - MicrosoftAppCredentials.REFRESH_AHEAD <= datetime.now():
+                    refresh, started = self._join_refresh(True)
+                    if started:
+                        asyncio.get_event_loop().run_in_executor(None, self._run_refresh, refresh)
+                return oauth_token.access_token
+
+        refresh, started = self._join_refresh(force_refresh)
+        if started:
+            asyncio.get_event_loop().run_in_executor(None, self._run_refresh, refresh)
+        oauth_token = await asyncio.shield(asyncio.wrap_future(refresh))
+        return oauth_token.access_token
+
+    def _join_refresh(self, force_refresh: bool):
+        """Returns the refresh in flight for this token and False, or a new one that the caller must
+        run with `_run_refresh` and True. If the cached token became valid meanwhile, and no refresh
+        was forced, it is returned as an already finished refresh.
+        """
+        with MicrosoftAppCredentials._refreshes_lock:
+            refresh = MicrosoftAppCredentials._refreshes.get(self.token_cache_key)
+            if refresh is not None:
+                return refresh, False
+            refresh = Future()
+            oauth_token = None if force_refresh else self._get_cached_token()
+            if oauth_token is not None:
+                # Another caller refreshed it while we were checking.
+                refresh.set_result(oauth_token)
+                return refresh, False
+            MicrosoftAppCredentials._refreshes[self.token_cache_key] = refresh
+            return refresh, True
+
+    def _run_refresh(self, refresh: Future):
+        try:
+            oauth_token = self.refresh_token()
+        except Exception as error:  # pylint: disable=broad-except
+            _LOGGER.warning('Failed to refresh access token for %s: %s', self.microsoft_app_id, error)
+            with MicrosoftAppCredentials._refreshes_lock:
+                del MicrosoftAppCredentials._refreshes[self.token_cache_key]
+            refresh.set_exception(error)
+            return
+        with MicrosoftAppCredentials._refreshes_lock:
+            MicrosoftAppCredentials.cache[self.token_cache_key] = oauth_token
+            del MicrosoftAppCredentials._refreshes[self.token_cache_key]
+        refresh.set_result(oauth_token)
+
     def refresh_token(self):
         options = {
             'grant_type': 'client_credentials',
@@ -0,0 +1,60 @@
+import binascii
+import json
+
+import jwt
+from jwt.utils import base64url_decode
+
+class ParsedToken:
+    """ParsedToken.
+    A bearer token from an Authorization header, decoded once without verification so that
+    emulator detection, issuer checks, key lookup and signature verification can share the
+    same header, claims and signature instead of decoding the JWT at every step.
+
+    :param auth_header: The raw HTTP header in the format: 'Bearer [longString]'
+    :type auth_header: str
+    :raises jwt.DecodeError: If a 'Bearer' token is not a well formed JWT.
+    """
+
+    def __init__(self, auth_header: str):
+        self.auth_header = auth_header
+        self.scheme = None
+        self.token = None
+        self.header = None
+        self.claims = None
+        self.signing_input = None
+        self.signature = None
+
+        parts = auth_header.split(' ') if auth_header else []
+        if len(parts) != 2:
+            return
+        self.scheme, self.token = parts
+        if self.scheme != 'Bearer' or not self.token:
+            return
+
+        try:
+            signing_input, crypto_segment = self.token.encode('utf-8').rsplit(b'.', 1)
+            header_segment, payload_segment = signing_input.split(b'.', 1)
+            header = json.loads(base64url_decode(header_segment).decode('utf-8'))
+            claims = json.loads(base64url_decode(payload_segment).decode('utf-8'))
+            signature = base64url_decode(crypto_segment)
+        except (ValueError, TypeError, binascii.Error) as error:
+            raise jwt.DecodeError('Invalid token: {}'.format(error))
+        if not isinstance(header, dict) or not isinstance(claims, dict):
+            raise jwt.DecodeError('Invalid token: header and payload must be JSON objects')
+
+        self.header = header
+        self.claims = claims
+        self.signing_input = signing_input
+        self.signature = signature
+
+    @property
+    def is_bearer_token(self) -> bool:
+        """True if the header carried a 'Bearer' scheme JWT."""
+        return self.claims is not None
+
+    @staticmethod
+    def parse(auth_header) -> 'ParsedToken':
+        """Returns auth_header itself if it is already a ParsedToken, otherwise parses it."""
+        if isinstance(auth_header, ParsedToken):
+            return auth_header
+        return ParsedToken(auth_header)
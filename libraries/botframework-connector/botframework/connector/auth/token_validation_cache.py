@@ -0,0 +1,58 @@
+import hashlib
+import time
+
+from ..lru_cache import LruCache
+from .claims_identity import ClaimsIdentity
+
+class TokenValidationCache(LruCache):
+    """TokenValidationCache.
+    A bounded, least-recently-used cache of bearer tokens whose signature, issuer and lifetime
+    have already been verified. The Bot Framework channel reuses the same token across many
+    requests until it expires, so a hit skips JWT decoding and RSA signature verification.
+    Entries are keyed by a SHA-256 hash of the Authorization header and expire at the token's
+    "exp" claim; tokens without one are never cached.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        super(TokenValidationCache, self).__init__(max_size)
+
+    @staticmethod
+    def _key(auth_header: str) -> bytes:
+        return hashlib.sha256(auth_header.encode('utf-8')).digest()
+
+    def get(self, auth_header: str):
+        """Get the verified identity for an Authorization header.
+
+        :param auth_header: The raw HTTP header in the format: 'Bearer [longString]'
+        :type auth_header: str
+
+        :return: A (ClaimsIdentity, is_emulator_token) tuple, or None on a miss.
+        """
+        entry = self._lookup(self._key(auth_header))
+        if entry is None:
+            return None
+        identity, is_emulator, _ = entry
+        return identity, is_emulator
+
+    def add(self, auth_header: str, identity: ClaimsIdentity, is_emulator: bool):
+        """Remember a verified identity until the token's "exp" claim.
+
+        :param auth_header: The raw HTTP header in the format: 'Bearer [longString]'
+        :type auth_header: str
+        :param identity: The verified identity extracted from the token.
+        :type identity: ClaimsIdentity
+        :param is_emulator: True if the token was issued by the Bot Framework Emulator.
+        :type is_emulator: bool
+        """
+        expires_at = identity.get_claim_value('exp')
+        if not isinstance(expires_at, (int, float)) or expires_at <= time.time():
+            return
+        self._store(self._key(auth_header), (identity, is_emulator, expires_at))
+
+    def _expired(self, value) -> bool:
+        return value[2] <= time.time()
+
+    def stats(self) -> dict:
+        stats = super(TokenValidationCache, self).stats()
+        stats.update(expirations=self.expirations, hit_ratio=self.hit_ratio)
+        return stats
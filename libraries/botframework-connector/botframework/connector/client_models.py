@@ -0,0 +1,21 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""Process-wide model registry and the serializer/deserializer shared by every ConnectorClient.
+
+msrest's `Serializer` and `Deserializer` only read their configuration after construction, so
+one instance of each can safely serve every client and thread. Treat them as read-only; pass a
+`serializer` to `ConnectorClient` to customise request serialization.
+"""
+
+from types import MappingProxyType
+
+from msrest import Serializer, Deserializer
+
+from . import models
+
+CLIENT_MODELS = MappingProxyType({k: v for k, v in models.__dict__.items() if isinstance(v, type)})
+
+SERIALIZER = Serializer(CLIENT_MODELS)
+
+DESERIALIZER = Deserializer(CLIENT_MODELS)
@@ -10,21 +10,22 @@
 # --------------------------------------------------------------------------
 
 from msrest.service_client import ServiceClient as _ServiceClient
-from msrest import Configuration, Serializer, Deserializer
+from msrest import Configuration
 from msrest.authentication import Authentication
 from .version import VERSION
 from .operations import AttachmentsOperations
 from .operations import ConversationsOperations
-from . import models
+from .client_models import SERIALIZER, DESERIALIZER
 from .async_mixin import AsyncServiceClientMixin
 
 
 class ServiceClient(_ServiceClient, AsyncServiceClientMixin):
-    def __init__(self, creds, config):
+    def __init__(self, creds, config, transport=None):
         super(ServiceClient, self).__init__(creds, config)
         self.config = config
         self.creds = creds if creds else Authentication()
         self._headers = {}
+        self.transport = transport
 
 
 class ConnectorClientConfiguration(Configuration):
@@ -80,18 +81,24 @@ class ConnectorClient(object):
      client subscription.
     :type credentials: None
     :param str base_url: Service URL
+    :param transport: Optional non-blocking transport used by the ``*_async`` operations, e.g. an
+     :class:`AiohttpTransport<botframework.connector.async_mixin.AiohttpTransport>`. When omitted the
+     async operations run the blocking requests session in the default executor. The transport is not
+     owned by the client: await its ``close()`` once no client built with it sends requests any more.
+    :param serializer: Optional msrest-compatible serializer for request bodies, e.g. a
+     :class:`CompiledSerializer<botframework.connector.serialization.CompiledSerializer>`.
+     Defaults to a msrest ``Serializer`` shared by every client.
     """
 
     def __init__(
-            self, credentials, base_url=None):
+            self, credentials, base_url=None, transport=None, serializer=None):
 
         self.config = ConnectorClientConfiguration(credentials, base_url)
-        self._client = ServiceClient(self.config.credentials, self.config)
+        self._client = ServiceClient(self.config.credentials, self.config, transport)
 
-        client_models = {k: v for k, v in models.__dict__.items() if isinstance(v, type)}
         self.api_version = 'v3'
-        self._serialize = Serializer(client_models)
-        self._deserialize = Deserializer(client_models)
+        self._serialize = serializer if serializer is not None else SERIALIZER
+        self._deserialize = DESERIALIZER
 
         self.attachments = AttachmentsOperations(
             self._client, self.config, self._serialize, self._deserialize)
@@ -0,0 +1,97 @@
+# --------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+from collections import OrderedDict
+from threading import Lock
+
+
+class LruCache(object):
+    """LruCache.
+    The bounded, least-recently-used, thread-safe storage and hit/miss/eviction counters shared by
+    the caches of the Bot Framework libraries. Subclasses expose their own lookups on top of
+    `_lookup` and `_store`, and override `_expired` if entries have a lifetime.
+
+    :param max_size: The maximum number of entries kept.
+    :type max_size: int
+    """
+
+    def __init__(self, max_size: int):
+        if not isinstance(max_size, int):
+            raise TypeError('%s(): max_size must be an integer.' % type(self).__name__)
+        if max_size < 1:
+            raise ValueError('%s(): max_size must be positive.' % type(self).__name__)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def _lookup(self, key):
+        """Get the value for a key and mark it most recently used.
+
+        :return: The value, or None on a miss; expired entries are dropped and count as misses.
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None and self._expired(value):
+                del self._entries[key]
+                self.expirations += 1
+                value = None
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def _store(self, key, value, replace: bool = True):
+        """Store a value as the most recently used entry, evicting the least recently used ones
+        beyond `max_size`.
+
+        :param replace: False to keep the value already stored for the key, e.g. one built by a
+         caller that raced this one.
+        :type replace: bool
+        :return: The value stored for the key.
+        """
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None and not replace:
+                self._entries.move_to_end(key)
+                return existing
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return value
+
+    def _expired(self, value) -> bool:  # pylint: disable=unused-argument,no-self-use
+        """Whether a stored value may no longer be served; entries never expire by default."""
+        return False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
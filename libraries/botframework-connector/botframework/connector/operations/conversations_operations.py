@@ -12,6 +12,7 @@
 from msrest.pipeline import ClientRawResponse
 
 from .. import models
+from ..client_models import SERIALIZER, DESERIALIZER
 
 
 class ConversationsOperations(object):
@@ -19,17 +20,17 @@ class ConversationsOperations(object):
 
     :param client: Client for service requests.
     :param config: Configuration of service client.
-    :param serializer: An object model serializer.
-    :param deserializer: An object model deserializer.
+    :param serializer: An object model serializer. Defaults to the shared one.
+    :param deserializer: An object model deserializer. Defaults to the shared one.
     """
 
     models = models
 
-    def __init__(self, client, config, serializer, deserializer):
+    def __init__(self, client, config, serializer=None, deserializer=None):
 
         self._client = client
-        self._serialize = serializer
-        self._deserialize = deserializer
+        self._serialize = serializer if serializer is not None else SERIALIZER
+        self._deserialize = deserializer if deserializer is not None else DESERIALIZER
 
         self.config = config
 
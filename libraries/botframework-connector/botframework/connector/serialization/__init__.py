@@ -0,0 +1,8 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from .compiled_deserializer import CompiledDeserializer, deserialize_activity
+from .compiled_serializer import CompiledSerializer, dumps, loads
+from .lazy_activity import LazyActivity
+
+__all__ = ['CompiledDeserializer', 'CompiledSerializer', 'LazyActivity', 'deserialize_activity', 'dumps', 'loads']
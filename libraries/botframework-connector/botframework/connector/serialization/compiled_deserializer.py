@@ -0,0 +1,234 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import datetime
+from threading import Lock
+
+from msrest.exceptions import DeserializationError, raise_with_traceback
+from msrest.serialization import Deserializer, Model
+from botbuilder import schema
+from botbuilder.schema.slotted import SlottedModel
+
+from .compiled_serializer import loads
+from .lazy_activity import LazyActivity
+
+_MODEL_ERRORS = (AttributeError, TypeError, KeyError, ValueError)
+
+# Expressions converting a non-None JSON `value` exactly as msrest's Deserializer.deserialize_data would.
+_BASIC_EXPRESSIONS = {
+    'str': 'value if value.__class__ is str else unicode(value)',
+    'bool': 'value if value is True or value is False else basic(value, "bool")',
+    'int': 'int(value)',
+    'float': 'float(value)',
+    'iso-8601': 'value if isinstance(value, datetime) else iso(value)',
+    'bytearray': 'bytearray_(value)',
+    'object': 'object_(value)',
+}
+
+
+class CompiledDeserializer(object):
+    """CompiledDeserializer.
+    A drop-in replacement for msrest's `Deserializer` that, the first time a model is requested,
+    generates a straight-line Python function from the model's `_attribute_map` instead of walking
+    the map reflectively on every call. Produces objects equal to the ones msrest builds, including
+    `additional_properties` for unknown keys. Models that use features the generator does not handle
+    (`_validation`, `_subtype_map`, flattened keys) are delegated to msrest. Slotted models from
+    `botbuilder.schema.slotted` are supported as well. Fields a model lists in `_lazy_attributes`
+    (see `LazyActivity`) are stored raw and decoded by the model on first access.
+
+    :param classes: Model classes by name, as passed to msrest's `Deserializer`.
+    :type classes: dict
+    """
+
+    def __init__(self, classes=None):
+        self.dependencies = dict(classes) if classes else {}
+        self._fallback = Deserializer(self.dependencies)
+        self._converters = {}
+        self._lock = Lock()
+
+    def __call__(self, target_obj, response_data, content_type=None):
+        """Deserialize a parsed JSON body, raw body or `requests.Response` into `target_obj`.
+
+        :param target_obj: The name of the target data type, or a model class.
+        :param response_data: The data to deserialize.
+        :param str content_type: Swagger "produces" if available.
+        :raises: DeserializationError if deserialization fails.
+        :return: Deserialized object.
+        """
+        if hasattr(response_data, '_attribute_map'):
+            return self._fallback(target_obj, response_data, content_type)
+        if response_data.__class__ is dict:
+            data = response_data
+        elif isinstance(response_data, (bytes, str)) and content_type in Deserializer.JSON_MIMETYPES:
+            data = loads(response_data)
+        else:
+            data = Deserializer._unpack_content(response_data, content_type)
+        if data is None:
+            return None
+
+        if not isinstance(target_obj, str):
+            self.dependencies.setdefault(target_obj.__name__, target_obj)
+            target_obj = target_obj.__name__
+        converter = self._converters.get(target_obj)
+        if converter is None:
+            converter = self._get_converter(target_obj)
+        return converter(data)
+
+    def _get_converter(self, data_type: str):
+        converter = self._converters.get(data_type)
+        if converter is None:
+            with self._lock:
+                converter = self._converters.get(data_type)
+                if converter is None:
+                    # Converters built along the way are only published once all of them are finished,
+                    # since `__call__` reads `_converters` without the lock.
+                    pending = {}
+                    converter = self._build_converter(data_type, pending)
+                    pending[data_type] = converter
+                    self._converters.update(pending)
+        return converter
+
+    def _build_converter(self, data_type: str, pending: dict):
+        """Build a function converting a non-None value of `data_type`, adding the converters it
+        needs to `pending`."""
+        fallback = self._fallback
+        if data_type in _BASIC_EXPRESSIONS or data_type in fallback.deserialize_type:
+            return lambda value: fallback.deserialize_data(value, data_type)
+
+        iter_type = data_type[0] + data_type[-1]
+        if iter_type == '[]':
+            return self._build_list_converter(data_type, pending)
+        if iter_type == '{}':
+            return self._build_dict_converter(data_type, pending)
+
+        model = self.dependencies.get(data_type)
+        if not _can_compile(model):
+            return lambda value: fallback(data_type, value)
+
+        # Recursive references to the model go through a cell that is filled once it is compiled.
+        cell = []
+        pending[data_type] = lambda value: cell[0](value)
+        converter = self._compile_model(model, pending)
+        cell.append(converter)
+        return converter
+
+    def _build_list_converter(self, data_type: str, pending: dict):
+        item_type = data_type[1:-1]
+        convert_item = self._nested_converter(item_type, pending)
+
+        def convert_list(values):
+            if not isinstance(values, (list, set)):
+                raise DeserializationError('Cannot deserialize as {} an object of type {}'.format(
+                    data_type, type(values)))
+            return [None if value is None else convert_item(value) for value in values]
+        return convert_list
+
+    def _build_dict_converter(self, data_type: str, pending: dict):
+        convert_item = self._nested_converter(data_type[1:-1], pending)
+
+        def convert_dict(values):
+            if isinstance(values, list):
+                return {pair['key']: None if pair['value'] is None else convert_item(pair['value'])
+                        for pair in values}
+            return {key: None if value is None else convert_item(value) for key, value in values.items()}
+        return convert_dict
+
+    def _nested_converter(self, data_type: str, pending: dict):
+        converter = self._converters.get(data_type) or pending.get(data_type)
+        if converter is None:
+            converter = self._build_converter(data_type, pending)
+            pending[data_type] = converter
+        return converter
+
+    def _compile_model(self, model, pending: dict):
+        name = model.__name__
+        namespace = {
+            'model': model,
+            'new': object.__new__,
+            'unicode': Deserializer.deserialize_unicode,
+            'basic': self._fallback.deserialize_basic,
+            'iso': Deserializer.deserialize_iso,
+            'bytearray_': Deserializer.deserialize_bytearray,
+            'object_': self._fallback.deserialize_object,
+            'datetime': datetime.datetime,
+            'fallback': lambda data: self._fallback(name, data),
+            'known_keys': frozenset(desc['key'] for desc in model._attribute_map.values()),
+            'DeserializationError': DeserializationError,
+            'raise_with_traceback': raise_with_traceback,
+            'MODEL_ERRORS': _MODEL_ERRORS,
+        }
+        lines = ['def deserialize_%s(data):' % name,
+                 '    if data.__class__ is not dict:',
+                 '        return fallback(data)',
+                 '    try:',
+                 '        get = data.get']
+        fields = []
+        lazy_attributes = getattr(model, '_lazy_attributes', ())
+        lazy_converters = {}
+        for index, (attr, desc) in enumerate(model._attribute_map.items()):
+            if attr in lazy_attributes:
+                lazy_converters[attr] = self._nested_converter(desc['type'], pending)
+                lines += ['        r%d = get(%r)' % (index, desc['key'])]
+                continue
+            expression = _BASIC_EXPRESSIONS.get(desc['type'])
+            if expression is None:
+                namespace['convert_%d' % index] = self._nested_converter(desc['type'], pending)
+                expression = 'convert_%d(value)' % index
+            lines += ['        value = get(%r)' % desc['key'],
+                      '        v%d = None if value is None else %s' % (index, expression)]
+            fields.append('%r: v%d' % (attr, index))
+        lines += ['        if data.keys() <= known_keys:',
+                  '            additional_properties = {}',
+                  '        else:',
+                  '            additional_properties = {key: data[key] for key in data.keys() - known_keys}',
+                  '    except MODEL_ERRORS as err:',
+                  '        raise_with_traceback(DeserializationError, %r, err)' % (
+                      'Unable to deserialize to object: ' + name),
+                  '    obj = new(model)']
+        if issubclass(model, SlottedModel):
+            lines += ['    obj.additional_properties = additional_properties']
+            lines += ['    obj.%s = v%d' % (attr, index) for index, attr in enumerate(model._attribute_map)]
+        elif lazy_converters:
+            namespace['lazy_converters'] = lazy_converters
+            lines += ['    obj.__dict__ = fields = {\'additional_properties\': additional_properties, %s}' % ', '.join(fields),
+                      '    pending = {}']
+            for index, attr in enumerate(model._attribute_map):
+                if attr in lazy_converters:
+                    lines += ['    if r%d is None:' % index,
+                              '        fields[%r] = None' % attr,
+                              '    else:',
+                              '        pending[%r] = r%d' % (attr, index)]
+            lines += ['    if pending:',
+                      '        fields[\'_lazy_fields\'] = pending',
+                      '        fields[\'_lazy_converters\'] = lazy_converters']
+        else:
+            lines += ['    obj.__dict__ = {\'additional_properties\': additional_properties, %s}' % ', '.join(fields)]
+        lines += ['    return obj']
+        exec(compile('\n'.join(lines), '<compiled deserializer for %s>' % name, 'exec'), namespace)
+        return namespace['deserialize_' + name]
+
+
+def _can_compile(model) -> bool:
+    if not isinstance(model, type) or not issubclass(model, (Model, SlottedModel)):
+        return False
+    if model._validation or model.__dict__.get('_subtype_map') or 'additional_properties' in model._attribute_map:
+        return False
+    return all(attr.isidentifier() and desc['key'] and '.' not in desc['key']
+               for attr, desc in model._attribute_map.items())
+
+
+_SCHEMA_DESERIALIZER = CompiledDeserializer(
+    dict({name: getattr(schema, name) for name in schema.__all__},
+         LazyActivity=LazyActivity))
+
+
+def deserialize_activity(data, lazy: bool=False) -> schema.Activity:
+    """Deserialize an inbound Activity with the compiled deserializer for the botbuilder.schema models.
+
+    :param data: The parsed JSON body of the request, or its raw bytes or str.
+    :param lazy: Return a `LazyActivity` that decodes attachments, entities, channel data, value and
+     suggested actions on first access.
+    :raises: DeserializationError if deserialization fails.
+    :return: The Activity.
+    """
+    return _SCHEMA_DESERIALIZER('LazyActivity' if lazy else 'Activity', data, 'application/json')
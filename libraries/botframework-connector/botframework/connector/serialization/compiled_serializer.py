@@ -0,0 +1,221 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import json
+from threading import Lock
+
+from msrest.exceptions import DeserializationError, SerializationError, raise_with_traceback
+from msrest.serialization import (Deserializer, Model, Serializer, attribute_key_case_insensitive_extractor,
+                                  last_rest_key_case_insensitive_extractor, rest_key_case_insensitive_extractor)
+from botbuilder import schema
+from botbuilder.schema.slotted import SlottedModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_FIELD_ERRORS = (AttributeError, TypeError, KeyError, ValueError)
+_MODEL_TYPES = (Model, SlottedModel)
+
+# Expressions converting a non-None attribute `value` exactly as msrest's Serializer.serialize_data would.
+_BASIC_EXPRESSIONS = {
+    'str': 'value if value.__class__ is str else unicode(value)',
+    'bool': 'bool(value)',
+    'int': 'int(value)',
+    'float': 'float(value)',
+    'iso-8601': 'iso(value)',
+    'bytearray': 'bytearray_(value)',
+    'object': 'value if value.__class__ is str else object_(value)',
+}
+
+
+def dumps(data) -> bytes:
+    """Encode JSON-compatible data as UTF-8 bytes, with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            # e.g. integers wider than 64 bits, which the standard library still encodes.
+            pass
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def loads(data):
+    """Decode a JSON document from UTF-8 bytes or str, with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # e.g. a UTF-8 byte order mark, which the standard library skips.
+            pass
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode('utf-8-sig')
+    return json.loads(data)
+
+
+class CompiledSerializer(Serializer):
+    """CompiledSerializer.
+    A drop-in replacement for msrest's `Serializer` whose `body` turns model instances straight into
+    JSON bytes. The first time a model class is serialized, a straight-line function is generated
+    from its `_attribute_map`; `None` attributes are skipped, as msrest does. Bodies that are not
+    model instances (e.g. plain dicts) and models that use `_validation` or flattened keys go through
+    msrest. Pass an instance to `ConnectorClient(serializer=...)` to use it for outbound requests.
+
+    :param classes: Model classes by name. Defaults to the botbuilder.schema models.
+    :type classes: dict
+    """
+
+    def __init__(self, classes=None):
+        if classes is None:
+            classes = {name: getattr(schema, name) for name in schema.__all__}
+        super(CompiledSerializer, self).__init__(classes)
+        self._converters = {}
+        self._model_serializers = {}
+        self._model_types = frozenset(value for value in self.dependencies.values()
+                                      if isinstance(value, type) and issubclass(value, _MODEL_TYPES))
+        self._lock = Lock()
+
+    def body(self, data, data_type, **kwargs):
+        """Serialize data intended for a request body.
+
+        :param data: The data to be serialized.
+        :param str data_type: The type to be serialized from.
+        :rtype: bytes, or the msrest result for data that is not a model instance
+        :raises: SerializationError if serialization fails.
+        """
+        model = self.dependencies.get(data_type)
+        if isinstance(data, _MODEL_TYPES) and model is not None and isinstance(data, model) \
+                and _can_compile(data.__class__):
+            return dumps(self.serialize_model(data))
+        return super(CompiledSerializer, self).body(data, data_type, **kwargs)
+
+    def serialize_model(self, obj) -> dict:
+        """Serialize a model instance into a JSON-compatible dict.
+
+        :param obj: The model instance.
+        :rtype: dict
+        :raises: SerializationError if serialization fails.
+        """
+        serialize = self._model_serializers.get(obj.__class__)
+        if serialize is None:
+            serialize = self._get_model_serializer(obj.__class__)
+        return serialize(obj)
+
+    def _get_model_serializer(self, model):
+        serialize = self._model_serializers.get(model)
+        if serialize is None:
+            with self._lock:
+                serialize = self._model_serializers.get(model)
+                if serialize is None:
+                    if _can_compile(model):
+                        serialize = self._compile_model(model)
+                    else:
+                        serialize = self._serialize
+                    self._model_serializers[model] = serialize
+        return serialize
+
+    def serialize_object(self, attr, **kwargs):
+        """Serialize a generic object, using the compiled serializers for known models."""
+        if attr.__class__ in self._model_types:
+            return self.serialize_model(attr)
+        return super(CompiledSerializer, self).serialize_object(attr, **kwargs)
+
+    def _build_model(self, data_type: str, data):
+        deserializer = Deserializer(self.dependencies)
+        deserializer.key_extractors = [
+            rest_key_case_insensitive_extractor,
+            attribute_key_case_insensitive_extractor,
+            last_rest_key_case_insensitive_extractor
+        ]
+        try:
+            return deserializer(data_type, data)
+        except DeserializationError as err:
+            raise_with_traceback(SerializationError, "Unable to build a model: " + str(err), err)
+
+    def _get_converter(self, data_type: str):
+        converter = self._converters.get(data_type)
+        if converter is None:
+            converter = self._build_converter(data_type)
+            self._converters[data_type] = converter
+        return converter
+
+    def _build_converter(self, data_type: str):
+        """Build a function converting a non-None attribute value of `data_type`."""
+        iter_type = data_type[0] + data_type[-1]
+        if iter_type == '[]':
+            return self._build_list_converter(data_type[1:-1])
+        if iter_type == '{}':
+            return self._build_dict_converter(data_type[1:-1])
+
+        model = self.dependencies.get(data_type)
+        if isinstance(model, type) and issubclass(model, _MODEL_TYPES):
+            # msrest serializes nested models by their runtime class, not the declared one.
+            model_serializers = self._model_serializers
+
+            def convert_model(value):
+                serialize = model_serializers.get(value.__class__)
+                if serialize is None:
+                    if not isinstance(value, _MODEL_TYPES):
+                        # Like msrest's body(), build the model from a plain dict first.
+                        value = self._build_model(data_type, value)
+                    serialize = self._get_model_serializer(value.__class__)
+                return serialize(value)
+            return convert_model
+
+        return lambda value: self.serialize_data(value, data_type)
+
+    def _build_list_converter(self, item_type: str):
+        convert_item = self._get_converter(item_type)
+
+        def convert_list(values):
+            if isinstance(values, str):
+                raise SerializationError("Refuse str type as a valid iter type.")
+            return [None if value is None else convert_item(value) for value in values]
+        return convert_list
+
+    def _build_dict_converter(self, item_type: str):
+        convert_item = self._get_converter(item_type)
+        unicode = self.serialize_unicode
+
+        def convert_dict(values):
+            return {unicode(key): None if value is None else convert_item(value) for key, value in values.items()}
+        return convert_dict
+
+    def _compile_model(self, model):
+        name = model.__name__
+        namespace = {
+            'unicode': self.serialize_unicode,
+            'iso': Serializer.serialize_iso,
+            'bytearray_': Serializer.serialize_bytearray,
+            'object_': self.serialize_object,
+            'SerializationError': SerializationError,
+            'raise_with_traceback': raise_with_traceback,
+            'FIELD_ERRORS': _FIELD_ERRORS,
+        }
+        lines = ['def serialize_%s(obj):' % name,
+                 '    serialized = {}',
+                 '    try:']
+        for index, (attr, desc) in enumerate(model._attribute_map.items()):
+            expression = _BASIC_EXPRESSIONS.get(desc['type'])
+            if expression is None:
+                namespace['convert_%d' % index] = self._get_converter(desc['type'])
+                expression = 'convert_%d(value)' % index
+            lines += ['        value = obj.%s' % attr,
+                      '        if value is not None:',
+                      '            serialized[%r] = %s' % (desc['key'], expression)]
+        lines += ['    except SerializationError:',
+                  '        raise',
+                  '    except FIELD_ERRORS as err:',
+                  '        raise_with_traceback(SerializationError, %r, err)' % (
+                      'Object %s cannot be serialized.' % name),
+                  '    return serialized']
+        exec(compile('\n'.join(lines), '<compiled serializer for %s>' % name, 'exec'), namespace)
+        return namespace['serialize_' + name]
+
+
+def _can_compile(model) -> bool:
+    if model._validation or 'additional_properties' in model._attribute_map:
+        return False
+    return all(attr.isidentifier() and desc['key'] and '.' not in desc['key']
+               for attr, desc in model._attribute_map.items())
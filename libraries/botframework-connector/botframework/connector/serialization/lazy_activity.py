@@ -0,0 +1,66 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from botbuilder.schema import Activity
+
+
+class LazyActivity(Activity):
+    """LazyActivity.
+    An Activity produced by `deserialize_activity(data, lazy=True)`. Scalar fields and the
+    from/recipient/conversation accounts are decoded straight away; the potentially large
+    sub-trees named in `_lazy_attributes` are kept as raw JSON and only decoded the first time
+    they are read. Because of that, a malformed attachment or entity raises `DeserializationError`
+    when it is first accessed instead of when the request is parsed.
+
+    Instances compare equal to the Activity msrest builds from the same payload. Call
+    `materialize` to decode every pending field at once.
+    """
+
+    _lazy_attributes = ('attachments', 'entities', 'channel_data', 'value', 'suggested_actions')
+
+    def __getattr__(self, name):
+        # Only called when `name` is not in the instance __dict__, i.e. for fields not decoded yet.
+        pending = self.__dict__.get('_lazy_fields')
+        if pending is None or name not in pending:
+            raise AttributeError("'{}' object has no attribute '{}'".format(self.__class__.__name__, name))
+        value = self.__dict__['_lazy_converters'][name](pending[name])
+        self.__dict__[name] = value
+        self._discard_pending(name)
+        return value
+
+    def _discard_pending(self, name: str):
+        pending = self.__dict__['_lazy_fields']
+        del pending[name]
+        if not pending:
+            del self.__dict__['_lazy_fields']
+            del self.__dict__['_lazy_converters']
+
+    def materialize(self) -> 'LazyActivity':
+        """Decode every field that has not been read yet.
+
+        :return: The activity itself.
+        """
+        pending = self.__dict__.get('_lazy_fields')
+        for name in list(pending or ()):
+            if name in self.__dict__:
+                # Assigned before it was ever read; the raw value is stale.
+                self._discard_pending(name)
+            else:
+                getattr(self, name)
+        return self
+
+    def __getstate__(self):
+        return self.materialize().__dict__
+
+    def __eq__(self, other):
+        if isinstance(other, Activity):
+            if isinstance(other, LazyActivity):
+                other.materialize()
+            return self.materialize().__dict__ == other.__dict__
+        return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __str__(self):
+        return str(self.materialize().__dict__)
@@ -20,11 +20,15 @@ setup(
     url="https://www.github.com/Microsoft/botbuilder-python",
     keywords=["BotFrameworkConnector", "bots","ai", "botframework", "botbuilder"],
     install_requires=REQUIRES,
+    extras_require={
+        "aiohttp": ["aiohttp>=3.0"],
+        "orjson": ["orjson>=2.0"]},
     packages=["botframework.connector",
               "botframework.connector.auth",
               "botframework.connector.async_mixin",
               "botframework.connector.operations",
-              "botframework.connector.models"
+              "botframework.connector.models",
+              "botframework.connector.serialization"
     ],
     include_package_data=True,
     long_description="Microsoft Bot Framework Bot Builder SDK for Python.",
@@ -0,0 +1,51 @@
+import json
+import time
+from datetime import datetime
+
+import jwt
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from botframework.connector.auth import Constants, JwtTokenExtractor
+
+
+class SigningKeyStub:
+    """Signs tokens with a local RSA key and serves it from the shared OpenID metadata cache."""
+
+    def __init__(self, kid='test-signing-key'):
+        self.kid = kid
+        self._private_key = rsa.generate_private_key(
+            public_exponent=65537, key_size=2048, backend=default_backend())
+        self.jwk = json.loads(RSAAlgorithm.to_jwk(self._private_key.public_key()))
+        self.jwk['kid'] = kid
+        self._saved = {}
+
+    def __enter__(self):
+        for url in (Constants.TO_BOT_FROM_CHANNEL_OPEN_ID_METADATA_URL,
+                    Constants.TO_BOT_FROM_EMULATOR_OPEN_ID_METADATA_URL):
+            metadata = JwtTokenExtractor.get_open_id_metadata(url)
+            self._saved[url] = (metadata.keys, metadata._configs, metadata.last_updated)
+            metadata.keys = [self.jwk]
+            metadata._configs = metadata._build_configs([self.jwk])
+            metadata.last_updated = datetime.now()
+        return self
+
+    def __exit__(self, *args):
+        for url, (keys, configs, last_updated) in self._saved.items():
+            metadata = JwtTokenExtractor.get_open_id_metadata(url)
+            metadata.keys, metadata._configs, metadata.last_updated = keys, configs, last_updated
+
+    def create_token(self, **claims) -> str:
+        claims.setdefault('exp', int(time.time()) + 3600)
+        private_pem = self._private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption())
+        token = jwt.encode(claims, private_pem, algorithm='RS256', headers={'kid': self.kid})
+        return token.decode('utf-8') if isinstance(token, bytes) else token
+
+    def create_channel_header(self, app_id: str, service_url: str, **claims) -> str:
+        claims.update(iss=Constants.TO_BOT_FROM_CHANNEL_TOKEN_ISSUER, aud=app_id, serviceurl=service_url)
+        return 'Bearer ' + self.create_token(**claims)
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import threading
+import pytest
+from aiohttp import web
+
+from botbuilder.schema import Activity, ActivityTypes, ChannelAccount, ErrorResponseException
+from botframework.connector import AiohttpTransport, ConnectorClient
+
+from .authentication_stub import MicrosoftTokenAuthenticationStub
+
+CONVERSATION_ID = 'B21UTEF8S:T03CWQ0QB:D2369CT7C'
+
+
+async def start_server(handler):
+    app = web.Application()
+    app.router.add_route('*', '/{tail:.*}', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, 'http://127.0.0.1:%d' % port
+
+
+class ServerThread(object):
+    """Serves `handler` from an event loop running in another thread."""
+    def __init__(self, handler):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever)
+        self._thread.start()
+        self.runner, self.url = asyncio.run_coroutine_threadsafe(start_server(handler), self.loop).result()
+
+    def run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def stop(self):
+        self.run(self.runner.cleanup())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+async def ok(request):
+    # Not kept alive, so closing a loop does not strand pooled sockets.
+    return web.json_response({'id': 'activity-1'}, headers={'Connection': 'close'})
+
+
+class TestAiohttpTransport:
+
+    @pytest.mark.asyncio
+    async def test_send_to_conversation_async(self):
+        received = {}
+
+        async def handler(request):
+            received['path'] = request.path
+            received['auth'] = request.headers.get('Authorization')
+            received['body'] = await request.json()
+            return web.json_response({'id': 'activity-1'})
+
+        runner, service_url = await start_server(handler)
+        transport = AiohttpTransport(limit_per_host=4)
+        try:
+            connector = ConnectorClient(MicrosoftTokenAuthenticationStub('STUB_ACCESS_TOKEN'),
+                                        base_url=service_url, transport=transport)
+            activity = Activity(type=ActivityTypes.message, text='Hi there!',
+                                recipient=ChannelAccount(id='user'))
+            response = await connector.conversations.send_to_conversation_async(CONVERSATION_ID, activity)
+        finally:
+            await transport.close()
+            await runner.cleanup()
+
+        assert response.id == 'activity-1'
+        assert received['path'] == '/v3/conversations/%s/activities' % CONVERSATION_ID
+        assert received['auth'] == 'Bearer STUB_ACCESS_TOKEN'
+        assert received['body']['text'] == 'Hi there!'
+
+    @pytest.mark.asyncio
+    async def test_error_response_raises(self):
+        async def handler(request):
+            body = {'error': {'code': 'ServiceError', 'message': 'Invalid ConversationId'}}
+            return web.Response(status=400, text=json.dumps(body), content_type='application/json')
+
+        runner, service_url = await start_server(handler)
+        transport = AiohttpTransport()
+        try:
+            connector = ConnectorClient(MicrosoftTokenAuthenticationStub('STUB_ACCESS_TOKEN'),
+                                        base_url=service_url, transport=transport)
+            with pytest.raises(ErrorResponseException) as excinfo:
+                await connector.conversations.delete_activity_async('INVALID_ID', 'activity-1')
+        finally:
+            await transport.close()
+            await runner.cleanup()
+
+        assert excinfo.value.error.error.code == 'ServiceError'
+
+    @pytest.mark.asyncio
+    async def test_connections_are_reused(self):
+        peers = set()
+
+        async def handler(request):
+            peers.add(request.transport.get_extra_info('peername'))
+            return web.json_response({'id': 'activity-1'})
+
+        runner, service_url = await start_server(handler)
+        transport = AiohttpTransport()
+        try:
+            connector = ConnectorClient(MicrosoftTokenAuthenticationStub('STUB_ACCESS_TOKEN'),
+                                        base_url=service_url, transport=transport)
+            for _ in range(3):
+                await connector.conversations.send_to_conversation_async(
+                    CONVERSATION_ID, Activity(type=ActivityTypes.message, text='Hi'))
+        finally:
+            await transport.close()
+            await runner.cleanup()
+
+        assert len(peers) == 1
+
+    def test_session_is_not_leaked_when_the_event_loop_changes(self):
+        server = ServerThread(ok)
+        transport = AiohttpTransport()
+        first_loop, second_loop = asyncio.new_event_loop(), asyncio.new_event_loop()
+        try:
+            first_loop.run_until_complete(transport.send('GET', server.url))
+            first_session = transport._session
+
+            # The first loop is idle, so its session cannot be closed from the second one.
+            with pytest.raises(RuntimeError):
+                second_loop.run_until_complete(transport.send('GET', server.url))
+            first_loop.run_until_complete(transport.close())
+            assert first_session.closed
+
+            second_loop.run_until_complete(transport.send('GET', server.url))
+            second_session = transport._session
+            second_loop.close()
+            # The connections of a closed loop are gone; its session is dropped without a warning.
+            first_loop.run_until_complete(transport.send('GET', server.url))
+            assert second_session.closed
+            assert transport._session is not second_session
+
+            # A session open on a loop running in another thread is closed on that loop.
+            first_loop.run_until_complete(transport.close())
+            server.run(transport.send('GET', server.url))
+            server_session = transport._session
+            first_loop.run_until_complete(transport.send('GET', server.url))
+            first_loop.run_until_complete(transport.close())
+            assert server_session.closed
+        finally:
+            first_loop.run_until_complete(transport.close())
+            first_loop.close()
+            server.stop()
+
+    def test_close_raises_the_failure_to_close_a_session_on_another_loop(self):
+        server = ServerThread(ok)
+        transport = AiohttpTransport()
+        loop = asyncio.new_event_loop()
+        try:
+            server.run(transport.send('GET', server.url))
+            server_session = transport._session
+            close_session = server_session.close
+
+            async def failing_close():
+                await close_session()
+                raise OSError('close failed')
+            server_session.close = failing_close
+
+            loop.run_until_complete(transport.send('GET', server.url))
+            with pytest.raises(OSError):
+                loop.run_until_complete(transport.close())
+            assert server_session.closed
+        finally:
+            loop.run_until_complete(transport.close())
+            loop.close()
+            server.stop()
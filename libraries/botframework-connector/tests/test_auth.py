@@ -6,6 +6,8 @@ from botframework.connector.auth import SimpleCredentialProvider
 from botframework.connector.auth import EmulatorValidation
 from botframework.connector.auth import ChannelValidation
 
+from .signing_key_stub import SigningKeyStub
+
 
 class TestAuth:
     EmulatorValidation.TO_BOT_FROM_EMULATOR_TOKEN_VALIDATION_PARAMETERS.ignore_expiration = True
@@ -64,3 +66,15 @@ class TestAuth:
             await JwtTokenValidation.assert_valid_activity(activity, header, credentials)
         except:
             pytest.fail("Unexpected error")
+
+    @pytest.mark.asyncio
+    async def test_channel_token_uses_shared_extractor_without_mutating_options(self):
+        activity = Activity(service_url='https://webchat.botframework.com/')
+        credentials = SimpleCredentialProvider('39619a59-5a0c-4f9b-87c5-816c648ff357', '')
+        extractor = ChannelValidation.TO_BOT_FROM_CHANNEL_TOKEN_EXTRACTOR
+        with SigningKeyStub() as signing_key:
+            header = signing_key.create_channel_header(credentials.app_id, activity.service_url)
+            await JwtTokenValidation.assert_valid_activity(activity, header, credentials)
+
+        assert ChannelValidation.TO_BOT_FROM_CHANNEL_TOKEN_EXTRACTOR is extractor
+        assert not hasattr(ChannelValidation.TO_BOT_FROM_CHANNEL_TOKEN_VALIDATION_PARAMETERS, 'algorithms')
@@ -0,0 +1,42 @@
+import pytest
+from msrest import Configuration
+from msrest.authentication import Authentication
+
+from botbuilder.schema import Activity
+from botframework.connector import ConnectorClient
+from botframework.connector.client_models import CLIENT_MODELS, DESERIALIZER, SERIALIZER
+
+
+class TestClientModels:
+
+    def test_clients_share_serializer_and_deserializer(self):
+        first = ConnectorClient(Authentication(), base_url='https://first.example')
+        second = ConnectorClient(Authentication(), base_url='https://second.example')
+
+        for client in (first, second):
+            assert client._serialize is SERIALIZER
+            assert client._deserialize is DESERIALIZER
+            assert client.conversations._serialize is SERIALIZER
+            assert client.attachments._deserialize is DESERIALIZER
+
+    def test_registry_is_read_only(self):
+        assert CLIENT_MODELS['Activity'] is Activity
+        with pytest.raises(TypeError):
+            CLIENT_MODELS['Activity'] = None
+
+    def test_configurations_are_independent(self):
+        first = ConnectorClient(Authentication(), base_url='https://first.example').config
+        second = ConnectorClient(Authentication(), base_url='https://second.example').config
+
+        first.proxies.add('https', 'http://proxy.example')
+        first.retry_policy.retries = 7
+        first.hooks.append(print)
+
+        assert second.proxies() == {}
+        assert second.retry_policy.retries == 3
+        assert second.hooks == []
+        assert first.base_url == 'https://first.example'
+
+        expected = Configuration('https://second.example')
+        assert second.retry_policy.policy.status_forcelist == expected.retry_policy.policy.status_forcelist
+        assert second.user_agent.startswith(expected.user_agent)
@@ -0,0 +1,147 @@
+import glob
+import json
+import os
+import threading
+import pytest
+import yaml
+from msrest.exceptions import DeserializationError
+from msrest.serialization import Deserializer, Model
+
+from botbuilder import schema
+from botbuilder.schema import Activity, ChannelAccount
+from botframework.connector.serialization import CompiledDeserializer, deserialize_activity
+
+RECORDINGS = os.path.join(os.path.dirname(__file__), 'recordings', '*.yaml')
+MODELS = {name: getattr(schema, name) for name in schema.__all__}
+DESERIALIZERS = (Deserializer(MODELS), CompiledDeserializer(MODELS))
+
+
+class Node(Model):
+    _attribute_map = {
+        'name': {'key': 'name', 'type': 'str'},
+        'children': {'key': 'children', 'type': '[Node]'},
+    }
+
+    def __init__(self, name=None, children=None):
+        super(Node, self).__init__()
+        self.name = name
+        self.children = children
+
+
+def recorded_payloads():
+    """Every JSON request and response body in the recorded channel traffic."""
+    payloads = []
+    for path in sorted(glob.glob(RECORDINGS)):
+        with open(path) as recording:
+            interactions = yaml.safe_load(recording)['interactions']
+        for interaction in interactions:
+            bodies = [interaction['request']['body'], (interaction['response']['body'] or {}).get('string')]
+            for body in bodies:
+                try:
+                    payloads.append(json.loads(body))
+                except (TypeError, ValueError):
+                    pass
+    return payloads
+
+
+def deserialize_both(target: str, data):
+    results = []
+    for deserializer in DESERIALIZERS:
+        try:
+            results.append(deserializer(target, json.loads(json.dumps(data))))
+        except DeserializationError:
+            results.append(DeserializationError)
+    return results
+
+
+class TestCompiledDeserializer:
+
+    def test_matches_msrest_for_recorded_payloads(self):
+        payloads = recorded_payloads()
+        assert payloads
+
+        for data in payloads:
+            targets = ['[ChannelAccount]'] if isinstance(data, list) else \
+                [name for name, model in MODELS.items() if hasattr(model, '_attribute_map')]
+            for target in targets:
+                expected, actual = deserialize_both(target, data)
+                assert actual == expected, target
+
+    def test_matches_msrest_for_every_field_type(self):
+        data = {
+            'type': 'message', 'id': 5, 'timestamp': '2018-01-02T03:04:05.1234567Z',
+            'from': {'id': 'user', 'role': 'user', 'extra': True},
+            'conversation': {'id': 'conversation', 'isGroup': 'true'},
+            'membersAdded': [{'id': 'a'}, None],
+            'attachments': [{'contentType': 'application/vnd.microsoft.card.hero',
+                             'content': {'title': 'card', 'buttons': [{'type': 'imBack', 'value': 1}]}}],
+            'entities': [{'type': 'mention', 'mentioned': {'id': 'bot'}}],
+            'channelData': {'nested': [1, 2.5, None, {'a': 'b'}]},
+            'value': 'text',
+            'relatesTo': {'activityId': '1', 'bot': {'id': 'bot'}},
+            'unknownProperty': {'kept': True},
+        }
+
+        expected, actual = deserialize_both('Activity', data)
+
+        assert actual == expected
+        assert actual.additional_properties == {'unknownProperty': {'kept': True}}
+        assert actual.from_property.additional_properties == {'extra': True}
+        assert actual.conversation.is_group is True
+        assert actual.id == '5'
+
+    def test_invalid_payloads_raise_like_msrest(self):
+        for data in ({'timestamp': 'not a date'}, {'membersAdded': 'not a list'}, {'from': 'not an object'},
+                     {'conversation': {'isGroup': 'maybe'}}):
+            assert deserialize_both('Activity', data) == [DeserializationError, DeserializationError]
+
+    def test_deserialize_activity_accepts_raw_body(self):
+        body = json.dumps({'type': 'message', 'text': 'hi', 'recipient': {'id': 'bot'}})
+
+        activity = deserialize_activity(body.encode('utf-8'))
+
+        assert activity == Activity.deserialize(json.loads(body))
+        assert deserialize_activity(json.loads(body)).recipient == ChannelAccount(id='bot')
+
+    def test_deserialize_activity_decodes_raw_body_like_msrest(self):
+        body = json.dumps({'type': 'message', 'text': 'hé', 'value': {'n': 2 ** 70}}, ensure_ascii=False)
+
+        for raw in (body, body.encode('utf-8'), b'\xef\xbb\xbf' + body.encode('utf-8')):
+            assert deserialize_activity(raw) == Deserializer({'Activity': Activity})('Activity', raw,
+                                                                                     'application/json')
+        with pytest.raises(ValueError):
+            deserialize_activity(b'{"type": ')
+
+    def test_recursive_model_is_not_used_before_it_is_compiled(self):
+        deserializer = CompiledDeserializer({'Node': Node})
+        compile_model = deserializer._compile_model
+        compiling = threading.Event()
+        resume = threading.Event()
+
+        def slow_compile_model(*args):
+            compiling.set()
+            resume.wait(5)
+            return compile_model(*args)
+        deserializer._compile_model = slow_compile_model
+        data = {'name': 'root', 'children': [{'name': 'leaf'}]}
+        results = {}
+
+        def deserialize(key):
+            try:
+                results[key] = deserializer('Node', data)
+            except Exception as err:  # pylint: disable=broad-except
+                results[key] = err
+
+        first = threading.Thread(target=deserialize, args=('first',))
+        first.start()
+        compiling.wait(5)
+        second = threading.Thread(target=deserialize, args=('second',))
+        second.start()
+        # Waits on the compilation rather than calling a half-built converter.
+        second.join(0.1)
+        resume.set()
+        first.join(5)
+        second.join(5)
+
+        expected = Node(name='root', children=[Node(name='leaf')])
+        assert results == {'first': expected, 'second': expected}
@@ -0,0 +1,105 @@
+import json
+from datetime import datetime, timezone
+import pytest
+from aiohttp import web
+from msrest.exceptions import SerializationError
+from msrest.serialization import Deserializer, Serializer
+
+from botbuilder.schema import (Activity, ActivityTypes, Attachment, ChannelAccount, ConversationAccount, Entity,
+                               Mention, RoleTypes)
+from botframework.connector import AiohttpTransport, ConnectorClient
+from botframework.connector.serialization import CompiledSerializer
+
+from .authentication_stub import MicrosoftTokenAuthenticationStub
+from .test_aiohttp_transport import start_server
+from .test_compiled_deserializer import MODELS, recorded_payloads
+
+MSREST = Serializer(MODELS)
+COMPILED = CompiledSerializer()
+
+
+def serialize_both(data, data_type: str):
+    results = []
+    try:
+        results.append(json.loads(json.dumps(MSREST.body(data, data_type))))
+    except SerializationError:
+        results.append(SerializationError)
+    try:
+        results.append(json.loads(COMPILED.body(data, data_type)))
+    except SerializationError:
+        results.append(SerializationError)
+    return results
+
+
+class TestCompiledSerializer:
+
+    def test_matches_msrest_for_recorded_payloads(self):
+        deserializer = Deserializer(MODELS)
+        for data in recorded_payloads():
+            if not isinstance(data, dict):
+                continue
+            for name in ('Activity', 'ConversationParameters', 'AttachmentData', 'ResourceResponse'):
+                model = deserializer(name, data)
+                expected, actual = serialize_both(model, name)
+                assert actual == expected, name
+
+    def test_matches_msrest_for_every_field_type(self):
+        activity = Activity(
+            type=ActivityTypes.message, id='1', text='hi',
+            timestamp=datetime(2018, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc),
+            from_property=ChannelAccount(id='user', role=RoleTypes.user),
+            conversation=ConversationAccount(id='conversation', is_group=False),
+            members_added=[ChannelAccount(id='a'), None],
+            attachments=[Attachment(content_type='application/json', content={'a': [1, 2.5, None]})],
+            entities=[Mention(mentioned=ChannelAccount(id='bot'), text='@bot', type='mention'), Entity(type='x')],
+            channel_data={'nested': {'list': [True, 'x']}},
+            value=ChannelAccount(id='value'))
+
+        expected, actual = serialize_both(activity, 'Activity')
+
+        assert actual == expected
+        assert actual['from'] == {'id': 'user', 'role': 'user'}
+        assert actual['entities'][0]['mentioned'] == {'id': 'bot'}
+        assert 'locale' not in actual
+
+    def test_plain_dicts_in_model_fields_are_built_like_msrest(self):
+        activity = Activity(type='message', recipient={'id': 'user', 'name': 'User'},
+                            attachments=[{'contentType': 'text/plain', 'content': 'hi'}])
+
+        expected, actual = serialize_both(activity, 'Activity')
+
+        assert actual == expected
+        assert actual['recipient'] == {'id': 'user', 'name': 'User'}
+
+    def test_invalid_values_raise_like_msrest(self):
+        for activity in (Activity(timestamp='not a date'), Activity(members_added='not a list')):
+            assert serialize_both(activity, 'Activity') == [SerializationError, SerializationError]
+
+    def test_non_model_bodies_use_msrest(self):
+        data = {'type': 'message', 'text': 'hi'}
+
+        assert COMPILED.body(data, 'Activity') == MSREST.body(data, 'Activity')
+
+    @pytest.mark.asyncio
+    async def test_connector_client_sends_compiled_body(self):
+        received = {}
+
+        async def handler(request):
+            received['body'] = await request.json()
+            received['content_type'] = request.headers['Content-Type']
+            return web.json_response({'id': 'activity-1'})
+
+        runner, service_url = await start_server(handler)
+        transport = AiohttpTransport()
+        try:
+            connector = ConnectorClient(MicrosoftTokenAuthenticationStub('STUB_ACCESS_TOKEN'), base_url=service_url,
+                                        transport=transport, serializer=CompiledSerializer())
+            activity = Activity(type=ActivityTypes.message, text='Hi there!', recipient=ChannelAccount(id='user'))
+            response = await connector.conversations.send_to_conversation_async('conversation', activity)
+        finally:
+            await transport.close()
+            await runner.cleanup()
+
+        assert response.id == 'activity-1'
+        assert received['body'] == {'type': 'message', 'text': 'Hi there!', 'recipient': {'id': 'user'}}
+        assert received['content_type'].startswith('application/json')
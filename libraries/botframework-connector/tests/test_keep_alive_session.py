@@ -0,0 +1,138 @@
+import asyncio
+import json
+import threading
+import uuid
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+import pytest
+
+from botbuilder.schema import Activity, ActivityTypes
+from botframework.connector import ConnectorClient
+from botframework.connector.auth import MicrosoftAppCredentials
+from botframework.connector.auth.microsoft_app_credentials import _OAuthResponse
+from botframework.connector.models import ErrorResponseException
+
+CONVERSATION_ID = 'B21UTEF8S:T03CWQ0QB:D2369CT7C'
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.server.received.append((self.client_address, self.headers['Authorization'],
+                                     self.headers['User-Agent']))
+        status = 503 if 'unavailable' in self.path else 200
+        body = json.dumps({'id': 'activity-1'}).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def service_url():
+    server = _ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.received = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield 'http://127.0.0.1:%d' % server.server_address[1], server.received
+    server.shutdown()
+    server.server_close()
+
+
+def cache_token(credentials: MicrosoftAppCredentials, access_token: str):
+    oauth_token = _OAuthResponse.from_json({'token_type': 'Bearer', 'access_token': access_token,
+                                            'expires_in': 3600})
+    oauth_token.expiration_time = datetime.now() + timedelta(minutes=30)
+    MicrosoftAppCredentials.cache[credentials.token_cache_key] = oauth_token
+
+
+def message() -> Activity:
+    return Activity(type=ActivityTypes.message, text='Hi there!')
+
+
+class TestKeepAliveSession:
+
+    def test_sends_reuse_one_connection_across_token_rotation(self, service_url):
+        url, received = service_url
+        credentials = MicrosoftAppCredentials(str(uuid.uuid4()), 'password')
+        cache_token(credentials, 'token-1')
+        connector = ConnectorClient(credentials, base_url=url)
+
+        connector.conversations.send_to_conversation(CONVERSATION_ID, message())
+        connector.conversations.send_to_conversation(CONVERSATION_ID, message())
+        cache_token(credentials, 'token-2')
+        connector.conversations.send_to_conversation(CONVERSATION_ID, message())
+
+        session = credentials.signed_session()
+        assert session.stats() == {'connections': 1, 'requests': 3, 'reused': 2}
+        assert [auth for _, auth, _ in received] == ['Bearer token-1', 'Bearer token-1', 'Bearer token-2']
+        assert len({address for address, _, _ in received}) == 1
+        credentials.close()
+
+    @pytest.mark.asyncio
+    async def test_async_sends_reuse_connections(self, service_url):
+        url, received = service_url
+        credentials = MicrosoftAppCredentials('', '')
+        connector = ConnectorClient(credentials, base_url=url)
+
+        for _ in range(3):
+            await connector.conversations.send_to_conversation_async(CONVERSATION_ID, message())
+
+        session = credentials.signed_session()
+        assert session.stats()['reused'] == 2
+        assert session.hooks['response'] == []
+        credentials.close()
+
+    def test_sessions_share_one_pool(self):
+        credentials = MicrosoftAppCredentials('', '')
+        connector = ConnectorClient(credentials, base_url='http://127.0.0.1')
+        connector.config.hooks.append(lambda response, *args, **kwargs: None)
+        first = credentials.signed_session()
+        connector._client._configure_session(first)
+        second = credentials.signed_session()
+
+        assert first is not second
+        assert second.hooks['response'] == []
+        assert first.get_adapter('https://example.com').poolmanager is \
+            second.get_adapter('https://example.com').poolmanager
+        credentials.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_clients_keep_their_own_configuration(self, service_url):
+        url, received = service_url
+        credentials = MicrosoftAppCredentials('', '')
+        retrying = ConnectorClient(credentials, base_url=url)
+        retrying.config.add_user_agent('retrying')
+        retrying.config.retry_policy.retries = 2
+        retrying.config.retry_policy.backoff_factor = 0
+        retrying.config.retry_policy.policy.status_forcelist = [503]
+        retrying.config.retry_policy.policy.allowed_methods = None
+        retrying.config.retry_policy.policy.raise_on_status = False
+        hooked = []
+        retrying.config.hooks.append(lambda response, *args, **kwargs: hooked.append(response.status_code))
+        plain = ConnectorClient(credentials, base_url=url)
+        plain.config.add_user_agent('plain')
+        plain.config.retry_policy.retries = 0
+
+        sends = [client.conversations.send_to_conversation_async('unavailable', message())
+                 for _ in range(10) for client in (retrying, plain)]
+        results = await asyncio.gather(*sends, return_exceptions=True)
+
+        assert all(isinstance(result, ErrorResponseException) for result in results)
+        user_agents = [user_agent.split()[-1] for _, _, user_agent in received]
+        # The first try and two retries of each send, against one try.
+        assert user_agents.count('retrying') == 30
+        assert user_agents.count('plain') == 10
+        assert hooked == [503] * 10
+        credentials.close()
@@ -0,0 +1,74 @@
+import copy
+import pickle
+import pytest
+from msrest.exceptions import DeserializationError
+
+from botbuilder.schema import Activity, Attachment, Entity
+from botframework.connector.serialization import LazyActivity, deserialize_activity
+
+from .test_compiled_deserializer import recorded_payloads
+
+PAYLOAD = {
+    'type': 'message', 'text': 'hi', 'channelId': 'msteams',
+    'from': {'id': 'user'}, 'recipient': {'id': 'bot'}, 'conversation': {'id': 'conversation'},
+    'attachments': [{'contentType': 'text/plain', 'content': 'attached'}],
+    'entities': [{'type': 'clientInfo', 'locale': 'en-US'}],
+    'channelData': {'tenant': {'id': 'tenant'}},
+    'suggestedActions': {'to': ['user'], 'actions': [{'type': 'imBack', 'value': 'yes'}]},
+}
+
+
+class TestLazyActivity:
+
+    def test_scalar_fields_are_decoded_eagerly(self):
+        activity = deserialize_activity(PAYLOAD, lazy=True)
+
+        assert isinstance(activity, LazyActivity)
+        assert activity.text == 'hi'
+        assert activity.recipient.id == 'bot'
+        assert sorted(activity.__dict__['_lazy_fields']) == ['attachments', 'channel_data', 'entities',
+                                                             'suggested_actions']
+        assert 'attachments' not in activity.__dict__
+        assert activity.value is None
+
+    def test_sub_trees_are_decoded_on_first_access(self):
+        activity = deserialize_activity(PAYLOAD, lazy=True)
+
+        attachments = activity.attachments
+
+        assert attachments == [Attachment(content_type='text/plain', content='attached')]
+        assert activity.attachments is attachments
+        assert activity.entities == [Entity.deserialize(PAYLOAD['entities'][0])]
+        assert activity.channel_data == {'tenant': {'id': 'tenant'}}
+        assert activity.suggested_actions.to == ['user']
+        assert '_lazy_fields' not in activity.__dict__
+
+    def test_equals_eager_activity(self):
+        for data in [PAYLOAD] + [payload for payload in recorded_payloads() if isinstance(payload, dict)]:
+            expected = Activity.deserialize(data)
+            assert deserialize_activity(data, lazy=True) == expected
+            assert expected == deserialize_activity(data, lazy=True)
+
+    def test_assignment_before_access_wins(self):
+        activity = deserialize_activity(PAYLOAD, lazy=True)
+        activity.channel_data = {'replaced': True}
+
+        activity.materialize()
+
+        assert activity.channel_data == {'replaced': True}
+        assert '_lazy_fields' not in activity.__dict__
+
+    def test_serialize_copy_and_pickle(self):
+        activity = deserialize_activity(PAYLOAD, lazy=True)
+
+        assert activity.serialize() == Activity.deserialize(PAYLOAD).serialize()
+        assert copy.deepcopy(deserialize_activity(PAYLOAD, lazy=True)) == activity
+        assert pickle.loads(pickle.dumps(deserialize_activity(PAYLOAD, lazy=True))) == activity
+
+    def test_malformed_sub_tree_raises_on_access(self):
+        activity = deserialize_activity(dict(PAYLOAD, attachments='not a list'), lazy=True)
+
+        with pytest.raises(DeserializationError):
+            activity.attachments
+        with pytest.raises(DeserializationError):
+            activity.attachments
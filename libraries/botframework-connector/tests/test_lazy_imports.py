@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+CHECK_MODULES = '''
+import sys
+import {module}
+print(' '.join(name for name in ('msrest', 'jwt', 'requests', 'aiohttp') if name in sys.modules))
+'''
+
+
+def loaded_dependencies(module: str) -> str:
+    return subprocess.check_output([sys.executable, '-c', CHECK_MODULES.format(module=module)],
+                                   universal_newlines=True).strip()
+
+
+class TestLazyImports:
+
+    def test_packages_import_without_heavy_dependencies(self):
+        for module in ('botbuilder.schema', 'botframework.connector', 'botframework.connector.auth'):
+            assert loaded_dependencies(module) == '', module
+
+    def test_public_names_are_preserved(self):
+        from botbuilder import schema
+        from botframework import connector
+        from botframework.connector import auth
+
+        for package in (schema, connector, auth):
+            for name in package.__all__:
+                assert getattr(package, name) is not None
+            assert set(package.__all__) <= set(dir(package))
+        assert schema.Activity.deserialize({'from': {'id': 'user'}}).from_property == schema.ChannelAccount(id='user')
+
+    def test_unknown_name_raises_attribute_error(self):
+        from botbuilder import schema
+        from botframework.connector import auth
+
+        for package in (schema, auth):
+            assert not hasattr(package, 'NoSuchName')
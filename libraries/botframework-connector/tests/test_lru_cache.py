@@ -0,0 +1,45 @@
+import pytest
+
+from botframework.connector.lru_cache import LruCache
+
+
+class ExpiringCache(LruCache):
+    def _expired(self, value) -> bool:
+        return value == 'stale'
+
+
+class TestLruCache:
+
+    def test_evicts_least_recently_used(self):
+        cache = LruCache(2)
+        cache._store('a', 1)
+        cache._store('b', 2)
+        assert cache._lookup('a') == 1
+        cache._store('c', 3)
+
+        assert 'b' not in cache
+        assert cache._lookup('b') is None
+        assert len(cache) == 2
+        assert cache.stats() == {'size': 2, 'max_size': 2, 'hits': 1, 'misses': 1, 'evictions': 1}
+        assert cache.hit_ratio == 0.5
+
+    def test_store_can_keep_the_existing_value(self):
+        cache = LruCache(2)
+        assert cache._store('a', 1, replace=False) == 1
+        assert cache._store('a', 2, replace=False) == 1
+        assert cache._store('a', 3) == 3
+        assert cache._lookup('a') == 3
+
+    def test_expired_entries_are_dropped_as_misses(self):
+        cache = ExpiringCache(2)
+        cache._store('a', 'stale')
+
+        assert cache._lookup('a') is None
+        assert 'a' not in cache
+        assert (cache.misses, cache.expirations) == (1, 1)
+
+    def test_invalid_max_size_raises(self):
+        with pytest.raises(ValueError):
+            LruCache(0)
+        with pytest.raises(TypeError):
+            LruCache(None)
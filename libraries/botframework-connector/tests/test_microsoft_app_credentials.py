@@ -0,0 +1,99 @@
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+from botframework.connector.auth import MicrosoftAppCredentials
+from botframework.connector.auth.microsoft_app_credentials import _OAuthResponse
+
+
+class CredentialsStub(MicrosoftAppCredentials):
+    """Issues numbered tokens instead of calling the token endpoint."""
+
+    def __init__(self, expires_in=3600, delay=0):
+        super(CredentialsStub, self).__init__(str(uuid.uuid4()), 'password')
+        self.expires_in = expires_in
+        self.delay = delay
+        self.refreshes = 0
+
+    def refresh_token(self):
+        time.sleep(self.delay)
+        self.refreshes += 1
+        oauth_response = _OAuthResponse.from_json(
+            {'token_type': 'Bearer', 'access_token': 'token-%d' % self.refreshes, 'expires_in': self.expires_in})
+        oauth_response.expiration_time = datetime.now() + timedelta(seconds=self.expires_in - 300)
+        return oauth_response
+
+
+def expire_cached_token(credentials: MicrosoftAppCredentials, expires_in: timedelta):
+    MicrosoftAppCredentials.cache[credentials.token_cache_key].expiration_time = datetime.now() + expires_in
+
+
+class TestMicrosoftAppCredentials:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_refresh(self):
+        credentials = CredentialsStub(delay=0.02)
+
+        tokens = await asyncio.gather(*[credentials.get_access_token_async() for _ in range(10)])
+
+        assert set(tokens) == {'token-1'}
+        assert credentials.refreshes == 1
+        assert credentials.get_access_token() == 'token-1'
+
+    @pytest.mark.asyncio
+    async def test_expired_token_is_replaced_in_cache(self):
+        credentials = CredentialsStub()
+        assert await credentials.get_access_token_async() == 'token-1'
+        expire_cached_token(credentials, timedelta(seconds=-1))
+
+        assert await credentials.get_access_token_async() == 'token-2'
+        assert credentials.get_access_token() == 'token-2'
+
+    @pytest.mark.asyncio
+    async def test_expiring_token_is_renewed_in_background(self):
+        credentials = CredentialsStub()
+        await credentials.get_access_token_async()
+        expire_cached_token(credentials, timedelta(minutes=1))
+
+        assert await credentials.get_access_token_async() == 'token-1'
+        for _ in range(100):
+            if credentials.refreshes == 2:
+                break
+            await asyncio.sleep(0.001)
+        assert await credentials.get_access_token_async() == 'token-2'
+
+    def test_blocking_refresh_is_single_flight_across_threads(self):
+        credentials = CredentialsStub(delay=0.02)
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            tokens = list(executor.map(lambda _: credentials.get_access_token(), range(5)))
+
+        assert set(tokens) == {'token-1'}
+        assert credentials.refreshes == 1
+
+    @pytest.mark.asyncio
+    async def test_blocking_and_async_callers_share_one_refresh(self):
+        credentials = CredentialsStub(delay=0.05)
+        loop = asyncio.get_event_loop()
+
+        pending = asyncio.ensure_future(credentials.get_access_token_async())
+        await asyncio.sleep(0.01)
+        blocking = await loop.run_in_executor(None, credentials.get_access_token)
+
+        assert (await pending, blocking) == ('token-1', 'token-1')
+        assert credentials.refreshes == 1
+        assert credentials.token_cache_key not in MicrosoftAppCredentials._refreshes
+
+    def test_failed_refresh_is_not_kept_in_flight(self):
+        credentials = CredentialsStub()
+        credentials.refresh_token = lambda: 1 / 0
+
+        with pytest.raises(ZeroDivisionError):
+            credentials.get_access_token()
+        assert credentials.token_cache_key not in MicrosoftAppCredentials._refreshes
+
+    def test_credentials_without_password_have_no_token(self):
+        assert MicrosoftAppCredentials('', '').get_access_token() == ''
@@ -0,0 +1,193 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+import pytest
+from aiohttp import web
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from botframework.connector.auth.jwt_token_extractor import _OpenIdMetadata
+from .test_aiohttp_transport import start_server
+
+METADATA_URL = 'https://login.example.com/.well-known/openidconfiguration'
+KEYS_URL = 'https://login.example.com/keys'
+
+
+def create_jwk(kid: str) -> dict:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048, backend=default_backend())
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk['kid'] = kid
+    return jwk
+
+
+class MetadataStub(_OpenIdMetadata):
+    def __init__(self, keys, delay=0):
+        super(MetadataStub, self).__init__(METADATA_URL)
+        self.served_keys = keys
+        self.delay = delay
+        self.fetches = 0
+        self.failing = False
+
+    async def _fetch_json(self, url: str) -> dict:
+        if url == METADATA_URL:
+            self.fetches += 1
+            await asyncio.sleep(self.delay)
+            if self.failing:
+                raise ConnectionError('metadata endpoint unavailable')
+            return {'jwks_uri': KEYS_URL}
+        return {'keys': self.served_keys}
+
+
+class TestOpenIdMetadata:
+
+    @pytest.mark.asyncio
+    async def test_fresh_keys_are_not_refetched(self):
+        metadata = MetadataStub([create_jwk('key1')])
+
+        assert await metadata.get('key1') is not None
+        assert await metadata.get('key1') is not None
+        assert metadata.fetches == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_requests_share_one_fetch(self):
+        metadata = MetadataStub([create_jwk('key1')], delay=0.01)
+
+        results = await asyncio.gather(*[metadata.get('key1') for _ in range(10)])
+
+        assert all(result is not None for result in results)
+        assert metadata.fetches == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_keys_are_served_while_refreshing(self):
+        metadata = MetadataStub([create_jwk('key1')])
+        await metadata.get('key1')
+        metadata.last_updated = metadata.last_attempt = \
+            datetime.now() - _OpenIdMetadata.REFRESH_INTERVAL - timedelta(minutes=1)
+
+        assert await metadata.get('key1') is not None
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert metadata.fetches == 2
+        assert datetime.now() - metadata.last_updated < timedelta(minutes=1)
+
+    @pytest.mark.asyncio
+    async def test_unknown_key_forces_refresh(self):
+        metadata = MetadataStub([create_jwk('key1')])
+        await metadata.get('key1')
+        metadata.last_updated = metadata.last_attempt = datetime.now() - timedelta(hours=1)
+        metadata.served_keys = [create_jwk('key2')]
+
+        assert await metadata.get('key2') is not None
+        assert metadata.fetches == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_key_refresh_is_rate_limited(self):
+        metadata = MetadataStub([create_jwk('key1')])
+        await metadata.get('key1')
+
+        assert await metadata.get('unknown') is None
+        assert metadata.fetches == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_background_refresh_is_not_retried_by_every_request(self):
+        metadata = MetadataStub([create_jwk('key1')])
+        await metadata.get('key1')
+        metadata.last_updated = metadata.last_attempt = \
+            datetime.now() - _OpenIdMetadata.REFRESH_INTERVAL - timedelta(minutes=1)
+        metadata.failing = True
+
+        assert await metadata.get('key1') is not None
+        await asyncio.gather(metadata._refresh_future, return_exceptions=True)
+        assert await metadata.get('key1') is not None
+
+        assert metadata._refresh_future.done()
+        assert metadata.fetches == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_forced_refresh_is_rate_limited(self):
+        metadata = MetadataStub([create_jwk('key1')])
+        await metadata.get('key1')
+        metadata.last_updated = metadata.last_attempt = datetime.now() - timedelta(hours=1)
+        metadata.failing = True
+
+        assert await metadata.get('random1') is None
+        assert await metadata.get('random2') is None
+        assert await metadata.get('key1') is not None
+        assert metadata.fetches == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_first_fetch_is_not_retried_by_every_request(self):
+        metadata = MetadataStub([create_jwk('key1')])
+        metadata.failing = True
+
+        with pytest.raises(ConnectionError):
+            await metadata.get('key1')
+        assert await metadata.get('key1') is None
+        assert metadata.fetches == 1
+
+        metadata.failing = False
+        metadata.last_attempt -= _OpenIdMetadata.MIN_RETRY_INTERVAL
+        assert await metadata.get('key1') is not None
+        assert metadata.fetches == 2
+
+    @pytest.mark.asyncio
+    async def test_public_keys_are_parsed_once(self):
+        metadata = MetadataStub([create_jwk('key1')])
+
+        first = await metadata.get('key1')
+        second = await metadata.get('key1')
+
+        assert first is second
+
+    @pytest.mark.asyncio
+    async def test_public_keys_are_rebuilt_only_when_jwks_changes(self):
+        keys = [create_jwk('key1')]
+        metadata = MetadataStub(keys)
+        first = await metadata.get('key1')
+
+        metadata.served_keys = [dict(key) for key in keys]
+        await metadata._refresh()
+        assert await metadata.get('key1') is first
+
+        metadata.served_keys = keys + [create_jwk('key2')]
+        await metadata._refresh()
+        assert await metadata.get('key1') is not first
+        assert await metadata.get('key2') is not None
+
+    @pytest.mark.asyncio
+    async def test_keys_without_a_key_id_are_skipped(self):
+        keyless = create_jwk('key0')
+        del keyless['kid']
+        metadata = MetadataStub([keyless, create_jwk('key1'), {'kid': 'broken', 'kty': 'RSA'}])
+
+        assert await metadata.get('key1') is not None
+        assert list(metadata._configs) == ['key1']
+
+    @pytest.mark.asyncio
+    async def test_refreshes_reuse_one_session(self):
+        jwks = {'keys': [create_jwk('key1')]}
+        peers = set()
+
+        async def handler(request):
+            peers.add(request.transport.get_extra_info('peername'))
+            if request.path == '/metadata':
+                return web.json_response({'jwks_uri': str(request.url.with_path('/keys'))})
+            return web.json_response(jwks)
+
+        runner, url = await start_server(handler)
+        metadata = _OpenIdMetadata(url + '/metadata')
+        try:
+            assert await metadata.get('key1') is not None
+            session = metadata._transport.session
+            jwks['keys'].append(create_jwk('key2'))
+            metadata.last_attempt = datetime.min
+            assert await metadata.get('key2') is not None
+
+            assert metadata._transport.session is session
+            assert len(peers) == 1
+        finally:
+            await metadata.close()
+            await runner.cleanup()
+        assert session.closed
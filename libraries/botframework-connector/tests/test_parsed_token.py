@@ -0,0 +1,85 @@
+import time
+import jwt
+import pytest
+
+from botframework.connector.auth import Constants, JwtTokenExtractor, ParsedToken
+from botframework.connector.auth.verify_options import VerifyOptions
+
+from .signing_key_stub import SigningKeyStub
+
+ISSUER = 'https://api.botframework.com'
+
+
+@pytest.fixture(scope='module')
+def signing_key():
+    with SigningKeyStub() as stub:
+        yield stub
+
+
+def create_extractor(clock_tolerance=0, ignore_expiration=False) -> JwtTokenExtractor:
+    options = VerifyOptions(issuer=[ISSUER], audience=None, clock_tolerance=clock_tolerance,
+                            ignore_expiration=ignore_expiration)
+    return JwtTokenExtractor(options, Constants.TO_BOT_FROM_CHANNEL_OPEN_ID_METADATA_URL,
+                             Constants.ALLOWED_SIGNING_ALGORITHMS)
+
+
+class TestParsedToken:
+
+    def test_bearer_token_is_decoded_once(self, signing_key):
+        token = ParsedToken('Bearer ' + signing_key.create_token(iss=ISSUER, aud='app'))
+
+        assert token.is_bearer_token
+        assert token.header['kid'] == signing_key.kid
+        assert token.claims['aud'] == 'app'
+        assert ParsedToken.parse(token) is token
+
+    def test_other_schemes_are_not_decoded(self):
+        assert not ParsedToken('Basic dXNlcjpwYXNz').is_bearer_token
+        assert not ParsedToken('Bearer').is_bearer_token
+        assert not ParsedToken(None).is_bearer_token
+
+    def test_malformed_bearer_token_raises(self):
+        with pytest.raises(jwt.DecodeError):
+            ParsedToken('Bearer not-a-jwt')
+
+    @pytest.mark.asyncio
+    async def test_valid_token_returns_identity(self, signing_key):
+        header = 'Bearer ' + signing_key.create_token(iss=ISSUER, aud='app')
+
+        identity = await create_extractor().get_identity_from_auth_header(header)
+
+        assert identity.isAuthenticated
+        assert identity.get_claim_value('aud') == 'app'
+
+    @pytest.mark.asyncio
+    async def test_disallowed_issuer_returns_none(self, signing_key):
+        header = 'Bearer ' + signing_key.create_token(iss='https://evil.example.com')
+
+        assert await create_extractor().get_identity_from_auth_header(header) is None
+
+    @pytest.mark.asyncio
+    async def test_tampered_claims_fail_signature_check(self, signing_key):
+        signed = signing_key.create_token(iss=ISSUER, aud='app').split('.')
+        forged = signing_key.create_token(iss=ISSUER, aud='other').split('.')
+
+        with pytest.raises(jwt.DecodeError):
+            await create_extractor().get_identity_from_auth_header(
+                'Bearer ' + '.'.join([signed[0], forged[1], signed[2]]))
+
+    @pytest.mark.asyncio
+    async def test_lifetime_is_checked_without_leeway(self, signing_key):
+        expired = 'Bearer ' + signing_key.create_token(iss=ISSUER, exp=int(time.time()) - 60)
+        not_yet_valid = 'Bearer ' + signing_key.create_token(iss=ISSUER, nbf=int(time.time()) + 60)
+
+        with pytest.raises(jwt.ExpiredSignatureError):
+            await create_extractor(clock_tolerance=300).get_identity_from_auth_header(expired)
+        with pytest.raises(jwt.ImmatureSignatureError):
+            await create_extractor(clock_tolerance=300).get_identity_from_auth_header(not_yet_valid)
+        assert await create_extractor(ignore_expiration=True).get_identity_from_auth_header(expired)
+
+    @pytest.mark.asyncio
+    async def test_registered_claims_are_validated(self, signing_key):
+        header = 'Bearer ' + signing_key.create_token(iss=ISSUER, iat='yesterday')
+
+        with pytest.raises(jwt.InvalidIssuedAtError):
+            await create_extractor().get_identity_from_auth_header(header)
@@ -0,0 +1,69 @@
+import json
+import pickle
+from msrest.serialization import Deserializer, Serializer
+
+from botbuilder.schema import Activity, ConversationReference, slotted
+from botframework.connector.serialization import CompiledDeserializer, CompiledSerializer
+
+from .test_compiled_deserializer import recorded_payloads
+
+INBOUND = {
+    'type': 'message', 'id': '1', 'timestamp': '2018-01-02T03:04:05.123Z', 'text': 'hi',
+    'from': {'id': 'user', 'name': 'User'}, 'recipient': {'id': 'bot'},
+    'conversation': {'id': 'conversation', 'isGroup': False},
+    'entities': [{'type': 'mention', 'mentioned': {'id': 'bot'}}],
+    'channelData': {'tenant': {'id': 'tenant'}}, 'unknownProperty': 1,
+}
+
+
+class TestSlottedModels:
+
+    def test_slotted_models_have_no_instance_dict(self):
+        activity = slotted.Activity(text='hi')
+
+        assert not hasattr(activity, '__dict__')
+        assert activity.text == 'hi' and activity.type is None
+        assert activity == slotted.Activity(text='hi')
+        assert activity != slotted.Activity(text='bye')
+
+    def test_slotted_models_are_not_schema_models(self):
+        activity = slotted.Activity(text='hi')
+
+        assert not isinstance(activity, Activity)
+        assert isinstance(activity.to_model(), Activity)
+        assert slotted.Activity.__doc__.startswith('Slotted variant of botbuilder.schema.Activity; not an instance')
+
+    def test_deserialize_builds_nested_slotted_models(self):
+        activity = slotted.Activity.deserialize(INBOUND)
+
+        assert isinstance(activity.from_property, slotted.ChannelAccount)
+        assert isinstance(activity.entities[0], slotted.Entity)
+        assert activity.additional_properties == {'unknownProperty': 1}
+        assert activity.to_model() == Activity.deserialize(INBOUND)
+        assert slotted.Activity.from_model(Activity.deserialize(INBOUND)) == activity
+
+    def test_serialization_matches_schema_models(self):
+        for data in recorded_payloads():
+            if not isinstance(data, dict):
+                continue
+            expected = Serializer().body(Activity.deserialize(data), 'Activity')
+            activity = slotted.Activity.deserialize(data)
+
+            assert Serializer(slotted.MODELS).body(activity, 'Activity') == expected
+            assert json.loads(CompiledSerializer(slotted.MODELS).body(activity, 'Activity')) == \
+                json.loads(json.dumps(expected))
+
+    def test_compiled_deserializer_matches_msrest(self):
+        compiled = CompiledDeserializer(slotted.MODELS)
+
+        activity = compiled('Activity', INBOUND)
+
+        assert activity == Deserializer(slotted.MODELS)('Activity', INBOUND)
+        assert isinstance(activity.conversation, slotted.ConversationAccount)
+
+    def test_conversation_reference_round_trips_through_pickle(self):
+        reference = slotted.ConversationReference.from_model(ConversationReference.deserialize({
+            'activityId': '1', 'user': {'id': 'user'}, 'bot': {'id': 'bot'},
+            'conversation': {'id': 'conversation'}, 'channelId': 'test', 'serviceUrl': 'https://example.com'}))
+
+        assert pickle.loads(pickle.dumps(reference)) == reference
@@ -0,0 +1,85 @@
+import time
+import pytest
+
+from botbuilder.schema import Activity
+from botframework.connector.auth import (ClaimsIdentity, JwtTokenValidation, SimpleCredentialProvider,
+                                         TokenValidationCache)
+
+from .signing_key_stub import SigningKeyStub
+
+APP_ID = '39619a59-5a0c-4f9b-87c5-816c648ff357'
+SERVICE_URL = 'https://webchat.botframework.com/'
+
+
+@pytest.fixture(scope='module')
+def signing_key():
+    with SigningKeyStub() as stub:
+        yield stub
+
+
+class TestTokenValidationCache:
+
+    def test_entries_expire_at_exp_claim(self):
+        cache = TokenValidationCache()
+        cache.add('Bearer expired', ClaimsIdentity({'exp': time.time() - 1}, True), False)
+        cache.add('Bearer valid', ClaimsIdentity({'exp': time.time() + 60}, True), False)
+        cache.add('Bearer no-exp', ClaimsIdentity({}, True), False)
+
+        assert cache.get('Bearer expired') is None
+        assert cache.get('Bearer no-exp') is None
+        assert cache.get('Bearer valid') is not None
+        assert len(cache) == 1
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TokenValidationCache(max_size=2)
+        identity = ClaimsIdentity({'exp': time.time() + 60}, True)
+        cache.add('Bearer a', identity, False)
+        cache.add('Bearer b', identity, False)
+        cache.get('Bearer a')
+        cache.add('Bearer c', identity, False)
+
+        assert cache.get('Bearer b') is None
+        assert cache.get('Bearer a') is not None
+        assert cache.evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_repeated_token_is_served_from_cache(self, signing_key):
+        cache = TokenValidationCache()
+        header = signing_key.create_channel_header(APP_ID, SERVICE_URL)
+        credentials = SimpleCredentialProvider(APP_ID, '')
+        activity = Activity(service_url=SERVICE_URL)
+
+        first = await JwtTokenValidation.assert_valid_activity(activity, header, credentials, cache)
+        second = await JwtTokenValidation.assert_valid_activity(activity, header, credentials, cache)
+
+        assert first is second
+        assert cache.stats()['hits'] == 1
+        assert cache.hit_ratio == 0.5
+
+    @pytest.mark.asyncio
+    async def test_cached_token_still_checks_app_id_and_service_url(self, signing_key):
+        cache = TokenValidationCache()
+        header = signing_key.create_channel_header(APP_ID, SERVICE_URL)
+        await JwtTokenValidation.assert_valid_activity(
+            Activity(service_url=SERVICE_URL), header, SimpleCredentialProvider(APP_ID, ''), cache)
+
+        with pytest.raises(Exception):
+            await JwtTokenValidation.assert_valid_activity(
+                Activity(service_url=SERVICE_URL), header,
+                SimpleCredentialProvider('00000000-0000-0000-0000-000000000000', ''), cache)
+        with pytest.raises(Exception):
+            await JwtTokenValidation.assert_valid_activity(
+                Activity(service_url='https://other.botframework.com/'), header,
+                SimpleCredentialProvider(APP_ID, ''), cache)
+        assert cache.hits == 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_token_is_not_cached(self, signing_key):
+        cache = TokenValidationCache()
+        # Tamper with the signature so verification fails.
+        header = signing_key.create_channel_header(APP_ID, SERVICE_URL)[:-4] + 'AAAA'
+
+        with pytest.raises(Exception):
+            await JwtTokenValidation.assert_valid_activity(
+                Activity(service_url=SERVICE_URL), header, SimpleCredentialProvider(APP_ID, ''), cache)
+        assert len(cache) == 0
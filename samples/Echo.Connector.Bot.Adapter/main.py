@@ -3,12 +3,13 @@
 
 from aiohttp import web
 from botbuilder.schema import (Activity, ActivityTypes)
-from botbuilder.core import (BotFrameworkAdapter, BotFrameworkAdapterSettings, BotContext)
+from botbuilder.core import (AdmissionController, AiohttpRequestHandler, BotFrameworkAdapter,
+                             BotFrameworkAdapterSettings, BotContext)
 
 APP_ID = ''
 APP_PASSWORD = ''
 PORT = 9000
-SETTINGS = BotFrameworkAdapterSettings(APP_ID, APP_PASSWORD)
+SETTINGS = BotFrameworkAdapterSettings(APP_ID, APP_PASSWORD, admission_controller=AdmissionController())
 ADAPTER = BotFrameworkAdapter(SETTINGS)
 
 
@@ -49,18 +50,8 @@ async def request_handler(context: BotContext) -> web.Response:
         return await unhandled_activity()
 
 
-async def messages(req: web.web_request) -> web.Response:
-    body = await req.json()
-    activity = Activity().deserialize(body)
-    auth_header = req.headers['Authorization'] if 'Authorization' in req.headers else ''
-    try:
-        return await ADAPTER.process_request(activity, auth_header, request_handler)
-    except BaseException as e:
-        raise e
-
-
 app = web.Application()
-app.router.add_post('/', messages)
+app.router.add_post('/', AiohttpRequestHandler(ADAPTER, request_handler).handle)
 
 try:
     web.run_app(app, host='localhost', port=PORT)
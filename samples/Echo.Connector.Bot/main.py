@@ -8,6 +8,7 @@ from botbuilder.schema import (Activity, ActivityTypes, ChannelAccount)
 from botframework.connector import ConnectorClient
 from botframework.connector.auth import (MicrosoftAppCredentials,
                                          JwtTokenValidation, SimpleCredentialProvider)
+from botframework.connector.serialization import deserialize_activity
 
 APP_ID = ''
 APP_PASSWORD = ''
@@ -64,7 +65,7 @@ class BotRequestHandler(http.server.BaseHTTPRequestHandler):
     def do_POST(self):
         body = self.rfile.read(int(self.headers['Content-Length']))
         data = json.loads(str(body, 'utf-8'))
-        activity = Activity.deserialize(data)
+        activity = deserialize_activity(data)
 
         if not self.__handle_authentication(activity):
             return